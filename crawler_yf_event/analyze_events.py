@@ -1,49 +1,57 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
+import argparse
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime
-import numpy as np
+from crawler_yf_event.event_store import (
+    DEFAULT_ANALYSIS_DIR, load_event_frames, default_event_source, write_analysis_tables,
+)
+from crawler_yf_event.normalize import EVENT_TIME_UTC_COLUMN, parse_event_times
+from crawler_yf_event.aggregate import summarize_events
+from crawler_yf_event.report import PLOTLYJS_MODES, HtmlReport
 
-def load_and_process_data(file_path):
-    # JSON 파일 읽기
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # DataFrame으로 변환
-    df = pd.DataFrame(data)
-    
-    # 날짜 컬럼을 datetime으로 변환
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # 이벤트 타입별로 데이터프레임 분리
-    earnings_df = df[df['event_type'] == 'earnings'].copy()
-    economic_df = df[df['event_type'] == 'economic'].copy()
-    ipo_df = df[df['event_type'] == 'ipo'].copy()
-    splits_df = df[df['event_type'] == 'splits'].copy()
-    
-    # Economic 데이터의 날짜와 시간 결합
-    economic_df['Event Time'] = economic_df.apply(
-        lambda row: pd.to_datetime(f"{row['date'].strftime('%Y-%m-%d')} {row['Event Time']}", 
-                                 format='%Y-%m-%d %I:%M %p UTC',
-                                 errors='coerce'),
-        axis=1
-    )
+# 이벤트 타입별로 분석/리포트에 사용하는 컬럼
+EVENT_COLUMNS = {
+    'earnings': ['date', 'Symbol', 'Company', 'Event Name', 'Earnings Call Time',
+                 'EPS Estimate', 'Reported EPS', 'Surprise (%)'],
+    'economic': ['date', 'Country', 'Event', 'Event Time',
+                 'Actual', 'Market Expectation', 'Prior to This'],
+    'ipo': ['date', 'Symbol', 'Company', 'Exchange',
+            'Price Range', 'Price', 'Currency', 'Shares'],
+    'splits': ['date', 'Symbol', 'Company', 'Payable On',
+               'Optionable?', 'Ratio'],
+}
+
+# Excel 저장 시 산출물 이름별 시트 이름
+EXCEL_SHEETS = {
+    'earnings': 'Earnings',
+    'economic': 'Economic',
+    'ipo': 'IPO',
+    'splits': 'Splits',
+    'daily_summary': 'Daily_Summary',
+}
+
+def load_and_process_data(file_path, start_date=None, end_date=None):
+    # 이벤트 타입별로 필요한 컬럼과 기간만 읽기
+    # (Parquet 저장소, JSON Lines 파티션 디렉토리, JSON 파일 모두 지원)
+    frames = load_event_frames(file_path, EVENT_COLUMNS, start_date, end_date)
+    earnings_df = frames['earnings']
+    economic_df = frames['economic']
+    ipo_df = frames['ipo']
+    splits_df = frames['splits']
+    
+    # Economic 데이터의 날짜와 발표 시각을 한 번에 결합해 UTC 타임스탬프 컬럼 생성
+    # (원본 'Event Time' 문자열은 그대로 두고 이후 단계는 이 컬럼을 사용)
+    economic_df[EVENT_TIME_UTC_COLUMN] = parse_event_times(economic_df['date'], economic_df['Event Time'])
     
     return earnings_df, economic_df, ipo_df, splits_df
 
-def create_visualizations(earnings_df, economic_df, ipo_df, splits_df):
+def create_visualizations(summaries):
+    # 그래프는 모두 aggregate.summarize_events 에서 한 번 계산한 집계 결과를 사용
     # 1. 일별 이벤트 수 시각화
-    daily_counts = pd.DataFrame({
-        'earnings': earnings_df.groupby('date').size(),
-        'economic': economic_df.groupby('date').size(),
-        'ipo': ipo_df.groupby('date').size(),
-        'splits': splits_df.groupby('date').size()
-    }).fillna(0)
+    daily_counts = summaries.daily_counts
     
     fig1 = go.Figure()
     for col in daily_counts.columns:
@@ -62,11 +70,11 @@ def create_visualizations(earnings_df, economic_df, ipo_df, splits_df):
     )
     
     # 2. 경제 지표 국가별 분포
-    if not economic_df.empty:
-        country_counts = economic_df['Country'].value_counts()
+    if summaries.totals['economic']:
+        country_counts = summaries.country_counts
         fig2 = px.pie(
             values=country_counts.values,
-            names=country_counts.index,
+            names=country_counts.index.astype(str),
             title='경제 지표 국가별 분포'
         )
     else:
@@ -74,11 +82,10 @@ def create_visualizations(earnings_df, economic_df, ipo_df, splits_df):
         fig2.add_annotation(text="경제 지표 데이터 없음")
     
     # 3. 실적 발표 시간대 분포
-    if not earnings_df.empty:
-        earnings_df['Earnings Call Time'] = earnings_df['Earnings Call Time'].fillna('Unknown')
-        time_counts = earnings_df['Earnings Call Time'].value_counts()
+    if summaries.totals['earnings']:
+        time_counts = summaries.call_time_counts
         fig3 = px.bar(
-            x=time_counts.index,
+            x=time_counts.index.astype(str),
             y=time_counts.values,
             title='실적 발표 시간대 분포'
         )
@@ -86,109 +93,114 @@ def create_visualizations(earnings_df, economic_df, ipo_df, splits_df):
         fig3 = go.Figure()
         fig3.add_annotation(text="실적 발표 데이터 없음")
     
-    # 4. EPS Surprise 분포
-    if not earnings_df.empty:
-        earnings_df['Surprise (%)'] = pd.to_numeric(earnings_df['Surprise (%)'].str.replace('-', 'NaN'), errors='coerce')
-        fig4 = px.histogram(
-            earnings_df,
-            x='Surprise (%)',
-            title='EPS Surprise 분포',
-            nbins=50
-        )
+    # 4. EPS Surprise 분포 (미리 나눈 구간별 건수)
+    if summaries.totals['earnings']:
+        bins = summaries.surprise_bins
+        fig4 = go.Figure(go.Bar(
+            x=(bins['left'] + bins['right']) / 2,
+            y=bins['count'],
+            width=bins['right'] - bins['left'],
+        ))
+        fig4.update_layout(title='EPS Surprise 분포', xaxis_title='Surprise (%)', yaxis_title='count', bargap=0)
     else:
         fig4 = go.Figure()
         fig4.add_annotation(text="실적 발표 데이터 없음")
     
     # 5. 경제 지표 시간대별 분포
-    if not economic_df.empty:
-        economic_df['Event Time'] = pd.to_datetime(economic_df['Event Time'], format='%I:%M %p UTC', errors='coerce')
-        fig5 = px.histogram(
-            economic_df,
-            x='Event Time',
-            title='경제 지표 발표 시간대 분포',
-            nbins=24
-        )
+    if summaries.totals['economic']:
+        # 정규화 단계에서 만든 UTC 타임스탬프의 시(hour)별 건수
+        hour_counts = summaries.event_hour_counts
+        fig5 = go.Figure(go.Bar(x=hour_counts.index, y=hour_counts.values))
+        fig5.update_layout(title='경제 지표 발표 시간대 분포 (UTC)', xaxis_title='Hour (UTC)', yaxis_title='count', bargap=0)
     else:
         fig5 = go.Figure()
         fig5.add_annotation(text="경제 지표 데이터 없음")
     
     return fig1, fig2, fig3, fig4, fig5
 
-def main():
+def main(output_dir=DEFAULT_ANALYSIS_DIR, excel=False, plotlyjs='directory'):
     # 데이터 로드
-    earnings_df, economic_df, ipo_df, splits_df = load_and_process_data('yf_calendar_events.json')
+    earnings_df, economic_df, ipo_df, splits_df = load_and_process_data(default_event_source())
+    
+    # 리포트에 필요한 집계를 한 번에 계산
+    summaries = summarize_events({
+        'earnings': earnings_df,
+        'economic': economic_df,
+        'ipo': ipo_df,
+        'splits': splits_df,
+    })
     
     # 시각화 생성
-    fig1, fig2, fig3, fig4, fig5 = create_visualizations(earnings_df, economic_df, ipo_df, splits_df)
-    
-    # Excel 파일로 저장
-    with pd.ExcelWriter('event_analysis.xlsx', engine='openpyxl') as writer:
-        # Earnings 데이터 저장
-        earnings_columns = ['date', 'Symbol', 'Company', 'Event Name', 'Earnings Call Time', 
-                          'EPS Estimate', 'Reported EPS', 'Surprise (%)']
-        earnings_df[earnings_columns].to_excel(writer, sheet_name='Earnings', index=False)
-        
-        # Economic 데이터 저장
-        economic_columns = ['date', 'Country', 'Event', 'Event Time', 
-                          'Actual', 'Market Expectation', 'Prior to This']
-        economic_df[economic_columns].to_excel(writer, sheet_name='Economic', index=False)
-        
-        # IPO 데이터 저장
-        ipo_columns = ['date', 'Symbol', 'Company', 'Exchange', 
-                      'Price Range', 'Price', 'Currency', 'Shares']
-        ipo_df[ipo_columns].to_excel(writer, sheet_name='IPO', index=False)
-        
-        # Splits 데이터 저장
-        splits_columns = ['date', 'Symbol', 'Company', 'Payable On', 
-                         'Optionable?', 'Ratio']
-        splits_df[splits_columns].to_excel(writer, sheet_name='Splits', index=False)
-        
+    fig1, fig2, fig3, fig4, fig5 = create_visualizations(summaries)
+    
+    # 다음 단계(event_stock_analysis)로 넘길 테이블
+    tables = {
+        'earnings': earnings_df[EVENT_COLUMNS['earnings']],
+        'economic': economic_df[EVENT_COLUMNS['economic'] + [EVENT_TIME_UTC_COLUMN]],
+        'ipo': ipo_df[EVENT_COLUMNS['ipo']],
+        'splits': splits_df[EVENT_COLUMNS['splits']],
         # 일별 이벤트 수 요약
-        daily_counts = pd.DataFrame({
-            'earnings': earnings_df.groupby('date').size(),
-            'economic': economic_df.groupby('date').size(),
-            'ipo': ipo_df.groupby('date').size(),
-            'splits': splits_df.groupby('date').size()
-        }).fillna(0)
-        daily_counts.to_excel(writer, sheet_name='Daily_Summary')
-    
-    # HTML 파일로 저장
-    with open('event_analysis.html', 'w', encoding='utf-8') as f:
-        f.write('<html><head><title>Yahoo Finance 이벤트 분석</title></head><body>')
-        f.write('<h1>Yahoo Finance 이벤트 분석</h1>')
-        
-        # 데이터 요약
-        f.write('<h2>데이터 요약</h2>')
-        summary = pd.DataFrame({
-            '이벤트 타입': ['earnings', 'economic', 'ipo', 'splits'],
-            '총 이벤트 수': [
-                len(earnings_df),
-                len(economic_df),
-                len(ipo_df),
-                len(splits_df)
-            ]
-        })
-        f.write(summary.to_html())
-        
-        # 그래프 저장
-        f.write('<h2>일별 이벤트 수 추이</h2>')
-        f.write(fig1.to_html(full_html=False))
-        
-        f.write('<h2>경제 지표 국가별 분포</h2>')
-        f.write(fig2.to_html(full_html=False))
-        
-        f.write('<h2>실적 발표 시간대 분포</h2>')
-        f.write(fig3.to_html(full_html=False))
-        
-        f.write('<h2>EPS Surprise 분포</h2>')
-        f.write(fig4.to_html(full_html=False))
-        
-        f.write('<h2>경제 지표 발표 시간대 분포</h2>')
-        f.write(fig5.to_html(full_html=False))
-        
-        f.write('</body></html>')
-    
-    print("분석 결과가 'event_analysis.html' 및 'event_analysis.xlsx' 파일로 저장되었습니다.")
+        'daily_summary': summaries.daily_counts,
+    }
+    
+    # 기본 산출물: 타입이 유지되는 Feather 파일
+    write_analysis_tables(tables, output_dir)
+    
+    # Excel 파일은 요청한 경우에만 저장
+    if excel:
+        with pd.ExcelWriter('event_analysis.xlsx', engine='openpyxl') as writer:
+            for name, sheet_name in EXCEL_SHEETS.items():
+                sheet = tables[name]
+                # Excel 은 시간대가 있는 datetime 을 지원하지 않으므로 UTC 기준 naive 로 변환
+                if EVENT_TIME_UTC_COLUMN in sheet:
+                    sheet = sheet.assign(**{EVENT_TIME_UTC_COLUMN: sheet[EVENT_TIME_UTC_COLUMN].dt.tz_localize(None)})
+                sheet.to_excel(writer, sheet_name=sheet_name, index=(name == 'daily_summary'))
+    
+    # HTML 파일로 저장 (plotly.js 는 리포트에서 한 번만 포함/참조)
+    report = HtmlReport('Yahoo Finance 이벤트 분석', plotlyjs=plotlyjs)
+    
+    # 데이터 요약
+    report.heading('데이터 요약')
+    summary = pd.DataFrame({
+        '이벤트 타입': summaries.totals.index,
+        '총 이벤트 수': summaries.totals.values
+    })
+    report.table(summary)
+    
+    # 그래프 저장
+    report.heading('일별 이벤트 수 추이')
+    report.figure(fig1)
+    
+    report.heading('경제 지표 국가별 분포')
+    report.figure(fig2)
+    
+    report.heading('실적 발표 시간대 분포')
+    report.figure(fig3)
+    
+    report.heading('EPS Surprise 분포')
+    report.figure(fig4)
+    
+    report.heading('경제 지표 발표 시간대 분포')
+    report.figure(fig5)
+    
+    report.write('event_analysis.html')
+    
+    outputs = ["'event_analysis.html'", f"'{output_dir}/'"]
+    if excel:
+        outputs.append("'event_analysis.xlsx'")
+    print(f"분석 결과가 {', '.join(outputs)} 에 저장되었습니다.")
+
+def cli(argv=None):
+    """커맨드 라인 실행 (cli.py analyze 에서도 사용)"""
+    parser = argparse.ArgumentParser(description='Yahoo Finance 이벤트 분석')
+    parser.add_argument('--output-dir', default=DEFAULT_ANALYSIS_DIR,
+                        help='다음 단계로 넘길 Feather 파일 디렉토리')
+    parser.add_argument('--excel', action='store_true',
+                        help='event_analysis.xlsx 도 함께 저장')
+    parser.add_argument('--plotlyjs', choices=PLOTLYJS_MODES, default='directory',
+                        help='plotly.js 포함 방식 (directory: 같은 디렉토리에 한 번 저장, cdn: CDN 참조, inline: 파일에 한 번 포함)')
+    args = parser.parse_args(argv)
+    main(output_dir=args.output_dir, excel=args.excel, plotlyjs=args.plotlyjs)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    cli() 
\ No newline at end of file
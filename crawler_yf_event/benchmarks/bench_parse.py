@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+캘린더 페이지 파싱 벤치마크
+
+저장된 HTML 파일(<fixtures>/<event_type>/*.html) 또는 run_crawler.py --record 로 기록한
+응답 저장소를 대상으로 기존 방식(응답마다 XPath 설정 생성,
+셀마다 Selector.xpath 호출)과 컴파일된 XPath 파서의 페이지당 파싱 시간을 비교한다.
+
+    python benchmarks/bench_parse.py fixtures --repeat 20
+    python benchmarks/bench_parse.py tests/fixtures/calendar   # 저장소에 포함된 기록 응답
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from parsel import Selector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from crawler_yf_event.parsing import CalendarTableParser, XPATH_CONFIGS
+from crawler_yf_event.response_store import ResponseStore
+
+
+def legacy_parse(html, event_type):
+    """기존 YFCalendarSpider.parse 의 추출 로직"""
+    response = Selector(text=html)
+    xpath_configs = {key: dict(value) for key, value in XPATH_CONFIGS.items()}
+    config = xpath_configs[event_type]
+
+    results_text = response.xpath(config['results']).get()
+    total_results = 0
+    if results_text:
+        match = re.search(r'of (\d+) Results', results_text)
+        if match:
+            total_results = int(match.group(1))
+
+    table = response.xpath(config['table'])
+    if not table:
+        return total_results, []
+
+    headers = table.xpath(config['headers'])
+    header_texts = [header.xpath('.//text()').get().strip() for header in headers if header.xpath('.//text()').get()]
+
+    items = []
+    for row in table.xpath(config['rows']):
+        item = {}
+        for idx, cell in enumerate(row.xpath('.//td')):
+            if idx < len(header_texts):
+                header = header_texts[idx]
+                if event_type == 'economic' and header == 'Event':
+                    value = cell.xpath('.//text()').get()
+                elif idx == 0:
+                    value = cell.xpath('.//a/text()').get()
+                else:
+                    value = cell.xpath('.//text()').get()
+                if value:
+                    item[header] = value.strip()
+        items.append(item)
+    response.xpath(config['next_button'])
+    return total_results, items
+
+
+def compiled_parse(parser, html, event_type):
+    """컴파일된 XPath 파서 (스파이더와 동일하게 parsel 이 만든 lxml 트리 사용)"""
+    page = parser.parse(Selector(text=html).root, event_type)
+    items = [
+        {header: value for header, value in zip(page.headers, row) if value is not None}
+        for row in page.rows
+    ]
+    return page.total_results, items
+
+
+def load_fixtures(fixtures_dir):
+    fixtures = {}
+    for event_type in XPATH_CONFIGS:
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, event_type, '*.html'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                fixtures.setdefault(event_type, []).append(f.read())
+    if fixtures:
+        return fixtures
+
+    # HTML 파일이 없으면 응답 저장소로 간주
+    for meta, body in ResponseStore(fixtures_dir).iter_entries():
+        event_type = meta['meta'].get('event_type')
+        if event_type in XPATH_CONFIGS:
+            fixtures.setdefault(event_type, []).append(body.decode('utf-8'))
+    return fixtures
+
+
+def bench(fn, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            fn(html)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='캘린더 페이지 파싱 벤치마크')
+    parser.add_argument('fixtures', help='<event_type>/*.html 구조의 HTML 디렉토리 또는 응답 저장소')
+    parser.add_argument('--repeat', type=int, default=10, help='페이지별 반복 횟수')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"'{args.fixtures}' 에서 HTML 파일을 찾을 수 없습니다.")
+        return
+
+    table_parser = CalendarTableParser()
+    print(f"{'event_type':<10} {'pages':>6} {'legacy ms/page':>15} {'compiled ms/page':>17} {'speedup':>8}")
+    for event_type, pages in fixtures.items():
+        # 두 방식의 추출 결과가 같은지 먼저 확인
+        for html in pages:
+            if legacy_parse(html, event_type) != compiled_parse(table_parser, html, event_type):
+                print(f'[{event_type}] 추출 결과가 다릅니다.')
+                break
+
+        legacy = bench(lambda html: legacy_parse(html, event_type), pages, args.repeat)
+        compiled = bench(lambda html: compiled_parse(table_parser, html, event_type), pages, args.repeat)
+        print(f'{event_type:<10} {len(pages):>6} {legacy * 1000:>15.3f} {compiled * 1000:>17.3f} {legacy / compiled:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+스파이더 파싱 처리량 벤치마크
+
+run_crawler.py --record 로 기록한 응답 저장소의 페이지를 YFCalendarSpider.parse 에 그대로 넣어
+이벤트 타입별 pages/sec, items/sec 를 측정한다. 네트워크와 Scrapy 엔진은 사용하지 않는다.
+
+    python benchmarks/bench_spider.py fixtures --repeat 5
+    python benchmarks/bench_spider.py fixtures --backend embedded
+    python benchmarks/bench_spider.py tests/fixtures/calendar
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from crawler_yf_event.response_store import ResponseStore
+from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+
+
+def load_pages(store_dir):
+    """이벤트 타입별 (url, meta, status, headers, body) 목록"""
+    pages = {}
+    for header, body in ResponseStore(store_dir).iter_entries():
+        event_type = header['meta'].get('event_type')
+        if event_type:
+            pages.setdefault(event_type, []).append(
+                (header['url'], header['meta'], header['status'], header['headers'], body)
+            )
+    return pages
+
+
+def run(spider, pages):
+    """페이지를 모두 파싱하고 생성된 아이템 수 반환"""
+    items = 0
+    for url, meta, status, headers, body in pages:
+        request = Request(url, meta=dict(meta))
+        response = HtmlResponse(url, status=status, headers=headers, body=body, request=request)
+        for result in spider.parse(response):
+            if not isinstance(result, Request):
+                items += 1
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스파이더 파싱 처리량 벤치마크')
+    parser.add_argument('store', help='기록된 응답 저장소 디렉토리')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수')
+    parser.add_argument('--backend', choices=['xpath', 'embedded'], default='xpath', help='추출 방식')
+    args = parser.parse_args()
+
+    pages = load_pages(args.store)
+    if not pages:
+        print(f"'{args.store}' 에서 기록된 응답을 찾을 수 없습니다.")
+        return
+
+    settings = {'EXTRACTION_BACKENDS': {event_type: args.backend for event_type in pages}}
+    spider = YFCalendarSpider.from_crawler(get_crawler(YFCalendarSpider, settings))
+    print(f"{'event_type':<10} {'pages':>6} {'items':>7} {'pages/sec':>10} {'items/sec':>11}")
+    for event_type, event_pages in sorted(pages.items()):
+        start = time.perf_counter()
+        items = 0
+        for _ in range(args.repeat):
+            items += run(spider, event_pages)
+        elapsed = time.perf_counter() - start
+        print(f'{event_type:<10} {len(event_pages):>6} {items // args.repeat:>7} '
+              f'{len(event_pages) * args.repeat / elapsed:>10.1f} {items / elapsed:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
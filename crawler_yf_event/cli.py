@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# 통합 실행 진입점
+#
+#   python cli.py crawl --start-date 2025-03-01 --end-date 2025-03-07
+#   python cli.py collect
+#   python cli.py analyze --excel
+#   python cli.py report
+#   python cli.py pipeline --crawl --incremental
+#   python cli.py --import-times analyze
+#
+# 하위 명령에 해당하는 스크립트만 실행 시점에 불러오므로, 다른 단계의 무거운 의존성
+# (Scrapy, plotly, yfinance 등)은 로드하지 않는다. --import-times 를 주면 끝난 뒤
+# 최상위 패키지별 import 소요 시간을 출력한다.
+
+import argparse
+import builtins
+import sys
+import time
+
+# 하위 명령 -> (모듈, 설명)
+COMMANDS = {
+    'crawl': ('run_crawler', 'Yahoo Finance 이벤트 캘린더 크롤링'),
+    'collect': ('collect_stock_data', '시가총액 및 주가 데이터 수집'),
+    'analyze': ('analyze_events', '이벤트 분석 리포트와 분석 테이블 생성'),
+    'report': ('event_stock_analysis', '이벤트 전후 주가 성과 리포트 생성'),
+    'pipeline': ('run_pipeline', '전체 단계 실행 (입력이 바뀐 단계만, 독립 단계는 동시에)'),
+}
+
+
+class ImportTimer:
+    """builtins.__import__ 를 감싸 새로 로드되는 모듈의 import 시간을 최상위 패키지별로 합산
+
+    다른 패키지를 불러오는 데 걸린 시간은 그 패키지에 포함되도록 (자기 시간만 합산) 스택으로 나눈다.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.stack = []
+        self._import = builtins.__import__
+
+    def install(self):
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        builtins.__import__ = self._import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # 이미 로드된 모듈과 상대 import 는 측정하지 않음 (상대 import 시간은 바깥 모듈에 포함)
+        if level or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        frame = [name.split('.')[0], 0.0]
+        self.stack.append(frame)
+        started = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stack.pop()
+            package, children = frame
+            self.totals[package] = self.totals.get(package, 0.0) + elapsed - children
+            if self.stack:
+                self.stack[-1][1] += elapsed
+
+    def report(self, elapsed, limit=15):
+        total = sum(self.totals.values())
+        lines = [f'import 시간: {total:.2f}초 / 전체 {elapsed:.2f}초 ({total / elapsed:.0%})' if elapsed else
+                 f'import 시간: {total:.2f}초']
+        for package, seconds in sorted(self.totals.items(), key=lambda item: -item[1])[:limit]:
+            lines.append(f'  {package:<24} {seconds:.3f}초')
+        return '\n'.join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description='Yahoo Finance 이벤트 수집/분석 통합 실행',
+        epilog='하위 명령의 옵션은 "python cli.py <명령> --help" 로 확인',
+    )
+    parser.add_argument('--import-times', action='store_true',
+                        help='실행이 끝난 뒤 패키지별 import 소요 시간 출력')
+    subparsers = parser.add_subparsers(dest='command', metavar='<명령>', required=True)
+    for command, (_, help_text) in COMMANDS.items():
+        # 하위 명령의 인자(--help 포함)는 해당 스크립트의 cli() 가 직접 해석
+        subparsers.add_parser(command, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    args, command_args = build_parser().parse_known_args(argv)
+    module_name = COMMANDS[args.command][0]
+
+    started = time.perf_counter()
+    timer = ImportTimer() if args.import_times else None
+    if timer:
+        timer.install()
+    try:
+        module = __import__(module_name)
+        module.cli(command_args)
+    finally:
+        if timer:
+            timer.uninstall()
+            print(timer.report(time.perf_counter() - started), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
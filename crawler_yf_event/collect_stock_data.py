@@ -1,14 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import argparse
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, timedelta
 import os
-import json
-from tqdm import tqdm
 import time
-import FinanceDataReader as fdr
+from crawler_yf_event.event_store import load_event_frames, default_event_source
+from crawler_yf_event.price_cache import PriceCache, LocalCsvProvider
+from crawler_yf_event.market_cap import MarketCapService, load_sp500_tickers
 
 def create_db_directory():
     """db 디렉토리 생성"""
@@ -16,18 +16,16 @@ def create_db_directory():
         os.makedirs('db')
 
 def load_event_data(file_path):
-    """이벤트 데이터 로드"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return pd.DataFrame(data)
+    """이벤트 데이터 로드 (실적 발표 종목 코드만 사용)"""
+    frames = load_event_frames(file_path, {'earnings': ['date', 'Symbol']})
+    return frames['earnings']
 
 def get_us_market_tickers():
-    """미국 시장 종목 목록 가져오기"""
+    """미국 시장 종목 목록 가져오기 (하루 동안 캐시)"""
     print("미국 시장 종목 목록 수집 중...")
     
     # S&P500 종목 목록만 수집
-    sp500 = fdr.StockListing('S&P500')
-    us_tickers = set(sp500['Symbol'].tolist())
+    us_tickers = set(load_sp500_tickers('db/sp500_tickers.json'))
     print(f"총 {len(us_tickers)}개의 미국 시장 종목 발견")
     
     return list(us_tickers)
@@ -35,7 +33,7 @@ def get_us_market_tickers():
 def collect_market_cap_data(df, n=10):
     """시가총액 데이터 수집"""
     # 미국 시장 종목 필터링
-    us_tickers = get_us_market_tickers()
+    us_tickers = set(get_us_market_tickers())
     
     # 이벤트 데이터에서 미국 시장 종목만 필터링
     event_tickers = df[df['event_type'] == 'earnings']['Symbol'].unique()
@@ -43,18 +41,13 @@ def collect_market_cap_data(df, n=10):
     print(f"필터링 후 {len(filtered_tickers)}개의 종목 선택됨")
     
     try:
-        # 모든 종목 한 번에 처리
+        # 캐시에 없는 종목만 병렬 조회
         print("시가총액 데이터 수집 중...")
-        stocks = yf.Tickers(filtered_tickers)
-        
-        # 시가총액 데이터 수집
-        market_caps = {}
-        for ticker in filtered_tickers:
-            market_cap = stocks.tickers[ticker].info.get('marketCap', 0)
-            market_caps[ticker] = market_cap
+        service = MarketCapService('db/market_cap_cache.json')
         
         # 상위 n개 티커 선택
-        top_tickers = sorted(market_caps.items(), key=lambda x: x[1], reverse=True)[:n]
+        top_tickers = service.top_n(filtered_tickers, n)
+        print(f"캐시 {service.hits}건 사용, {service.misses}건 조회")
         
         # DataFrame 생성 및 저장
         market_cap_df = pd.DataFrame(top_tickers, columns=['Symbol', 'Market_Cap'])
@@ -65,39 +58,38 @@ def collect_market_cap_data(df, n=10):
         print(f"\n시가총액 데이터 수집 중 오류 발생: {e}")
         return None
 
-def collect_stock_price_data():
-    """주가 데이터 수집 (최근 1년)"""
+def collect_stock_price_data(provider=None):
+    """주가 데이터 수집 (최근 1년, 로컬 캐시에 없는 구간만 다운로드)"""
     # market_caps.csv에서 상위 종목 목록 로드
     market_cap_df = pd.read_csv('db/market_caps.csv')
     top_tickers = market_cap_df['Symbol'].tolist()
     print(f"시가총액 상위 {len(top_tickers)}개 종목의 주가 데이터 수집 시작")
     
     # 날짜 범위 설정 (최근 1년)
-    end_date = datetime.now()
+    end_date = datetime.combine(datetime.now().date(), datetime.min.time())
     start_date = end_date - timedelta(days=365)
     
     try:
-        # 모든 종목 한 번에 다운로드
+        # 캐시에 없는 구간만 종목을 묶어서 다운로드
         print("주가 데이터 다운로드 중...")
-        price_df = yf.download(top_tickers, start=start_date, end=end_date)
+        cache = PriceCache('db/price_cache', provider=provider)
+        prices = cache.get(top_tickers, start_date, end_date)
         
-        # 각 티커별로 데이터 분리 및 저장
-        for ticker in top_tickers:
-            if ticker in price_df.columns.get_level_values(1):
-                ticker_data = price_df.xs(ticker, axis=1, level=1)
-                if not ticker_data.empty:
-                    # 종가 기준으로 정규화
-                    ticker_data['Normalized_Price'] = ticker_data['Close'] / ticker_data['Close'].iloc[0] - 1
-                    # 데이터 저장
-                    ticker_data.to_csv(f'db/stock_prices_{ticker}.csv')
-                    print(f"{ticker} 데이터 저장 완료")
+        # 각 티커별로 데이터 저장
+        for ticker, ticker_data in prices.items():
+            ticker_data = ticker_data.copy()
+            # 종가 기준으로 정규화
+            ticker_data['Normalized_Price'] = ticker_data['Close'] / ticker_data['Close'].iloc[0] - 1
+            # 데이터 저장
+            ticker_data.to_csv(f'db/stock_prices_{ticker}.csv')
+            print(f"{ticker} 데이터 저장 완료")
         
-        return price_df
+        return prices
     except Exception as e:
         print(f"\n데이터 다운로드 중 오류 발생: {e}")
         return None
 
-def main():
+def main(price_source=None):
     start_time = time.time()
     
     # db 디렉토리 생성
@@ -105,7 +97,7 @@ def main():
     
     # 이벤트 데이터 로드
     print("이벤트 데이터 로드 중...")
-    df = load_event_data('yf_calendar_events.json')
+    df = load_event_data(default_event_source())
     print(f"총 {len(df)}개의 이벤트 데이터 로드됨")
     
     # 시가총액 데이터 수집
@@ -115,7 +107,8 @@ def main():
     
     # 주가 데이터 수집
     print("\n주가 데이터 수집 중...")
-    price_data = collect_stock_price_data()
+    provider = LocalCsvProvider(price_source) if price_source else None
+    price_data = collect_stock_price_data(provider)
     print(f"{len(price_data)}개 티커의 주가 데이터 수집 완료")
     
     end_time = time.time()
@@ -126,5 +119,12 @@ def main():
     print(f"- 시가총액 데이터: db/market_caps.csv")
     print(f"- 주가 데이터: db/stock_prices_*.csv")
 
+def cli(argv=None):
+    """커맨드 라인 실행 (cli.py collect 에서도 사용)"""
+    parser = argparse.ArgumentParser(description='시가총액 및 주가 데이터 수집')
+    parser.add_argument('--price-source', type=str, help='yfinance 대신 사용할 로컬 CSV 디렉토리 (stock_prices_{ticker}.csv)')
+    args = parser.parse_args(argv)
+    main(price_source=args.price_source)
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    cli()
@@ -0,0 +1,87 @@
+# 리포트용 이벤트 집계
+#
+# 이벤트 타입별 DataFrame 에서 리포트에 필요한 컬럼만 모아 범주형(category) 컬럼으로 된
+# 하나의 프레임을 만들고, 일별 이벤트 수/국가별 분포/실적 발표 시간대/Surprise 구간/
+# 경제 지표 발표 시각 분포를 한 번씩만 계산해 둔다. 그래프와 Excel/HTML 저장은 이 결과를 읽는다.
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .normalize import EVENT_TIME_UTC_COLUMN
+
+EVENT_TYPES = ['earnings', 'economic', 'ipo', 'splits']
+
+# 집계 결과
+#   totals: 이벤트 타입별 전체 건수 (Series, EVENT_TYPES 순서)
+#   daily_counts: 날짜 x 이벤트 타입 건수 (DataFrame)
+#   country_counts: 경제 지표 국가별 건수 (많은 순)
+#   call_time_counts: 실적 발표 시간대별 건수 (값이 없으면 'Unknown')
+#   surprise_bins: EPS Surprise (%) 히스토그램 구간 (left, right, count)
+#   event_hour_counts: 경제 지표 발표 시각(UTC)의 시(0~23)별 건수
+EventSummaries = namedtuple('EventSummaries', [
+    'totals', 'daily_counts', 'country_counts', 'call_time_counts', 'surprise_bins', 'event_hour_counts',
+])
+
+SUMMARY_COLUMNS = ['date', 'event_type', 'Country', 'Earnings Call Time', 'Surprise (%)', 'hour']
+
+
+def summary_frame(frames):
+    """이벤트 타입별 DataFrame 에서 집계에 필요한 컬럼만 모은 범주형 프레임"""
+    parts = []
+    for event_type in EVENT_TYPES:
+        df = frames.get(event_type)
+        if df is None or df.empty:
+            continue
+        part = pd.DataFrame({'date': pd.to_datetime(df['date']).to_numpy()})
+        part['event_type'] = event_type
+        if event_type == 'economic':
+            part['Country'] = df['Country'].to_numpy()
+            if EVENT_TIME_UTC_COLUMN in df:
+                part['hour'] = df[EVENT_TIME_UTC_COLUMN].dt.hour.to_numpy()
+        elif event_type == 'earnings':
+            part['Earnings Call Time'] = df['Earnings Call Time'].fillna('Unknown').to_numpy()
+            part['Surprise (%)'] = pd.to_numeric(df['Surprise (%)'], errors='coerce').to_numpy()
+        parts.append(part)
+
+    combined = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    combined = combined.reindex(columns=SUMMARY_COLUMNS)
+    combined['date'] = pd.to_datetime(combined['date'])
+    combined['event_type'] = pd.Categorical(combined['event_type'], categories=EVENT_TYPES)
+    for column in ('Country', 'Earnings Call Time'):
+        combined[column] = combined[column].astype('category')
+    combined['Surprise (%)'] = combined['Surprise (%)'].astype(float)
+    return combined
+
+
+def summarize_events(frames, surprise_bins=50):
+    """리포트에 필요한 모든 집계를 한 번에 계산해 EventSummaries 로 반환"""
+    df = summary_frame(frames)
+
+    totals = df['event_type'].value_counts(sort=False).reindex(EVENT_TYPES, fill_value=0)
+
+    daily_counts = (
+        df.groupby(['date', 'event_type'], observed=False).size()
+        .unstack('event_type')
+        .reindex(columns=EVENT_TYPES, fill_value=0)
+    )
+    daily_counts.columns = list(daily_counts.columns)
+
+    # 범주형 value_counts 는 건수가 0인 범주도 포함하므로 제외
+    country_counts = df['Country'].value_counts()
+    country_counts = country_counts[country_counts > 0]
+    call_time_counts = df['Earnings Call Time'].value_counts()
+    call_time_counts = call_time_counts[call_time_counts > 0]
+
+    surprise = df['Surprise (%)'].dropna().to_numpy()
+    if len(surprise):
+        counts, edges = np.histogram(surprise, bins=surprise_bins)
+    else:
+        counts, edges = np.array([], dtype=int), np.array([0.0])
+    bins = pd.DataFrame({'left': edges[:-1], 'right': edges[1:], 'count': counts})
+
+    hours = df['hour'].dropna().astype(int).to_numpy()
+    event_hour_counts = pd.Series(np.bincount(hours, minlength=24)[:24], index=pd.RangeIndex(24, name='hour'))
+
+    return EventSummaries(totals, daily_counts, country_counts, call_time_counts, bins, event_hour_counts)
@@ -0,0 +1,204 @@
+# asyncio 기반 캘린더 수집기
+#
+# Scrapy 엔진/Twisted reactor 없이 YFCalendarSpider 의 요청 생성(start_requests, 페이지 fan-out)과
+# 파싱(parse)을 그대로 사용하고, 결과는 같은 파이프라인(CrawlerYfEventPipeline)에 기록한다.
+# HTTP 요청은 keep-alive 연결 풀을 쓰는 httpx.AsyncClient 로 보내며, 응답 캐시
+# (CrawlerYfEventDownloaderMiddleware)와 응답 기록/재생(ReplayMiddleware)도 같은 설정으로 적용된다.
+#
+# 비동기 서비스 안에서는 `await AsyncCalendarCrawler(settings, ...).crawl()` 로 사용한다.
+
+import asyncio
+import logging
+import time
+
+import scrapy
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import HtmlResponse
+
+from .middlewares import CrawlerYfEventDownloaderMiddleware, ReplayMiddleware
+from .pipelines import CrawlerYfEventPipeline
+from .spiders.yf_calendar_spider import YFCalendarSpider
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 응답 코드 (Scrapy RetryMiddleware 기본값과 같음)
+RETRY_HTTP_CODES = {500, 502, 503, 504, 522, 524, 408, 429}
+
+# 본문은 httpx 가 이미 압축을 풀었으므로 전달하지 않는 헤더
+SKIP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class CrawlStats:
+    """파이프라인/수집기 통계 (Scrapy StatsCollector 의 inc_value/set_value 만 지원)"""
+
+    def __init__(self):
+        self.values = {}
+
+    def inc_value(self, key, count=1, start=0):
+        self.values[key] = self.values.get(key, start) + count
+
+    def set_value(self, key, value):
+        self.values[key] = value
+
+    def get_value(self, key, default=None):
+        return self.values.get(key, default)
+
+    def get_stats(self):
+        return dict(self.values)
+
+
+class AsyncCalendarCrawler:
+    """YFCalendarSpider 의 요청/파싱을 asyncio 작업자로 실행하는 수집기"""
+
+    def __init__(self, settings, concurrency=None, delay=None, retry_times=None, timeout=None, **spider_kwargs):
+        self.settings = settings
+        self.concurrency = concurrency or settings.getint('ASYNC_CRAWL_CONCURRENCY', 4)
+        self.delay = settings.getfloat('ASYNC_CRAWL_DELAY', 0.5) if delay is None else delay
+        self.retry_times = settings.getint('RETRY_TIMES', 2) if retry_times is None else retry_times
+        self.timeout = timeout or settings.getfloat('DOWNLOAD_TIMEOUT', 30)
+        self.spider_kwargs = spider_kwargs
+        self.stats = CrawlStats()
+        self.seen_urls = set()
+
+    async def crawl(self):
+        """수집을 끝까지 실행하고 통계 dict 반환"""
+        import httpx
+
+        spider = YFCalendarSpider(**self.spider_kwargs)
+        spider.configure(self.settings)
+        pipeline = CrawlerYfEventPipeline.from_settings(self.settings, self.stats)
+        cache = CrawlerYfEventDownloaderMiddleware.from_settings(self.settings)
+        replay = ReplayMiddleware.from_settings(self.settings)
+        pipeline.open_spider(spider)
+
+        started = time.monotonic()
+        queue = asyncio.Queue()
+        for request in spider.start_requests():
+            self._enqueue(queue, request)
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        headers = {'User-Agent': self.settings.get('USER_AGENT')}
+        reason = 'finished'
+        try:
+            async with httpx.AsyncClient(limits=limits, timeout=self.timeout, headers=headers,
+                                         follow_redirects=True) as client:
+                workers = [
+                    asyncio.create_task(self._worker(client, queue, spider, pipeline, cache, replay))
+                    for _ in range(self.concurrency)
+                ]
+                try:
+                    await queue.join()
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        except asyncio.CancelledError:
+            reason = 'cancelled'
+            raise
+        finally:
+            pipeline.close_spider(spider)
+            spider.closed(reason)
+            if cache.store is not None:
+                for name, value in cache.report(spider).items():
+                    self.stats.set_value(f'http_cache/{name}', value)
+            if replay.mode != 'off':
+                replay.spider_closed(spider)
+                self.stats.set_value(f'http_replay/{replay.mode}', replay.count)
+            elapsed = time.monotonic() - started
+            self.stats.set_value('elapsed_time_seconds', round(elapsed, 3))
+            logger.info(
+                f'Async crawl {reason}: {self.stats.get_value("pages", 0)} pages, '
+                f'{self.stats.get_value("items", 0)} items in {elapsed:.1f}s'
+            )
+        return self.stats.get_stats()
+
+    def _enqueue(self, queue, request):
+        # Scrapy 중복 필터와 같이 dont_filter 가 아닌 요청은 URL 기준으로 한 번만 요청
+        if not request.dont_filter:
+            if request.url in self.seen_urls:
+                return
+            self.seen_urls.add(request.url)
+        queue.put_nowait(request)
+
+    async def _worker(self, client, queue, spider, pipeline, cache, replay):
+        while True:
+            request = await queue.get()
+            try:
+                response = await self._fetch(client, request, spider, cache, replay)
+                if response is None:
+                    continue
+                self.stats.inc_value('pages')
+                # 파싱과 저장은 이벤트 루프에서 순서대로 처리 (파이프라인은 스레드 안전하지 않음)
+                for output in request.callback(response):
+                    if isinstance(output, scrapy.Request):
+                        self._enqueue(queue, output)
+                    else:
+                        pipeline.process_item(output, spider)
+                        self.stats.inc_value('items')
+            except Exception:
+                logger.exception(f'Error processing {request.url}')
+                self.stats.inc_value('errors')
+            finally:
+                queue.task_done()
+
+    async def _fetch(self, client, request, spider, cache, replay):
+        """요청 하나를 보내고 HtmlResponse 반환 (캐시 적중/재생 시 네트워크 미사용, 최종 실패 시 None)
+
+        미들웨어는 Scrapy 설정의 순서(캐시 543, 기록/재생 580)와 같이 적용한다.
+        """
+        import httpx
+
+        cached = cache.process_request(request, spider)
+        if cached is not None:
+            self.stats.inc_value('http_cache/served')
+            return cached
+        try:
+            replayed = replay.process_request(request, spider)
+        except IgnoreRequest as e:
+            logger.debug(str(e))
+            self.stats.inc_value('http_replay/missing')
+            return None
+        if replayed is not None:
+            return replayed
+
+        headers = request.headers.to_unicode_dict()
+        for attempt in range(self.retry_times + 1):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            try:
+                response = await client.get(request.url, headers=headers)
+            except httpx.TransportError as e:
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRY_HTTP_CODES:
+                    break
+                reason = str(response.status_code)
+            self.stats.inc_value(f'retry/reason_count/{reason}')
+            if attempt < self.retry_times:
+                # 429/5xx/연결 오류는 지수적으로 간격을 늘려 재시도
+                await asyncio.sleep(max(self.delay, 0.5) * 2 ** attempt)
+        else:
+            logger.warning(f'Gave up {request.url} after {self.retry_times + 1} attempts ({reason})')
+            self.stats.inc_value('retry/max_reached')
+            return None
+
+        result = HtmlResponse(
+            url=str(response.url),
+            status=response.status_code,
+            headers=[(k, v) for k, v in response.headers.multi_items() if k.lower() not in SKIP_HEADERS],
+            body=response.content,
+            request=request,
+        )
+        result = replay.process_response(request, result, spider)
+        result = cache.process_response(request, result, spider)
+        if result.status != 200:
+            # Scrapy HttpErrorMiddleware 와 같이 오류 응답은 파싱하지 않음
+            logger.warning(f'Ignoring response {result.status} for {request.url}')
+            self.stats.inc_value(f'response_status_count/{result.status}')
+            return None
+        return result
+
+
+def run_async_crawl(settings, **kwargs):
+    """asyncio 이벤트 루프를 만들어 수집을 실행 (스크립트용)"""
+    return asyncio.run(AsyncCalendarCrawler(settings, **kwargs).crawl())
@@ -0,0 +1,113 @@
+# 증분 크롤링을 위한 수집 이력 인덱스
+#
+# (event_type, day, offset) 페이지별 수집 시각과 행 수, 테이블 내용 해시, 날짜별 수집 완료 시각을
+# SQLite 에 기록하고, 다시 실행할 때 새로 생겼거나 오래된 날짜만 요청하도록 판단한다.
+# 오래되어 다시 받은 페이지는 내용 해시로 바뀌었는지 구분해 바뀐 페이지만 다시 내보낸다.
+# 이벤트가 없는 날짜도 행 수 0 으로 완료 처리되어 다시 요청하지 않는다.
+# 여러 프로세스가 한 파일에 동시에 쓰지 않도록 샤드는 각자의 파일에 기록하고 끝난 뒤 merge 로 합친다.
+
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class CrawlStateIndex:
+    """페이지 수집 이력 인덱스"""
+
+    def __init__(self, path, settle_days=3, ttl_hours=12):
+        self.path = path
+        self.settle_days = settle_days
+        self.ttl_hours = ttl_hours
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS pages (
+                event_type TEXT NOT NULL,
+                day TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (event_type, day, offset)
+            );
+            CREATE TABLE IF NOT EXISTS days (
+                event_type TEXT NOT NULL,
+                day TEXT NOT NULL,
+                pages INTEGER NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (event_type, day)
+            );
+        ''')
+
+    def needs_fetch(self, event_type, day, now=None):
+        """해당 날짜를 다시 수집해야 하는지 판단
+
+        - 끝까지 수집된 적이 없는 날짜: 수집
+        - 이벤트 날짜로부터 settle_days 가 지난 뒤 수집 완료된 날짜: 더 이상 바뀌지 않으므로 건너뜀
+        - 그 외(오늘/미래/최근 날짜): 마지막 수집 후 ttl_hours 가 지났으면 재수집
+        """
+        now = now or datetime.now()
+        row = self.conn.execute(
+            'SELECT completed_at FROM days WHERE event_type = ? AND day = ?',
+            (event_type, day)
+        ).fetchone()
+        if not row:
+            return True
+
+        completed_at = datetime.strptime(row[0], TIME_FORMAT)
+        settled_at = datetime.strptime(day, '%Y-%m-%d') + timedelta(days=self.settle_days)
+        if completed_at >= settled_at:
+            return False
+        return now - completed_at >= timedelta(hours=self.ttl_hours)
+
+    def record_page(self, event_type, day, offset, rows):
+        """페이지 수집 결과(행 튜플 목록) 기록, 처음 받았거나 내용이 이전과 달라졌으면 True 반환"""
+        content_hash = hashlib.sha1(repr(list(rows)).encode('utf-8')).hexdigest()
+        row = self.conn.execute(
+            'SELECT content_hash FROM pages WHERE event_type = ? AND day = ? AND offset = ?',
+            (event_type, day, offset)
+        ).fetchone()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO pages (event_type, day, offset, content_hash, row_count, fetched_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (event_type, day, offset, content_hash, len(rows), datetime.now().strftime(TIME_FORMAT))
+        )
+        self.conn.commit()
+        return row is None or row[0] != content_hash
+
+    def complete_day(self, event_type, day, pages):
+        """날짜의 마지막 페이지까지 수집 완료 기록"""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?)',
+            (event_type, day, pages, datetime.now().strftime(TIME_FORMAT))
+        )
+        self.conn.commit()
+
+    def merge(self, path):
+        """다른 이력 파일(샤드별 이력)의 기록을 합침, 합친 완료 날짜 수 반환
+
+        같은 페이지/날짜는 더 최근에 수집한 기록을 남긴다.
+        """
+        self.conn.execute('ATTACH DATABASE ? AS other', (path,))
+        try:
+            with self.conn:
+                self.conn.execute('''
+                    INSERT OR REPLACE INTO pages (event_type, day, offset, content_hash, row_count, fetched_at)
+                    SELECT o.event_type, o.day, o.offset, o.content_hash, o.row_count, o.fetched_at
+                    FROM other.pages o LEFT JOIN pages p
+                        ON p.event_type = o.event_type AND p.day = o.day AND p.offset = o.offset
+                    WHERE p.fetched_at IS NULL OR o.fetched_at >= p.fetched_at
+                ''')
+                merged = self.conn.execute('''
+                    INSERT OR REPLACE INTO days (event_type, day, pages, completed_at)
+                    SELECT o.event_type, o.day, o.pages, o.completed_at
+                    FROM other.days o LEFT JOIN days d ON d.event_type = o.event_type AND d.day = o.day
+                    WHERE d.completed_at IS NULL OR o.completed_at > d.completed_at
+                ''').rowcount
+        finally:
+            self.conn.execute('DETACH DATABASE other')
+        return merged
+
+    def close(self):
+        self.conn.close()
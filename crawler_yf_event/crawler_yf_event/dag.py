@@ -0,0 +1,263 @@
+# 단계(stage) 의존 그래프 실행기
+#
+# 각 단계는 입력/출력 경로(glob 패턴, 디렉토리 가능)와 파라미터를 선언한다. 단계 사이의 의존
+# 관계는 한 단계의 입력이 다른 단계의 출력과 겹치는지로 정해진다. 실행할 때는
+#   - 입력 파일 내용의 해시와 파라미터로 단계 키를 만들고, 지난 실행과 키가 같고 출력이 모두
+#     있으면 건너뛴다 (파일 해시는 크기/수정 시각이 같으면 다시 읽지 않음).
+#   - 선행 단계가 끝날 때마다 새로 준비된 단계를 프로세스 풀에 넣어, 서로 의존하지 않는
+#     단계는 동시에 실행한다. 실패한 단계의 후속 단계는 실행하지 않는다.
+#   - 단계별 시작 시점/소요 시간/결과를 실행마다 JSON Lines 파일에 한 줄씩 남긴다.
+#
+# 단계 함수는 spawn 방식의 자식 프로세스에서 실행되므로 모듈 최상위 함수여야 한다.
+
+import fnmatch
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class Stage:
+    """파이프라인 단계 하나
+
+    Args:
+        name (str): 단계 이름
+        func (callable): 실행할 함수 (params 를 키워드 인자로 받음)
+        inputs (list): 입력 경로/glob 패턴 (내용이 바뀌면 다시 실행)
+        outputs (list): 출력 경로/glob 패턴 (하나라도 없으면 다시 실행)
+        params (dict): 함수 인자 (값이 바뀌면 다시 실행)
+        always (bool): 입력과 관계없이 항상 실행 (외부 데이터를 읽는 단계)
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, always=False):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+        self.always = always
+
+    def __repr__(self):
+        return f'Stage({self.name!r})'
+
+
+def _expand(pattern):
+    """glob 패턴을 실제 파일 목록으로 (디렉토리는 하위 파일 전체)"""
+    paths = []
+    for path in sorted(glob.glob(pattern)):
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files))
+        else:
+            paths.append(path)
+    return paths
+
+
+def _covers(output, path):
+    """출력 패턴이 입력 경로(패턴)와 같거나, 그 상위 디렉토리이거나, glob 으로 서로 일치하는지"""
+    output = os.path.normpath(output)
+    path = os.path.normpath(path)
+    if path == output or path.startswith(output + os.sep):
+        return True
+    return fnmatch.fnmatchcase(path, output) or fnmatch.fnmatchcase(output, path)
+
+
+def _call_stage(func, params):
+    # 자식 프로세스에서 실행 (소요 시간은 프로세스 시작 비용을 뺀 단계 함수 자체 시간)
+    started = time.perf_counter()
+    func(**params)
+    return time.perf_counter() - started
+
+
+class DagRunner:
+    """단계들을 의존 순서대로, 독립된 단계는 동시에 실행"""
+
+    def __init__(self, stages, state_file='pipeline_state.json', timings_file='pipeline_timings.jsonl', jobs=2):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        self.timings_file = timings_file
+        self.jobs = jobs
+        self.deps = self._infer_deps()
+        self.state = self._load_state()
+
+    def _infer_deps(self):
+        deps = {}
+        for name, stage in self.stages.items():
+            deps[name] = {
+                other.name for other in self.stages.values()
+                if other is not stage and any(_covers(out, inp) for out in other.outputs for inp in stage.inputs)
+            }
+
+        # 순환 의존 확인
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f'Cyclic stage dependency at {name!r}')
+            visiting.add(name)
+            for dep in deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in deps:
+            visit(name)
+        return deps
+
+    def _load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, encoding='utf-8') as f:
+                state = json.load(f)
+        else:
+            state = {}
+        state.setdefault('stages', {})
+        state.setdefault('files', {})
+        return state
+
+    def _save_state(self):
+        # 없어진 파일의 해시는 정리
+        self.state['files'] = {path: v for path, v in self.state['files'].items() if os.path.exists(path)}
+        tmp_path = f'{self.state_file}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.state_file)
+
+    def file_digest(self, path):
+        """파일 내용 SHA-256 (크기와 수정 시각이 지난번과 같으면 저장된 값 사용)"""
+        stat = os.stat(path)
+        cached = self.state['files'].get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        self.state['files'][path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def stage_key(self, stage):
+        """입력 파일 내용과 파라미터로 만든 단계 키"""
+        key = hashlib.sha256(json.dumps(stage.params, sort_keys=True, default=str).encode())
+        for pattern in stage.inputs:
+            paths = _expand(pattern)
+            key.update(f'{pattern}\0{len(paths)}\0'.encode())
+            for path in paths:
+                key.update(f'{path}\0{self.file_digest(path)}\0'.encode())
+        return key.hexdigest()
+
+    def is_current(self, stage, key):
+        if stage.always or self.state['stages'].get(stage.name, {}).get('key') != key:
+            return False
+        return all(_expand(pattern) for pattern in stage.outputs)
+
+    def plan(self):
+        """실행 없이 단계별 예상 동작 반환 (선행 단계가 실행되면 판단 보류)"""
+        actions = {}
+        for name in self._order():
+            stage = self.stages[name]
+            if any(actions[dep] != 'skip' for dep in self.deps[name]):
+                actions[name] = 'after upstream'
+            else:
+                actions[name] = 'skip' if self.is_current(stage, self.stage_key(stage)) else 'run'
+        return actions
+
+    def _order(self):
+        order, done = [], set()
+        while len(order) < len(self.stages):
+            for name in self.stages:
+                if name not in done and self.deps[name] <= done:
+                    order.append(name)
+                    done.add(name)
+        return order
+
+    def run(self, force=False):
+        """모든 단계를 실행하고 {단계 이름: 결과 dict} 반환"""
+        run_started = time.perf_counter()
+        started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        pending = set(self.stages)
+        done, failed = set(), set()
+        results = {}
+        running = {}
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.jobs, mp_context=context) as executor:
+            while pending or running:
+                # 선행 단계가 모두 끝난 단계를 건너뛰거나 실행 (건너뛰면 다른 단계가 준비될 수 있으므로 반복)
+                changed = True
+                while changed:
+                    changed = False
+                    for name in sorted(pending):
+                        stage = self.stages[name]
+                        offset = round(time.perf_counter() - run_started, 3)
+                        if self.deps[name] & failed:
+                            results[name] = {'status': 'blocked', 'start': offset, 'seconds': 0.0}
+                            print(f"[{name}] 선행 단계 실패로 실행하지 않음")
+                            failed.add(name)
+                        elif self.deps[name] <= done:
+                            key = self.stage_key(stage)
+                            if not force and self.is_current(stage, key):
+                                results[name] = {'status': 'skipped', 'start': offset, 'seconds': 0.0}
+                                print(f"[{name}] 입력 변경 없음, 건너뜀")
+                                done.add(name)
+                            else:
+                                print(f"[{name}] 시작")
+                                future = executor.submit(_call_stage, stage.func, stage.params)
+                                running[future] = (name, key, time.perf_counter())
+                        else:
+                            continue
+                        pending.discard(name)
+                        changed = True
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, key, stage_started = running.pop(future)
+                    result = {
+                        'start': round(stage_started - run_started, 3),
+                        'wall_seconds': round(time.perf_counter() - stage_started, 3),
+                    }
+                    try:
+                        result['seconds'] = round(future.result(), 3)
+                    except Exception as e:
+                        result.update(status='failed', seconds=result['wall_seconds'], error=f'{type(e).__name__}: {e}')
+                        print(f"[{name}] 실패: {e}")
+                        failed.add(name)
+                    else:
+                        result['status'] = 'ran'
+                        print(f"[{name}] 완료 ({result['seconds']:.2f}초)")
+                        self.state['stages'][name] = {'key': key, 'finished_at': datetime.now().isoformat()}
+                        done.add(name)
+                    results[name] = result
+                    # 중간에 중단되어도 끝난 단계는 다음 실행에서 건너뛸 수 있도록 바로 저장
+                    self._save_state()
+
+        elapsed = time.perf_counter() - run_started
+        self._save_state()
+        self._record(started_at, elapsed, results)
+        return results
+
+    def _record(self, started_at, elapsed, results):
+        if not self.timings_file:
+            return
+        directory = os.path.dirname(self.timings_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        record = {
+            'started_at': started_at,
+            'elapsed_seconds': round(elapsed, 3),
+            'jobs': self.jobs,
+            'stages': {name: results[name] for name in self._order() if name in results},
+        }
+        with open(self.timings_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -0,0 +1,198 @@
+# 중복 제거 / 업서트
+#
+# 이벤트 타입별 자연 키(schema.EventSchema.key + date)로 같은 이벤트를 식별한다.
+# 저장소 옆의 SQLite 키 인덱스에 키별 행 해시를 보관하고, 최근 키는 크기 제한이 있는
+# 메모리 캐시에 둔다. 값이 같은 행은 건너뛰고, 값이 바뀐 행은 새로 기록한 뒤
+# 해당 파티션만 다시 정리(compaction)해 이전 행을 제거한다.
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+from .event_store import (
+    JsonLinesPartitionWriter, ParquetPartitionWriter, compact_jsonl_partition,
+    compact_parquet_partition, parquet_partition_dir, partition_path,
+)
+from .schema import EVENT_SCHEMAS, coerce_value
+
+KEY_INDEX_FILE = '_keys.sqlite3'
+
+# 자연 키/행 해시에서 제외하는 메타 컬럼
+META_COLUMNS = ('event_type', 'date', 'crawl_date')
+
+
+def _digest(value):
+    data = json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def natural_key(record):
+    """이벤트 타입, 날짜와 스키마 키 컬럼 값으로 만든 16바이트 키"""
+    schema = EVENT_SCHEMAS.get(record.get('event_type'))
+    if schema is None:
+        values = [record.get(f) for f in sorted(k for k in record if k not in META_COLUMNS)]
+    else:
+        # 이전 형식(문자열)으로 저장된 레코드도 같은 키가 되도록 스키마 타입으로 맞춤
+        kinds = dict(zip(schema.names, schema.kinds))
+        values = [coerce_value(kinds[f], record.get(f)) for f in schema.key]
+    return _digest([record.get('event_type'), record.get('date')] + values)
+
+
+def row_hash(record):
+    """수집 시각을 제외한 행 전체 값의 해시"""
+    return _digest(sorted((k, v) for k, v in record.items() if k != 'crawl_date'))
+
+
+class KeyIndex:
+    """자연 키 -> 행 해시 인덱스 (SQLite + 크기 제한 LRU 캐시)"""
+
+    def __init__(self, path, cache_size=100000, batch_size=1000):
+        """batch_size=None 이면 flush() 를 호출할 때만 기록"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.created = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS keys (key BLOB PRIMARY KEY, row_hash BLOB NOT NULL)')
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.pending = {}
+        self.batch_size = batch_size
+
+    def get(self, key):
+        if key in self.pending:
+            return self.pending[key]
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        row = self.conn.execute('SELECT row_hash FROM keys WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row[0])
+        return row[0]
+
+    def put(self, key, digest):
+        self.pending[key] = digest
+        self._remember(key, digest)
+        if self.batch_size and len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def _remember(self, key, digest):
+        self.cache[key] = digest
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def flush(self):
+        if self.pending:
+            self.conn.executemany('INSERT OR REPLACE INTO keys (key, row_hash) VALUES (?, ?)', self.pending.items())
+            self.conn.commit()
+            self.pending = {}
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class UpsertStore:
+    """저장 방식별 writer 앞에서 자연 키 기준으로 중복 제거/업서트
+
+    json: 기존 파일과 키 기준으로 병합해 다시 기록 (바뀐 내용이 없으면 그대로 둠)
+    jsonl/parquet: 키 인덱스로 새 행/바뀐 행만 기록하고, 바뀐 행이 있는 파티션만 정리
+    """
+
+    def __init__(self, output_mode='json', output_file='yf_calendar_events.json', output_dir='events',
+                 parquet_dir='event_store', flush_batch_size=500, parquet_batch_size=5000,
+                 cache_size=100000):
+        self.output_mode = output_mode
+        self.inserted = 0
+        self.updated = 0
+        self.duplicates = 0
+        self.dirty = set()
+
+        if output_mode == 'json':
+            # 기존 파일을 키 기준으로 읽어 두고 같은 키는 새 값으로 교체
+            self.root = output_file
+            self.records = OrderedDict()
+            if os.path.exists(output_file):
+                with open(output_file, 'r', encoding='utf-8') as f:
+                    for record in json.load(f):
+                        self.records[natural_key(record)] = record
+            self.writer = None
+            self.index = None
+        else:
+            if output_mode == 'parquet':
+                self.root = parquet_dir
+                self.writer = ParquetPartitionWriter(parquet_dir, parquet_batch_size)
+            else:
+                self.root = output_dir
+                self.writer = JsonLinesPartitionWriter(output_dir, flush_batch_size)
+            # 키는 해당 행이 파일에 기록된 뒤에만 인덱스에 반영 (중단 시 누락 방지)
+            self.index = KeyIndex(os.path.join(self.root, KEY_INDEX_FILE), cache_size, batch_size=None)
+            # 인덱스가 없던 기존 저장소: 이번에 기록하는 파티션은 모두 정리 대상
+            self.bootstrap = self.index.created
+
+    @property
+    def written(self):
+        return self.inserted + self.updated
+
+    def write(self, record):
+        """레코드 기록, 'insert' / 'update' / 'duplicate' 중 하나 반환"""
+        key = natural_key(record)
+        digest = row_hash(record)
+
+        if self.index is None:
+            previous = self.records.get(key)
+            if previous is not None and row_hash(previous) == digest:
+                self.duplicates += 1
+                return 'duplicate'
+            self.records[key] = record
+            return self._count(previous is not None)
+
+        stored = self.index.get(key)
+        if stored == digest:
+            self.duplicates += 1
+            return 'duplicate'
+        if stored is not None or self.bootstrap:
+            self.dirty.add((record.get('event_type'), record.get('date')))
+        self.writer.write(record)
+        self.index.put(key, digest)
+        if self.writer.buffered == 0:
+            self.index.flush()
+        return self._count(stored is not None)
+
+    def _count(self, updated):
+        if updated:
+            self.updated += 1
+            return 'update'
+        self.inserted += 1
+        return 'insert'
+
+    def close(self):
+        if self.index is None:
+            self._merge_json()
+            return
+
+        self.writer.close()
+        self.index.close()
+        partitions = set()
+        for event_type, date in self.dirty:
+            if self.output_mode == 'parquet':
+                partitions.add((parquet_partition_dir(self.root, event_type, date), event_type))
+            else:
+                partitions.add((partition_path(self.root, event_type, date), event_type))
+        for path, event_type in sorted(partitions):
+            if self.output_mode == 'parquet':
+                compact_parquet_partition(path, event_type, natural_key)
+            elif os.path.exists(path):
+                compact_jsonl_partition(path, natural_key)
+
+    def _merge_json(self):
+        if not self.written:
+            return
+        tmp_path = f'{self.root}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self.records.values()), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.root)
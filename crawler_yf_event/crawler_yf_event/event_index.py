@@ -0,0 +1,84 @@
+# 이벤트 인덱스
+#
+# (ticker, date) 이벤트를 모두 보관하는 정렬 배열 기반 인덱스.
+# 종목별로 날짜순 정렬된 블록과 날짜순 정렬 순서를 함께 두어
+# "종목 X 의 기간 W 안 이벤트" 와 "날짜 D 에 이벤트가 있는 종목" 을 이진 탐색으로 조회한다.
+
+import numpy as np
+import pandas as pd
+
+
+class EventIndex:
+    """정렬 배열 기반 (ticker, date) 이벤트 인덱스"""
+
+    def __init__(self, events, ticker_column='Symbol', date_column='date'):
+        events = events.dropna(subset=[ticker_column, date_column]).copy()
+        events[date_column] = pd.to_datetime(events[date_column]).dt.normalize()
+        self.ticker_column = ticker_column
+        self.date_column = date_column
+
+        tickers = events[ticker_column].astype(str).to_numpy()
+        dates = events[date_column].to_numpy(dtype='datetime64[ns]')
+
+        # 종목, 날짜 순으로 정렬 (같은 이벤트는 원래 순서 유지)
+        order = np.lexsort((dates, tickers))
+        self.frame = events.iloc[order].reset_index(drop=True)
+        self.tickers = tickers[order]
+        self.dates = dates[order]
+
+        # 종목별 블록 경계: self.tickers[starts[i]:ends[i]] == unique[i]
+        self.unique_tickers, self.starts, counts = np.unique(self.tickers, return_index=True, return_counts=True)
+        self.ends = self.starts + counts
+
+        # 날짜 조회용 정렬 순서
+        self.date_order = np.argsort(self.dates, kind='stable')
+        self.sorted_dates = self.dates[self.date_order]
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, ticker):
+        return self._block(ticker) is not None
+
+    def _block(self, ticker):
+        i = np.searchsorted(self.unique_tickers, ticker)
+        if i < len(self.unique_tickers) and self.unique_tickers[i] == ticker:
+            return self.starts[i], self.ends[i]
+        return None
+
+    def _positions(self, ticker, start=None, end=None):
+        block = self._block(ticker)
+        if block is None:
+            return np.arange(0)
+        lo, hi = block
+        dates = self.dates[lo:hi]
+        if start is not None:
+            lo_offset = np.searchsorted(dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        else:
+            lo_offset = 0
+        if end is not None:
+            hi_offset = np.searchsorted(dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        else:
+            hi_offset = hi - lo
+        return np.arange(lo + lo_offset, lo + hi_offset)
+
+    def events_for(self, ticker, start=None, end=None):
+        """종목의 [start, end] 기간 이벤트 (날짜순)"""
+        return self.frame.iloc[self._positions(ticker, start, end)]
+
+    def dates_for(self, ticker, start=None, end=None):
+        """종목의 [start, end] 기간 이벤트 날짜 배열"""
+        return self.dates[self._positions(ticker, start, end)]
+
+    def events_for_tickers(self, tickers, start=None, end=None):
+        """여러 종목의 이벤트 (종목 목록 순서, 종목 안에서는 날짜순)"""
+        positions = [self._positions(ticker, start, end) for ticker in tickers]
+        positions = np.concatenate(positions) if positions else np.arange(0)
+        return self.frame.iloc[positions]
+
+    def tickers_on(self, day):
+        """해당 날짜에 이벤트가 있는 종목 목록"""
+        day = np.datetime64(pd.Timestamp(day).normalize(), 'ns')
+        lo = np.searchsorted(self.sorted_dates, day, side='left')
+        hi = np.searchsorted(self.sorted_dates, day, side='right')
+        return np.unique(self.tickers[self.date_order[lo:hi]]).tolist()
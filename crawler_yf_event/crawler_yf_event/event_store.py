@@ -0,0 +1,424 @@
+# 이벤트 데이터 저장소 입출력 헬퍼
+#
+# 크롤러 파이프라인(쓰기)과 분석 스크립트(읽기)가 함께 사용하므로
+# scrapy 에 의존하지 않도록 유지한다.
+
+import glob
+import json
+import os
+import uuid
+from datetime import datetime
+
+from .schema import EVENT_SCHEMAS, coerce_frame, coerce_value
+
+DEFAULT_EVENT_FILE = 'yf_calendar_events.json'
+DEFAULT_EVENT_DIR = 'events'
+DEFAULT_PARQUET_DIR = 'event_store'
+
+# Parquet 저장소의 Hive 파티션 컬럼 (event_type=.../year=.../month=...)
+PARQUET_PARTITION_COLS = ['event_type', 'year', 'month']
+
+
+def partition_path(root, event_type, date):
+    """이벤트 타입/날짜별 JSON Lines 파티션 경로"""
+    return os.path.join(root, event_type, f'{date}.jsonl')
+
+
+class JsonLinesPartitionWriter:
+    """이벤트를 타입/날짜별 JSON Lines 파일에 배치 단위로 추가 기록"""
+
+    def __init__(self, root, batch_size=500):
+        self.root = root
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.buffered = 0
+        self.written = 0
+
+    def write(self, record):
+        path = partition_path(self.root, record.get('event_type') or 'unknown', record.get('date') or 'unknown')
+        self.buffers.setdefault(path, []).append(json.dumps(record, ensure_ascii=False))
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for path, lines in self.buffers.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        self.written += self.buffered
+        self.buffers = {}
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+
+
+class ParquetPartitionWriter:
+    """이벤트를 event_type/year/month Hive 파티션 Parquet 데이터셋으로 배치 기록"""
+
+    def __init__(self, root, batch_size=5000):
+        self.root = root
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.buffered = 0
+        self.written = 0
+
+    def write(self, record):
+        self.buffers.setdefault(record.get('event_type') or 'unknown', []).append(record)
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        import pyarrow.parquet as pq
+
+        for event_type, records in self.buffers.items():
+            table = records_to_table(records, EVENT_SCHEMAS.get(event_type))
+            # 배치마다 고유한 파일명으로 기록하여 기존 파티션에 추가
+            pq.write_to_dataset(
+                table,
+                self.root,
+                partition_cols=PARQUET_PARTITION_COLS,
+                basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            )
+        self.written += self.buffered
+        self.buffers = {}
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+
+
+def records_to_table(records, schema=None):
+    """이벤트 목록을 타입이 지정된 Arrow 테이블로 변환
+
+    schema(EventSchema)에 선언된 컬럼은 선언된 타입으로, 나머지 컬럼은 문자열로 저장한다.
+    """
+    import pyarrow as pa
+
+    columns = {'event_type': [], 'date': [], 'year': [], 'month': [], 'crawl_date': []}
+    fields = [
+        pa.field('event_type', pa.string()),
+        pa.field('date', pa.date32()),
+        pa.field('year', pa.int16()),
+        pa.field('month', pa.int8()),
+        pa.field('crawl_date', pa.timestamp('s')),
+    ]
+    typed_fields = schema.arrow_fields() if schema else []
+    typed_names = {field.name for field in typed_fields}
+
+    extra_fields = []
+    for record in records:
+        for key in record:
+            if key not in columns and key not in typed_names and key not in extra_fields:
+                extra_fields.append(key)
+
+    for record in records:
+        day = datetime.strptime(record['date'], '%Y-%m-%d').date()
+        crawl_date = record.get('crawl_date')
+        columns['event_type'].append(record.get('event_type'))
+        columns['date'].append(day)
+        columns['year'].append(day.year)
+        columns['month'].append(day.month)
+        columns['crawl_date'].append(
+            datetime.strptime(crawl_date, '%Y-%m-%d %H:%M:%S') if crawl_date else None
+        )
+
+    for field in typed_fields:
+        values = [record.get(field.name) for record in records]
+        if field.type == pa.date32():
+            values = [datetime.strptime(value, '%Y-%m-%d').date() if value else None for value in values]
+        columns[field.name] = values
+        fields.append(field)
+
+    for key in extra_fields:
+        values = [record.get(key) for record in records]
+        columns[key] = [None if value is None else str(value) for value in values]
+        fields.append(pa.field(key, pa.string()))
+
+    schema = pa.schema(fields)
+    return pa.Table.from_pydict({field.name: columns[field.name] for field in fields}, schema=schema)
+
+
+def is_parquet_store(source):
+    """Hive 파티션(event_type=...) 구조의 Parquet 저장소인지 확인"""
+    return os.path.isdir(source) and bool(glob.glob(os.path.join(source, 'event_type=*')))
+
+
+def _month_filter(field_year, field_month, start_date, end_date):
+    """year/month 파티션 프루닝용 필터 식"""
+    expr = None
+    if start_date:
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        expr = (field_year > start.year) | ((field_year == start.year) & (field_month >= start.month))
+    if end_date:
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        end_expr = (field_year < end.year) | ((field_year == end.year) & (field_month <= end.month))
+        expr = end_expr if expr is None else expr & end_expr
+    return expr
+
+
+def read_parquet_events(root, event_type, columns=None, start_date=None, end_date=None):
+    """Parquet 저장소에서 한 이벤트 타입의 필요한 컬럼/기간만 읽기"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    base_dir = os.path.join(root, f'event_type={event_type}')
+    files = sorted(glob.glob(os.path.join(base_dir, '**', '*.parquet'), recursive=True))
+    if not files:
+        return None
+
+    try:
+        df = _read_parquet_files(files, base_dir, columns, start_date, end_date)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # 문자열로 저장하던 이전 배치와 타입이 지정된 배치가 섞인 경우:
+        # 스키마가 같은 파일끼리 읽은 뒤 합치고 load_event_frames 에서 타입을 맞춤
+        groups = {}
+        for f in files:
+            groups.setdefault(pq.read_schema(f).remove_metadata().to_string(), []).append(f)
+        frames = [_read_parquet_files(group, base_dir, columns, start_date, end_date) for group in groups.values()]
+        frames = [frame for frame in frames if not frame.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else _empty_frame(columns)
+
+    df['event_type'] = event_type
+    if 'date' in df.columns:
+        df = df.sort_values('date', kind='stable')
+    return df
+
+
+def _empty_frame(columns):
+    import pandas as pd
+
+    return pd.DataFrame(columns=[c for c in (columns or ['date']) if c != 'event_type'])
+
+
+def _read_parquet_files(files, base_dir, columns, start_date, end_date):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    # 배치마다 컬럼 구성이 다를 수 있으므로 파일 스키마를 통합
+    partition_schema = pa.schema([('year', pa.int16()), ('month', pa.int8())])
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files] + [partition_schema])
+    dataset = ds.dataset(
+        files,
+        schema=schema,
+        format='parquet',
+        partitioning=ds.partitioning(partition_schema, flavor='hive'),
+        partition_base_dir=base_dir,
+    )
+
+    year, month, date = ds.field('year'), ds.field('month'), ds.field('date')
+    expr = _month_filter(year, month, start_date, end_date)
+    if start_date:
+        expr = expr & (date >= pa.scalar(datetime.strptime(start_date, '%Y-%m-%d').date()))
+    if end_date:
+        expr = expr & (date <= pa.scalar(datetime.strptime(end_date, '%Y-%m-%d').date()))
+
+    names = None
+    if columns is not None:
+        names = [c for c in columns if c in schema.names and c != 'event_type']
+    else:
+        names = [c for c in schema.names if c not in ('year', 'month')]
+    table = dataset.to_table(columns=names, filter=expr)
+    return table.to_pandas(date_as_object=False)
+
+
+def load_event_frames(source, columns_by_type, start_date=None, end_date=None):
+    """이벤트 타입별 DataFrame 로드
+
+    Parquet 저장소는 필요한 컬럼과 기간만 읽고, JSON/JSON Lines 는 한 번 읽은 뒤 나눈다.
+    columns_by_type 의 값이 None 이면 모든 컬럼을 읽는다.
+    """
+    import pandas as pd
+
+    event_types = list(columns_by_type)
+    frames = {}
+    if is_parquet_store(source):
+        for event_type in event_types:
+            frames[event_type] = read_parquet_events(
+                source, event_type, columns_by_type[event_type], start_date, end_date
+            )
+    else:
+        df = pd.DataFrame(load_event_records(source, event_types))
+        if not df.empty:
+            df['date'] = pd.to_datetime(df['date'])
+            if start_date:
+                df = df[df['date'] >= pd.Timestamp(start_date)]
+            if end_date:
+                df = df[df['date'] <= pd.Timestamp(end_date)]
+            for event_type, group in df.groupby('event_type'):
+                columns = columns_by_type[event_type]
+                if columns is not None:
+                    group = group[[c for c in columns if c in group.columns]]
+                else:
+                    # 다른 이벤트 타입에만 있는 컬럼 제거
+                    group = group.dropna(axis=1, how='all')
+                frames[event_type] = group.copy()
+
+    for event_type in event_types:
+        columns = columns_by_type[event_type]
+        df = frames.get(event_type)
+        if df is None:
+            df = pd.DataFrame(columns=columns or ['event_type', 'date'])
+        if columns is not None:
+            # 요청한 컬럼이 항상 존재하도록 보정
+            df = df.reindex(columns=list(dict.fromkeys(['event_type'] + columns)))
+        df['event_type'] = event_type
+        df['date'] = pd.to_datetime(df['date'])
+        # 이전 형식(문자열)으로 저장된 값은 스키마 타입으로 변환
+        frames[event_type] = coerce_frame(df.reset_index(drop=True), event_type)
+    return frames
+
+
+def iter_partition_files(root, event_types=None):
+    """파티션 파일 경로를 이벤트 타입, 날짜 순으로 반환"""
+    patterns = [os.path.join(root, event_type, '*.jsonl') for event_type in (event_types or ['*'])]
+    for pattern in patterns:
+        yield from sorted(glob.glob(pattern))
+
+
+def iter_jsonl_records(root, event_types=None):
+    """파티션 디렉토리의 모든 이벤트를 한 건씩 읽기"""
+    for path in iter_partition_files(root, event_types):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # 비정상 종료로 마지막 줄이 잘린 경우 건너뜀
+                    continue
+
+
+def load_event_records(source, event_types=None):
+    """JSON 파일 또는 JSON Lines 파티션 디렉토리에서 이벤트 목록 로드"""
+    if os.path.isdir(source):
+        return list(iter_jsonl_records(source, event_types))
+
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if event_types:
+        data = [record for record in data if record.get('event_type') in event_types]
+    return data
+
+
+def default_event_source():
+    """Parquet 저장소, JSON Lines 파티션, 단일 JSON 파일 순으로 사용"""
+    if is_parquet_store(DEFAULT_PARQUET_DIR):
+        return DEFAULT_PARQUET_DIR
+    if os.path.isdir(DEFAULT_EVENT_DIR):
+        return DEFAULT_EVENT_DIR
+    return DEFAULT_EVENT_FILE
+
+
+# 분석 단계 사이의 중간 산출물 (analyze_events -> event_stock_analysis)
+DEFAULT_ANALYSIS_DIR = 'event_analysis'
+
+
+def analysis_table_path(name, directory=DEFAULT_ANALYSIS_DIR):
+    return os.path.join(directory, f'{name}.feather')
+
+
+def write_analysis_tables(tables, directory=DEFAULT_ANALYSIS_DIR):
+    """{이름: DataFrame} 을 이름별 Feather 파일로 저장"""
+    import pandas as pd
+
+    os.makedirs(directory, exist_ok=True)
+    for name, df in tables.items():
+        df = df.copy()
+        if not isinstance(df.index, pd.RangeIndex):
+            df = df.reset_index()
+        # 문자열과 숫자가 섞인 object 컬럼은 문자열로 통일 (Arrow 는 컬럼당 한 타입)
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        path = analysis_table_path(name, directory)
+        tmp_path = f'{path}.tmp'
+        df.to_feather(tmp_path)
+        os.replace(tmp_path, path)
+
+
+def read_analysis_table(name, directory=DEFAULT_ANALYSIS_DIR, columns=None):
+    """저장된 중간 산출물 로드 (없으면 None)"""
+    import pandas as pd
+
+    path = analysis_table_path(name, directory)
+    if not os.path.exists(path):
+        return None
+    return pd.read_feather(path, columns=columns)
+
+
+def parquet_partition_dir(root, event_type, date):
+    """이벤트 타입/날짜가 속한 Parquet 월 파티션 디렉토리"""
+    day = datetime.strptime(date, '%Y-%m-%d')
+    return os.path.join(root, f'event_type={event_type}', f'year={day.year}', f'month={day.month}')
+
+
+def _keep_latest(records, key_fn):
+    """키별로 crawl_date 가 가장 늦은 레코드만 남김 (같으면 나중 것)"""
+    latest = {}
+    for record in records:
+        key = key_fn(record)
+        previous = latest.get(key)
+        if previous is None or (record.get('crawl_date') or '') >= (previous.get('crawl_date') or ''):
+            latest[key] = record
+    return list(latest.values())
+
+
+def compact_jsonl_partition(path, key_fn):
+    """JSON Lines 파티션 파일에서 같은 키의 이전 레코드를 제거하고 다시 기록"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    records = _keep_latest(records, key_fn)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def compact_parquet_partition(partition_dir, event_type, key_fn):
+    """Parquet 월 파티션의 파일들을 키 기준으로 합쳐 한 파일로 다시 기록"""
+    import pyarrow.parquet as pq
+
+    files = sorted(glob.glob(os.path.join(partition_dir, '*.parquet')))
+    if not files:
+        return 0
+
+    schema = EVENT_SCHEMAS.get(event_type)
+    kinds = dict(zip(schema.names, schema.kinds)) if schema else {}
+    records = []
+    for path in files:
+        for record in pq.read_table(path).to_pylist():
+            # writer 가 받는 형태(문자열 날짜/시각, 스키마 타입 값)로 되돌림
+            # (파티션 컬럼은 파일에 저장되지 않으므로 event_type 을 다시 채움)
+            record['event_type'] = event_type
+            record['date'] = record['date'].strftime('%Y-%m-%d')
+            if record.get('crawl_date') is not None:
+                record['crawl_date'] = record['crawl_date'].strftime('%Y-%m-%d %H:%M:%S')
+            for name, kind in kinds.items():
+                value = record.get(name)
+                if hasattr(value, 'strftime'):
+                    record[name] = value.strftime('%Y-%m-%d')
+                elif isinstance(value, str):
+                    # 이전 형식(문자열)으로 저장된 배치
+                    record[name] = coerce_value(kind, value)
+            records.append(record)
+
+    records = _keep_latest(records, key_fn)
+    table = records_to_table(records, schema).drop(PARQUET_PARTITION_COLS)
+    path = os.path.join(partition_dir, f'part-{uuid.uuid4().hex}-0.parquet')
+    pq.write_table(table, path)
+    for old_path in files:
+        os.remove(old_path)
+    return len(records)
@@ -0,0 +1,139 @@
+# 이벤트 스터디 계산 엔진
+#
+# 모든 종목의 일봉을 하나의 (날짜 x 종목) 행렬로 맞춘 뒤, 이벤트마다 이벤트일 기준
+# 거래일 오프셋으로 윈도우를 잡아 수익률/변동성/낙폭/거래량 변화를 NumPy 로 한 번에 계산한다.
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# dates: 전체 거래일 (정렬됨), tickers: 종목 목록, close/volume: (날짜 x 종목) 행렬 (거래가 없는 날은 NaN)
+PriceMatrix = namedtuple('PriceMatrix', ['dates', 'tickers', 'close', 'volume'])
+
+
+def build_price_matrix(price_frames):
+    """{ticker: 일봉 DataFrame} 을 (날짜 x 종목) 종가/거래량 행렬로 정렬"""
+    tickers = [ticker for ticker, df in price_frames.items() if df is not None and not df.empty]
+    if not tickers:
+        return PriceMatrix(pd.DatetimeIndex([]), [], np.empty((0, 0)), np.empty((0, 0)))
+
+    close = pd.concat({ticker: price_frames[ticker]['Close'] for ticker in tickers}, axis=1).sort_index()
+    volume = pd.concat({ticker: price_frames[ticker]['Volume'] for ticker in tickers}, axis=1)
+    volume = volume.reindex(index=close.index, columns=close.columns)
+    return PriceMatrix(
+        close.index,
+        list(close.columns),
+        close.to_numpy(dtype=float),
+        volume.to_numpy(dtype=float),
+    )
+
+
+def _window_bounds(matrix, events, pre_months, post_months):
+    """이벤트별 (종목 열, 시작/이벤트/끝 행 인덱스, 유효 여부)"""
+    column = {ticker: j for j, ticker in enumerate(matrix.tickers)}
+    cols = np.array([column.get(ticker, -1) for ticker in events['Symbol']], dtype=int)
+    event_dates = pd.DatetimeIndex(events['date'])
+
+    dates = matrix.dates.values
+    event_idx = np.searchsorted(dates, event_dates.values, side='left')
+    start_idx = np.searchsorted(dates, (event_dates - pd.DateOffset(months=pre_months)).values, side='left')
+    end_idx = np.searchsorted(dates, (event_dates + pd.DateOffset(months=post_months)).values, side='right') - 1
+
+    # 이벤트일에 해당 종목의 가격이 있어야 분석 가능
+    valid = cols >= 0
+    in_range = event_idx < len(dates)
+    valid &= in_range
+    safe_idx = np.where(valid, event_idx, 0)
+    safe_cols = np.where(valid, cols, 0)
+    valid &= dates[safe_idx] == event_dates.values
+    valid &= ~np.isnan(matrix.close[safe_idx, safe_cols]) if len(dates) else valid
+    return safe_cols, start_idx, safe_idx, end_idx, valid
+
+
+def event_window_metrics(matrix, events, pre_months=3, post_months=1):
+    """모든 (종목, 이벤트일) 쌍의 윈도우 지표를 한 번에 계산
+
+    events: Symbol, date 컬럼을 가진 DataFrame
+    반환: events 와 같은 순서의 지표 DataFrame (가격이 없는 이벤트는 valid=False)
+    """
+    events = events.reset_index(drop=True)
+    n = len(events)
+    result = pd.DataFrame({'Symbol': events['Symbol'], 'date': pd.to_datetime(events['date'])})
+    metric_names = ['pre_event_return', 'post_event_return', 'total_return',
+                    'post_event_volatility', 'max_drawdown', 'volume_change']
+    for name in metric_names:
+        result[name] = np.nan
+    result['valid'] = False
+    if n == 0 or not matrix.tickers:
+        return result
+
+    cols, start_idx, event_idx, end_idx, valid = _window_bounds(matrix, events, pre_months, post_months)
+    if not valid.any():
+        return result
+
+    cols, start_idx, event_idx, end_idx = cols[valid], start_idx[valid], event_idx[valid], end_idx[valid]
+    close, volume = matrix.close, matrix.volume
+    event_price = close[event_idx, cols]
+
+    # 윈도우 끝의 값: 종목별로 앞 값을 채운 행렬에서 읽음 (다른 종목만 거래한 날 대비)
+    filled = pd.DataFrame(close).ffill().to_numpy()
+    pre_event_return = filled[event_idx, cols] / event_price - 1
+    post_event_return = filled[end_idx, cols] / event_price - 1
+
+    # 이벤트 이후 윈도우를 (이벤트 x 오프셋) 행렬로 펼쳐 계산
+    length = int((end_idx - event_idx).max()) + 1
+    offsets = np.arange(length)
+    rows = event_idx[:, None] + offsets[None, :]
+    mask = rows <= end_idx[:, None]
+    rows = np.minimum(rows, len(matrix.dates) - 1)
+    post = close[rows, cols[:, None]] / event_price[:, None] - 1
+    post[~mask] = np.nan
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        counts = (~np.isnan(post)).sum(axis=1)
+        mean = np.nansum(post, axis=1) / counts
+        variance = np.nansum((post - mean[:, None]) ** 2, axis=1) / (counts - 1)
+        volatility = np.where(counts > 1, np.sqrt(variance), np.nan) * np.sqrt(252)
+
+        running_max = np.fmax.accumulate(post, axis=1)
+        drawdown = (running_max - post) / running_max
+        drawdown[np.isnan(drawdown)] = -np.inf
+        max_drawdown = drawdown.max(axis=1)
+        max_drawdown[max_drawdown == -np.inf] = np.nan
+
+    # 거래량 평균: 누적합으로 구간 평균 계산
+    vol_values = np.nan_to_num(volume)
+    vol_counts = (~np.isnan(volume)).astype(float)
+    vol_sum = np.vstack([np.zeros((1, vol_values.shape[1])), np.cumsum(vol_values, axis=0)])
+    vol_cnt = np.vstack([np.zeros((1, vol_counts.shape[1])), np.cumsum(vol_counts, axis=0)])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pre_volume = (vol_sum[event_idx + 1, cols] - vol_sum[start_idx, cols]) / (vol_cnt[event_idx + 1, cols] - vol_cnt[start_idx, cols])
+        post_volume = (vol_sum[end_idx + 1, cols] - vol_sum[event_idx, cols]) / (vol_cnt[end_idx + 1, cols] - vol_cnt[event_idx, cols])
+        volume_change = post_volume / pre_volume - 1
+
+    values = {
+        'pre_event_return': pre_event_return,
+        'post_event_return': post_event_return,
+        'total_return': post_event_return,
+        'post_event_volatility': volatility,
+        'max_drawdown': max_drawdown,
+        'volume_change': volume_change,
+    }
+    for name, value in values.items():
+        result.loc[valid, name] = value
+    result.loc[valid, 'valid'] = True
+    return result
+
+
+def event_window_series(matrix, ticker, event_date, pre_months=3, post_months=1):
+    """차트용: 이벤트일 종가 대비 변화율 시계열 (이벤트 이전 pre_months ~ 이후 post_months)"""
+    events = pd.DataFrame({'Symbol': [ticker], 'date': [pd.Timestamp(event_date)]})
+    cols, start_idx, event_idx, end_idx, valid = _window_bounds(matrix, events, pre_months, post_months)
+    if not valid[0]:
+        return None
+
+    j = cols[0]
+    window = matrix.close[start_idx[0]:end_idx[0] + 1, j]
+    normalized = pd.Series(window / matrix.close[event_idx[0], j] - 1, index=matrix.dates[start_idx[0]:end_idx[0] + 1])
+    return normalized.dropna()
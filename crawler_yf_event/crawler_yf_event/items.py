@@ -3,15 +3,24 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
-import scrapy
+from dataclasses import dataclass
 
+from .schema import EVENT_SCHEMAS
 
-class YFCalendarEventItem(scrapy.Item):
-    event_type = scrapy.Field()  # earnings, economic, ipo, splits
-    crawl_date = scrapy.Field()
 
-    def __setitem__(self, key, value):
-        # 동적으로 필드 추가
-        if key not in self.fields:
-            self.fields[key] = scrapy.Field()
-        super().__setitem__(key, value)
+@dataclass(slots=True)
+class YFCalendarEventItem:
+    """캘린더 한 행
+
+    values 는 이벤트 타입 스키마(schema.EVENT_SCHEMAS) 순서의 타입 변환된 값 튜플이다.
+    컬럼 이름은 매 행마다 들고 다니지 않고 스키마에서 가져온다.
+    """
+    event_type: str  # earnings, economic, ipo, splits
+    date: str
+    crawl_date: str
+    values: tuple
+
+    def as_dict(self):
+        record = {'event_type': self.event_type, 'date': self.date, 'crawl_date': self.crawl_date}
+        record.update(EVENT_SCHEMAS[self.event_type].as_dict(self.values))
+        return record
@@ -0,0 +1,109 @@
+# 시가총액 조회 서비스
+#
+# 종목별 시가총액을 스레드 풀로 병렬 조회하고, 결과를 디스크의 TTL 캐시에 보관해
+# 같은 날 다시 실행할 때는 네트워크 요청 없이 재사용한다.
+
+import heapq
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TTLCache:
+    """JSON 파일에 저장되는 만료 시간 있는 캐시"""
+
+    def __init__(self, path, ttl_hours=24):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry['stored_at'] > self.ttl:
+            return None
+        return entry['value']
+
+    def set(self, key, value):
+        self.entries[key] = {'value': value, 'stored_at': time.time()}
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+
+
+def fetch_market_cap(ticker):
+    """yfinance 에서 시가총액 조회 (가벼운 fast_info 우선, 실패 시 info)"""
+    import yfinance as yf
+
+    stock = yf.Ticker(ticker)
+    try:
+        market_cap = stock.fast_info['marketCap']
+    except Exception:
+        market_cap = stock.info.get('marketCap', 0)
+    return int(market_cap or 0)
+
+
+class MarketCapService:
+    """시가총액 병렬 조회 + TTL 캐시"""
+
+    def __init__(self, cache_path='db/market_cap_cache.json', ttl_hours=24, max_workers=8, fetcher=None):
+        self.cache = TTLCache(cache_path, ttl_hours)
+        self.max_workers = max_workers
+        self.fetcher = fetcher or fetch_market_cap
+        self.hits = 0
+        self.misses = 0
+
+    def _fetch(self, ticker):
+        try:
+            return ticker, self.fetcher(ticker), None
+        except Exception as e:
+            return ticker, 0, e
+
+    def get(self, tickers):
+        """{ticker: 시가총액} 반환, 캐시에 없는 종목만 병렬 조회"""
+        market_caps = {}
+        missing = []
+        for ticker in tickers:
+            cached = self.cache.get(ticker)
+            if cached is None:
+                missing.append(ticker)
+            else:
+                market_caps[ticker] = cached
+        self.hits += len(market_caps)
+        self.misses += len(missing)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for ticker, market_cap, error in executor.map(self._fetch, missing):
+                    market_caps[ticker] = market_cap
+                    # 조회에 실패한 종목은 캐시하지 않고 다음 실행에서 다시 조회
+                    if error is None:
+                        self.cache.set(ticker, market_cap)
+            self.cache.save()
+        return market_caps
+
+    def top_n(self, tickers, n=10):
+        """시가총액 상위 n개 (ticker, 시가총액) 목록"""
+        market_caps = self.get(tickers)
+        return heapq.nlargest(n, market_caps.items(), key=lambda x: x[1])
+
+
+def load_sp500_tickers(cache_path='db/sp500_tickers.json', ttl_hours=24):
+    """S&P500 종목 목록 (TTL 캐시 사용)"""
+    cache = TTLCache(cache_path, ttl_hours)
+    tickers = cache.get('S&P500')
+    if tickers is None:
+        import FinanceDataReader as fdr
+
+        sp500 = fdr.StockListing('S&P500')
+        tickers = sorted(set(sp500['Symbol'].tolist()))
+        cache.set('S&P500', tickers)
+        cache.save()
+    return tickers
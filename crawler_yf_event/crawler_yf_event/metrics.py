@@ -0,0 +1,226 @@
+# 크롤링 단계별 지표
+#
+# 다운로드 지연, 페이지 파싱 시간, 페이지당 항목 수, 파이프라인 기록 시간을 이벤트 타입별
+# 히스토그램으로, 재시도 횟수를 사유별 카운터로 모은다. 실행이 끝나면 JSON 파일과
+# Prometheus 텍스트 형식 파일(node_exporter textfile collector 등에서 읽을 수 있음)로 내보낸다.
+#
+# 스파이더와 파이프라인은 spider.metrics 가 설정되어 있을 때만 observe()/inc() 를 호출한다.
+
+import json
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+# 지표 이름: (설명, 히스토그램 버킷 상한)
+HISTOGRAMS = {
+    'download_latency_seconds': ('페이지 다운로드 지연 (초)', [0.1, 0.25, 0.5, 1, 2, 5, 10, 30]),
+    'parse_seconds': ('페이지 파싱/타입 변환 시간 (초)', [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1]),
+    'items_per_page': ('페이지당 항목 수', [0, 10, 25, 50, 100, 250, 500]),
+    'pipeline_write_seconds': ('항목 하나의 저장소 기록 시간 (초)', [0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1]),
+}
+COUNTERS = {
+    'pages_total': '처리한 페이지 수 (응답 출처별)',
+    'retries_total': '재시도 횟수 (사유별)',
+}
+METRIC_PREFIX = 'yf_crawl_'
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (Prometheus 와 같은 누적 버킷 형식으로 내보냄)"""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """버킷 상한으로 근사한 분위수 (마지막 버킷을 넘으면 inf)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + [float('inf')], self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def cumulative(self):
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + [float('inf')], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': {('+Inf' if bound == float('inf') else bound): total for bound, total in self.cumulative()},
+        }
+
+
+def _labels(labels):
+    return ','.join(f'{name}="{value}"' for name, value in sorted(labels))
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class CrawlMetrics:
+    """단계별 지표를 모아 실행 종료 시 JSON / Prometheus 텍스트 파일로 내보내는 확장"""
+
+    def __init__(self, json_file=None, prometheus_file=None):
+        self.json_file = json_file
+        self.prometheus_file = prometheus_file
+        # (지표 이름, 라벨 튜플) -> Histogram / 카운트
+        self.histograms = {}
+        self.counters = {}
+        self.started = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('CRAWL_METRICS_ENABLED'):
+            raise NotConfigured
+        s = cls(
+            json_file=settings.get('CRAWL_METRICS_JSON_FILE'),
+            prometheus_file=settings.get('CRAWL_METRICS_PROMETHEUS_FILE'),
+        )
+        s.crawler = crawler
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.response_received, signal=signals.response_received)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+        self.histograms[key].observe(value)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def spider_opened(self, spider):
+        self.started = time.monotonic()
+        spider.metrics = self
+
+    def response_received(self, response, request, spider):
+        event_type = request.meta.get('event_type')
+        if event_type is None:
+            return
+        if 'cached' in response.flags:
+            source = 'cache'
+        elif 'replay' in response.flags:
+            source = 'replay'
+        else:
+            source = 'network'
+            latency = request.meta.get('download_latency')
+            if latency is not None:
+                self.observe('download_latency_seconds', latency, event_type=event_type)
+        self.inc('pages_total', event_type=event_type, source=source)
+
+    def spider_closed(self, spider, reason):
+        # RetryMiddleware(429/5xx/연결 오류)의 재시도 사유는 Scrapy 통계에서 가져옴
+        stats = self.crawler.stats
+        for name, value in stats.get_stats().items():
+            if name.startswith('retry/reason_count/'):
+                self.inc('retries_total', value, reason=name[len('retry/reason_count/'):])
+
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        summary = self.as_dict(elapsed, reason)
+        if self.json_file:
+            self._write(self.json_file, json.dumps(summary, indent=2, ensure_ascii=False))
+        if self.prometheus_file:
+            self._write(self.prometheus_file, self.prometheus_text(elapsed))
+
+        for name in ('download_latency_seconds', 'parse_seconds', 'pipeline_write_seconds'):
+            merged = self._merged(name)
+            if merged.count:
+                spider.logger.info(
+                    f'{name}: n={merged.count}, mean={merged.sum / merged.count:.4f}, '
+                    f'p50<={merged.quantile(0.5)}, p95<={merged.quantile(0.95)}'
+                )
+
+    def _merged(self, name):
+        """라벨을 합친 히스토그램"""
+        merged = Histogram(HISTOGRAMS[name][1])
+        for (metric, _), histogram in self.histograms.items():
+            if metric == name:
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.sum += histogram.sum
+                merged.count += histogram.count
+        return merged
+
+    def as_dict(self, elapsed, reason=None):
+        histograms = {}
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            histograms.setdefault(name, []).append({'labels': dict(labels), **histogram.as_dict()})
+        counters = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            counters.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        items = self.crawler.stats.get_value('item_scraped_count', 0)
+        return {
+            'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'finish_reason': reason,
+            'elapsed_seconds': round(elapsed, 3),
+            'items': items,
+            'items_per_second': round(items / elapsed, 2) if elapsed else None,
+            'histograms': histograms,
+            'counters': counters,
+        }
+
+    def prometheus_text(self, elapsed):
+        lines = []
+        for name, (help_text, _) in HISTOGRAMS.items():
+            series = [(labels, h) for (metric, labels), h in sorted(self.histograms.items()) if metric == name]
+            if not series:
+                continue
+            metric = METRIC_PREFIX + name
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+            for labels, histogram in series:
+                for bound, total in histogram.cumulative():
+                    bucket_labels = _labels(labels + (('le', _format_bound(bound)),))
+                    lines.append(f'{metric}_bucket{{{bucket_labels}}} {total}')
+                lines.append(f'{metric}_sum{{{_labels(labels)}}} {histogram.sum}')
+                lines.append(f'{metric}_count{{{_labels(labels)}}} {histogram.count}')
+        for name, help_text in COUNTERS.items():
+            series = [(labels, v) for (metric, labels), v in sorted(self.counters.items()) if metric == name]
+            if not series:
+                continue
+            metric = METRIC_PREFIX + name
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{{{_labels(labels)}}} {value}' for labels, value in series]
+        lines += [
+            f'# HELP {METRIC_PREFIX}elapsed_seconds 크롤링 소요 시간 (초)',
+            f'# TYPE {METRIC_PREFIX}elapsed_seconds gauge',
+            f'{METRIC_PREFIX}elapsed_seconds {elapsed:.3f}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _write(path, text):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
@@ -3,11 +3,18 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import time
+from datetime import datetime
+
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import HtmlResponse
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+from .response_store import ResponseStore
+
 
 class CrawlerYfEventSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -57,36 +64,130 @@ class CrawlerYfEventSpiderMiddleware:
 
 
 class CrawlerYfEventDownloaderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the downloader middleware does not modify the
-    # passed objects.
+    # 캘린더 페이지 HTTP 캐시
+    #
+    # 정상(200) 응답을 YF_RESPONSE_CACHE_DIR 에 URL 기준으로 압축 저장하고, 요청 날짜(meta['date'])에 따라
+    # 신선도를 판단한다. YF_RESPONSE_CACHE_SETTLED_DAYS 보다 지난 날짜는 바뀌지 않는 것으로 보고 계속 사용하고,
+    # 최근/오늘/미래 날짜는 이벤트 타입별 YF_RESPONSE_CACHE_TTL_HOURS 가 지나면 ETag/Last-Modified 로
+    # 조건부 요청을 보내 304 이면 저장된 본문을 그대로 사용한다.
+    # HttpCompressionMiddleware(590)보다 앞에 있으므로 압축이 풀린 본문을 저장한다.
+
+    # 캐시에서 꺼낸 본문과 맞지 않게 되는 헤더는 저장하지 않음
+    SKIP_HEADERS = {b'content-encoding', b'content-length', b'transfer-encoding'}
+    DEFAULT_TTL_HOURS = {'recent': 6, 'today': 0.5, 'future': 6}
+
+    def __init__(self, store=None, settled_days=3, ttl_hours=None):
+        self.store = store
+        self.settled_days = settled_days
+        self.ttl_hours = ttl_hours or {}
+        self.counts = {'fresh': 0, 'revalidated': 0, 'miss': 0, 'stale': 0}
 
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
-        s = cls()
+        s = cls.from_settings(crawler.settings)
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
+    @classmethod
+    def from_settings(cls, settings):
+        store = None
+        # 재생 모드에서는 기록된 응답만 사용
+        if settings.getbool('YF_RESPONSE_CACHE_ENABLED') and settings.get('HTTP_REPLAY_MODE', 'off') != 'replay':
+            store = ResponseStore(settings.get('YF_RESPONSE_CACHE_DIR', 'yf_response_cache'))
+        return cls(
+            store,
+            settled_days=settings.getint('YF_RESPONSE_CACHE_SETTLED_DAYS', 3),
+            ttl_hours=settings.getdict('YF_RESPONSE_CACHE_TTL_HOURS'),
+        )
+
+    def _ttl(self, event_type, date):
+        """캐시 유효 시간(초), 만료되지 않으면 None"""
+        day = datetime.strptime(date, '%Y-%m-%d').date()
+        today = datetime.now().date()
+        if (today - day).days > self.settled_days:
+            return None
+        if day < today:
+            period = 'recent'
+        elif day == today:
+            period = 'today'
+        else:
+            period = 'future'
+        ttl = self.ttl_hours.get(event_type, {}).get(period, self.DEFAULT_TTL_HOURS[period])
+        return float(ttl) * 3600
+
+    def _is_fresh(self, request, entry):
+        ttl = self._ttl(request.meta['event_type'], request.meta['date'])
+        if ttl is None:
+            return True
+        stored_at = datetime.strptime(entry['stored_at'], '%Y-%m-%d %H:%M:%S')
+        return (datetime.now() - stored_at).total_seconds() < ttl
+
+    def _cached_response(self, request, entry, body, flags):
+        return HtmlResponse(
+            url=request.url,
+            status=entry['status'],
+            headers=entry['headers'],
+            body=body,
+            request=request,
+            flags=flags,
+        )
+
+    @staticmethod
+    def _header(entry, name):
+        for key, values in entry['headers'].items():
+            if key.lower() == name and values:
+                return values[0]
+        return None
+
     def process_request(self, request, spider):
-        # Called for each request that goes through the downloader
-        # middleware.
+        # 캘린더 페이지만 캐시, 테이블 누락으로 재시도하는 요청은 항상 새로 받음
+        if self.store is None or 'date' not in request.meta or request.meta.get('retry_count'):
+            return None
 
-        # Must either:
-        # - return None: continue processing this request
-        # - or return a Response object
-        # - or return a Request object
-        # - or raise IgnoreRequest: process_exception() methods of
-        #   installed downloader middleware will be called
+        cached = self.store.load(request.url)
+        if cached is None:
+            return None
+        entry, body = cached
+        if self._is_fresh(request, entry):
+            self.counts['fresh'] += 1
+            return self._cached_response(request, entry, body, ['cached'])
+
+        # 만료된 항목은 조건부 요청으로 재검증
+        etag = self._header(entry, 'etag')
+        last_modified = self._header(entry, 'last-modified')
+        if etag:
+            request.headers['If-None-Match'] = etag
+        if last_modified:
+            request.headers['If-Modified-Since'] = last_modified
+        request.meta['http_cache_stale'] = True
         return None
 
     def process_response(self, request, response, spider):
-        # Called with the response returned from the downloader.
+        if self.store is None or 'date' not in request.meta:
+            return response
+        if 'cached' in response.flags or 'replay' in response.flags:
+            return response
+
+        if response.status == 304 and request.meta.get('http_cache_stale'):
+            cached = self.store.load(request.url)
+            if cached is not None:
+                entry, body = cached
+                # 재검증 시각으로 다시 저장해 다음 TTL 동안 신선한 것으로 취급
+                self.store.save(request.url, entry['status'], entry['headers'], body, entry.get('meta'))
+                self.counts['revalidated'] += 1
+                return self._cached_response(request, entry, body, ['cached', 'revalidated'])
 
-        # Must either;
-        # - return a Response object
-        # - return a Request object
-        # - or raise IgnoreRequest
+        if response.status == 200:
+            self.counts['stale' if request.meta.get('http_cache_stale') else 'miss'] += 1
+            headers = {
+                key.decode('latin-1'): [value.decode('latin-1') for value in values]
+                for key, values in response.headers.items()
+                if key.lower() not in self.SKIP_HEADERS
+            }
+            meta = {key: request.meta[key] for key in ('event_type', 'date', 'offset') if key in request.meta}
+            self.store.save(request.url, response.status, headers, response.body, meta)
         return response
 
     def process_exception(self, request, exception, spider):
@@ -101,3 +202,234 @@ class CrawlerYfEventDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+    def spider_closed(self, spider):
+        if self.store is None:
+            return
+        stats = spider.crawler.stats
+        for name, value in self.report(spider).items():
+            stats.set_value(f'http_cache/{name}', value)
+
+    def report(self, spider):
+        """적중률과 디스크 사용량을 로그로 남기고 지표 dict 로 반환"""
+        counts = self.counts
+        served = counts['fresh'] + counts['revalidated']
+        total = served + counts['miss'] + counts['stale']
+        hit_rate = served / total if total else 0.0
+        entries, size = self.store.disk_usage()
+        spider.logger.info(
+            f'HTTP cache: hit rate {hit_rate:.1%} (fresh {counts["fresh"]}, revalidated {counts["revalidated"]}, '
+            f'stale {counts["stale"]}, miss {counts["miss"]}), {entries} entries, {size / 1024 / 1024:.1f}MB on disk'
+        )
+        return {**counts, 'hit_rate': round(hit_rate, 4), 'entries': entries, 'bytes': size}
+
+
+class AdaptiveConcurrencyMiddleware:
+    # 이벤트 타입마다 별도의 다운로드 슬롯을 두고, 관측한 지연시간과
+    # 오류(429, 5xx, 테이블 누락)에 따라 슬롯의 지연/동시성을 조정한다 (AIMD).
+    #
+    # - 정상 응답이 목표 지연시간 이하로 한 윈도우(현재 동시성만큼) 이어지면
+    #   먼저 다운로드 지연을 줄이고, 최소 지연에 도달하면 동시성을 1씩 늘린다.
+    # - 오류가 나면 동시성을 절반으로 줄이고, 이미 최소이면 지연을 두 배로 늘린다.
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.min_concurrency = settings.getint('ADAPTIVE_MIN_CONCURRENCY', 1)
+        self.max_concurrency = settings.getint('ADAPTIVE_MAX_CONCURRENCY', 4)
+        self.budgets = settings.getdict('ADAPTIVE_EVENT_BUDGETS')
+        self.target_latency = settings.getfloat('ADAPTIVE_TARGET_LATENCY', 2.0)
+        self.start_delay = settings.getfloat('DOWNLOAD_DELAY', 2.0)
+        self.min_delay = settings.getfloat('ADAPTIVE_MIN_DELAY', 0.25)
+        self.max_delay = settings.getfloat('ADAPTIVE_MAX_DELAY', 30.0)
+        self.states = {}
+        self.started = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ADAPTIVE_CONCURRENCY_ENABLED'):
+            raise NotConfigured
+        s = cls(crawler)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def _state(self, event_type):
+        if event_type not in self.states:
+            self.states[event_type] = {
+                'concurrency': self.min_concurrency,
+                'delay': self.start_delay,
+                'budget': int(self.budgets.get(event_type, self.max_concurrency)),
+                'successes': 0,
+                'pages': 0,
+                'errors': {},
+                'peak': self.min_concurrency,
+                'first_seen': time.monotonic(),
+                'last_seen': time.monotonic(),
+            }
+        return self.states[event_type]
+
+    def _apply(self, event_type, state):
+        # 이미 생성된 다운로드 슬롯에 현재 값을 반영
+        slot = self.crawler.engine.downloader.slots.get(self._slot_key(event_type))
+        if slot is not None:
+            slot.concurrency = state['concurrency']
+            slot.delay = state['delay']
+
+    def _slot_key(self, event_type):
+        return f'yf_calendar:{event_type}'
+
+    def _increase(self, event_type, state):
+        state['successes'] += 1
+        if state['successes'] < state['concurrency']:
+            return
+        state['successes'] = 0
+        if state['delay'] > self.min_delay:
+            state['delay'] = max(self.min_delay, state['delay'] * 0.75)
+        elif state['concurrency'] < state['budget']:
+            state['concurrency'] += 1
+            state['peak'] = max(state['peak'], state['concurrency'])
+        self._apply(event_type, state)
+
+    def _decrease(self, event_type, state, reason, spider):
+        state['successes'] = 0
+        state['errors'][reason] = state['errors'].get(reason, 0) + 1
+        if state['concurrency'] > self.min_concurrency:
+            state['concurrency'] = max(self.min_concurrency, state['concurrency'] // 2)
+        else:
+            state['delay'] = min(self.max_delay, max(state['delay'] * 2, self.min_delay))
+        self._apply(event_type, state)
+        spider.logger.debug(
+            f'Throttling {event_type} ({reason}): concurrency={state["concurrency"]}, delay={state["delay"]:.2f}s'
+        )
+
+    def process_request(self, request, spider):
+        event_type = request.meta.get('event_type')
+        if not event_type:
+            return None
+
+        request.meta['download_slot'] = self._slot_key(event_type)
+        state = self._state(event_type)
+
+        # 테이블 누락으로 재시도하는 요청은 과부하 신호로 간주
+        if request.meta.get('retry_reason') == 'missing_table' and not request.meta.get('adaptive_penalized'):
+            request.meta['adaptive_penalized'] = True
+            self._decrease(event_type, state, 'missing_table', spider)
+        else:
+            self._apply(event_type, state)
+        return None
+
+    def process_response(self, request, response, spider):
+        event_type = request.meta.get('event_type')
+        if not event_type:
+            return response
+
+        # 캐시/재생 응답은 사이트 부하와 무관하므로 조정에 사용하지 않음
+        if 'cached' in response.flags or 'replay' in response.flags:
+            return response
+
+        state = self._state(event_type)
+        state['last_seen'] = time.monotonic()
+        if response.status == 429 or response.status >= 500:
+            self._decrease(event_type, state, str(response.status), spider)
+        elif response.status == 200:
+            state['pages'] += 1
+            latency = request.meta.get('download_latency', 0)
+            if latency > self.target_latency:
+                self._decrease(event_type, state, 'latency', spider)
+            else:
+                self._increase(event_type, state)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        event_type = request.meta.get('event_type')
+        if event_type:
+            self._decrease(event_type, self._state(event_type), type(exception).__name__, spider)
+
+    def spider_opened(self, spider):
+        self.started = time.monotonic()
+
+    def spider_closed(self, spider):
+        stats = self.crawler.stats
+        total_pages = 0
+        for event_type, state in sorted(self.states.items()):
+            elapsed = max(state['last_seen'] - state['first_seen'], 1e-9)
+            rate = state['pages'] / elapsed
+            total_pages += state['pages']
+            errors = ', '.join(f'{k}={v}' for k, v in sorted(state['errors'].items())) or 'none'
+            spider.logger.info(
+                f'Adaptive throughput [{event_type}]: {state["pages"]} pages, {rate:.2f} pages/s, '
+                f'peak concurrency {state["peak"]}/{state["budget"]}, final delay {state["delay"]:.2f}s, errors: {errors}'
+            )
+            stats.set_value(f'adaptive/{event_type}/pages_per_sec', round(rate, 3))
+            stats.set_value(f'adaptive/{event_type}/peak_concurrency', state['peak'])
+
+        if self.started is not None:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            spider.logger.info(f'Adaptive throughput [total]: {total_pages} pages, {total_pages / elapsed:.2f} pages/s')
+            stats.set_value('adaptive/pages_per_sec', round(total_pages / elapsed, 3))
+
+
+class ReplayMiddleware:
+    # 캘린더 응답 기록/재생
+    #
+    # - record: 정상(200) 응답을 HTTP_REPLAY_DIR 에 URL 기준으로 압축 저장
+    # - replay: 네트워크 요청 없이 저장된 응답만으로 크롤링 (없는 URL 은 무시)
+
+    # 재생 시 본문과 맞지 않게 되는 헤더는 저장하지 않음
+    SKIP_HEADERS = {b'content-encoding', b'content-length', b'transfer-encoding'}
+
+    def __init__(self, mode, store):
+        self.mode = mode
+        self.store = store
+        self.count = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        s = cls.from_settings(crawler.settings)
+        if s.mode == 'off':
+            raise NotConfigured
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    @classmethod
+    def from_settings(cls, settings):
+        # 'record'/'replay' 가 아니면 아무것도 하지 않는 'off' (asyncio 수집기에서도 같은 설정으로 사용)
+        mode = settings.get('HTTP_REPLAY_MODE', 'off')
+        if mode not in ('record', 'replay'):
+            mode = 'off'
+        return cls(mode, ResponseStore(settings.get('HTTP_REPLAY_DIR', 'fixtures')))
+
+    def process_request(self, request, spider):
+        if self.mode != 'replay':
+            return None
+
+        entry = self.store.load(request.url)
+        if entry is None:
+            raise IgnoreRequest(f'No recorded response for {request.url}')
+        meta, body = entry
+        self.count += 1
+        return HtmlResponse(
+            url=request.url,
+            status=meta['status'],
+            headers=meta['headers'],
+            body=body,
+            request=request,
+            flags=['replay'],
+        )
+
+    def process_response(self, request, response, spider):
+        if self.mode == 'record' and response.status == 200 and 'replay' not in response.flags:
+            headers = {
+                key.decode('latin-1'): [value.decode('latin-1') for value in values]
+                for key, values in response.headers.items()
+                if key.lower() not in self.SKIP_HEADERS
+            }
+            meta = {key: request.meta[key] for key in ('event_type', 'date', 'offset') if key in request.meta}
+            self.store.save(request.url, response.status, headers, response.body, meta)
+            self.count += 1
+        return response
+
+    def spider_closed(self, spider):
+        action = 'Recorded' if self.mode == 'record' else 'Replayed'
+        spider.logger.info(f'{action} {self.count} responses ({self.store.root}/)')
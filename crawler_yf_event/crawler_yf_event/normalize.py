@@ -0,0 +1,38 @@
+# 이벤트 값 정규화
+#
+# 분석 스크립트마다 따로 하던 문자열 -> 날짜/시간 변환을 한 곳에서 벡터 연산으로 처리한다.
+
+import pandas as pd
+
+# 캘린더의 발표 시각 형식 (예: "8:30 AM UTC", "14:00 UTC"), 앞의 형식부터 적용
+EVENT_TIME_FORMATS = ['%I:%M %p', '%H:%M']
+
+EVENT_TIME_UTC_COLUMN = 'Event Time (UTC)'
+
+
+def parse_time_offsets(times, formats=EVENT_TIME_FORMATS):
+    """시각 문자열을 자정 기준 Timedelta 로 변환 (해석할 수 없으면 NaT)
+
+    발표 시각은 종류가 많지 않으므로 고유 값만 형식별로 한 번씩 to_datetime 으로 변환한 뒤
+    원래 위치로 펼친다. 앞 형식으로 변환되지 않은 값만 다음 형식으로 시도한다.
+    """
+    codes, uniques = pd.factorize(times.astype('string').str.strip().str.replace(r'\s*UTC$', '', regex=True))
+    parsed = pd.Series(pd.NaT, index=range(len(uniques)), dtype='datetime64[ns]')
+    values = pd.Series(uniques, dtype='string')
+    for fmt in formats:
+        pending = parsed.isna()
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(values[pending], format=fmt, errors='coerce')
+
+    offsets = (parsed - parsed.dt.normalize()).to_numpy()
+    result = pd.Series(pd.NaT, index=times.index, dtype='timedelta64[ns]')
+    found = codes >= 0
+    result[found] = offsets[codes[found]]
+    return result
+
+
+def parse_event_times(dates, times, formats=EVENT_TIME_FORMATS):
+    """날짜 컬럼과 발표 시각 문자열을 합쳐 UTC 타임스탬프 Series 로 변환 (시각이 없으면 NaT)"""
+    dates = pd.to_datetime(dates).dt.normalize()
+    return (dates + parse_time_offsets(times, formats)).dt.tz_localize('UTC')
@@ -0,0 +1,196 @@
+# 캘린더 테이블 파서
+#
+# 이벤트 타입별 XPath 를 스파이더당 한 번만 컴파일하고, 응답에서 이미 만들어진
+# lxml 트리(response.selector.root)를 그대로 사용해 테이블 전체를 한 번에 추출한다.
+# 페이지에 내장된 JSON 데이터를 읽는 EmbeddedStateParser 도 같은 결과 형식을 반환한다.
+
+import json
+import re
+from collections import namedtuple
+
+from lxml import etree
+
+# 이벤트 타입별 XPath 설정
+XPATH_CONFIGS = {
+    'earnings': {
+        'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[1]/div/div/p/text()',
+        'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[2]/table',
+        'headers': './/thead/tr/th',
+        'rows': './/tbody/tr',
+        'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
+    },
+    'economic': {
+        'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section/div[1]/div/div/p/text()',
+        'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section/div[2]/table',
+        'headers': './/thead/tr/th',
+        'rows': './/tbody/tr',
+        'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
+    },
+    'ipo': {
+        'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[1]/div/div/p/text()',
+        'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[2]/table',
+        'headers': './/thead/tr/th',
+        'rows': './/tbody/tr',
+        'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
+    },
+    'splits': {
+        'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[1]/div/div/p/text()',
+        'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[2]/table',
+        'headers': './/thead/tr/th',
+        'rows': './/tbody/tr',
+        'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
+    }
+}
+
+RESULTS_PATTERN = re.compile(r'of (\d+) Results')
+
+# 이벤트가 없는 날짜의 안내 문구 (테이블 대신 표시됨)
+NO_RESULTS_PATTERN = re.compile(
+    r"we couldn['’]t find any|weren['’]t able to find any data|no results found|\b0 results\b", re.IGNORECASE
+)
+
+# 한 페이지 파싱 결과
+#   total_results: "of N Results" 의 N (없으면 0)
+#   headers: 테이블 헤더 텍스트 목록
+#   rows: 헤더 순서에 맞춘 행 튜플 목록 (값이 없는 칸은 None)
+#   has_next: 다음 페이지 버튼 존재 여부
+#   table: 데이터를 추출한 요소 (테이블 또는 내장 JSON 스크립트, 없으면 None)
+CalendarPage = namedtuple('CalendarPage', ['total_results', 'headers', 'rows', 'has_next', 'table'])
+
+
+class CalendarTableParser:
+    """XPath 를 미리 컴파일해 두고 캘린더 테이블을 행 튜플로 추출하는 파서"""
+
+    def __init__(self, xpath_configs=None):
+        self.configs = {
+            event_type: {key: etree.XPath(expr) for key, expr in config.items()}
+            for event_type, config in (xpath_configs or XPATH_CONFIGS).items()
+        }
+        self._text = etree.XPath('.//text()')
+        self._link_text = etree.XPath('.//a/text()')
+        self._cells = etree.XPath('.//td')
+        self._body_text = etree.XPath('string(//body)')
+
+    def supports(self, event_type):
+        return event_type in self.configs
+
+    def parse(self, root, event_type):
+        """lxml 루트 요소에서 한 페이지 분량의 테이블 추출"""
+        config = self.configs[event_type]
+
+        total_results = 0
+        results = config['results'](root)
+        if results:
+            match = RESULTS_PATTERN.search(results[0])
+            if match:
+                total_results = int(match.group(1))
+
+        has_next = bool(config['next_button'](root))
+        tables = config['table'](root)
+        if not tables:
+            return CalendarPage(total_results, [], [], has_next, None)
+        table = tables[0]
+
+        # 헤더: 첫 번째 텍스트 노드 (텍스트가 없는 헤더는 제외)
+        headers = []
+        for header in config['headers'](table):
+            texts = self._text(header)
+            if texts and texts[0]:
+                headers.append(texts[0].strip())
+
+        # 첫 번째 칸(Symbol)은 링크 텍스트, economic 의 Event 칸과 나머지는 첫 번째 텍스트 노드
+        text, link_text = self._text, self._link_text
+        first_is_link = not (event_type == 'economic' and headers[:1] == ['Event'])
+        width = len(headers)
+        rows = []
+        for row in config['rows'](table):
+            values = []
+            for idx, cell in enumerate(self._cells(row)[:width]):
+                texts = link_text(cell) if idx == 0 and first_is_link else text(cell)
+                values.append(texts[0].strip() if texts and texts[0] else None)
+            rows.append(tuple(values))
+
+        return CalendarPage(total_results, headers, rows, has_next, table)
+
+    def is_empty(self, root):
+        """테이블이 없는 페이지가 '결과 없음' 안내 페이지인지 (일시적인 오류 페이지와 구분)"""
+        return bool(NO_RESULTS_PATTERN.search(self._body_text(root)))
+
+
+# 내장 JSON 의 컬럼 id 를 테이블 헤더 이름으로 변환 (없으면 컬럼 label 사용)
+EMBEDDED_COLUMN_HEADERS = {
+    'ticker': 'Symbol',
+    'companyshortname': 'Company',
+    'eventname': 'Event Name',
+    'startdatetimetype': 'Earnings Call Time',
+    'epsestimate': 'EPS Estimate',
+    'epsactual': 'Reported EPS',
+    'epssurprisepct': 'Surprise (%)',
+}
+
+
+class EmbeddedStateParser:
+    """페이지에 내장된 fetch 결과(JSON)에서 캘린더 데이터를 추출하는 파서
+
+    캘린더 페이지는 렌더링에 사용한 API 응답을
+    <script type="application/json" data-sveltekit-fetched data-url="..."> 로 함께 내려준다.
+    그 안의 finance.result[].documents[] 에서 columns/rows/total 을 읽어
+    CalendarTableParser 와 같은 CalendarPage 를 반환하고, 찾지 못하면 None 을 반환한다.
+    """
+
+    def __init__(self, column_headers=None):
+        self.column_headers = column_headers or EMBEDDED_COLUMN_HEADERS
+        self._scripts = etree.XPath('//script[@data-sveltekit-fetched]')
+
+    def parse(self, root, event_type):
+        for script in self._scripts(root):
+            document = self._find_document(script.text)
+            if document is None:
+                continue
+
+            columns = document['columns']
+            headers = [self._header(column) for column in columns]
+            keys = [column.get('id') for column in columns]
+            rows = []
+            for row in document['rows']:
+                if isinstance(row, dict):
+                    row = [row.get(key) for key in keys]
+                rows.append(tuple(self._format(value) for value in row[:len(headers)]))
+
+            total_results = int(document.get('total') or len(rows))
+            return CalendarPage(total_results, headers, rows, total_results > len(rows), script)
+        return None
+
+    def _header(self, column):
+        return self.column_headers.get(column.get('id'), column.get('label') or column.get('id'))
+
+    @staticmethod
+    def _find_document(text):
+        if not text or '"documents' not in text:
+            return None
+        try:
+            payload = json.loads(text)
+            body = payload.get('body', payload)
+            if isinstance(body, str):
+                body = json.loads(body)
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(body, dict):
+            return None
+
+        for result in (body.get('finance') or {}).get('result') or []:
+            for document in result.get('documents') or []:
+                if 'columns' in document and 'rows' in document:
+                    return document
+        return None
+
+    @staticmethod
+    def _format(value):
+        # 테이블과 같은 문자열 형태로 맞춤 (빈 값은 테이블처럼 '-')
+        if value is None or value == '':
+            return '-'
+        if isinstance(value, bool):
+            return 'Y' if value else 'N'
+        if isinstance(value, float):
+            return f'{value:.2f}'
+        return str(value).strip()
@@ -6,36 +6,76 @@
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
-import json
-from datetime import datetime
-import os
+import time
+
+from .dedup import UpsertStore
 
 
 class CrawlerYfEventPipeline:
-    def __init__(self):
-        self.all_data = []
+    def __init__(self, output_mode='json', output_file='yf_calendar_events.json',
+                 output_dir='events', flush_batch_size=500, parquet_dir='event_store',
+                 parquet_batch_size=5000, dedup_cache_size=100000, stats=None):
+        self.output_mode = output_mode
+        self.output_file = output_file
+        self.output_dir = output_dir
+        self.flush_batch_size = flush_batch_size
+        self.parquet_dir = parquet_dir
+        self.parquet_batch_size = parquet_batch_size
+        self.dedup_cache_size = dedup_cache_size
+        self.stats = stats
+        self.store = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls.from_settings(crawler.settings, crawler.stats)
+
+    @classmethod
+    def from_settings(cls, settings, stats=None):
+        # 비동기 수집기는 Scrapy 크롤러 없이 설정과 자체 통계 수집기로 생성
+        return cls(
+            output_mode=settings.get('EVENT_OUTPUT_MODE', 'json'),
+            output_file=settings.get('EVENT_OUTPUT_FILE', 'yf_calendar_events.json'),
+            output_dir=settings.get('EVENT_OUTPUT_DIR', 'events'),
+            flush_batch_size=settings.getint('EVENT_FLUSH_BATCH_SIZE', 500),
+            parquet_dir=settings.get('EVENT_PARQUET_DIR', 'event_store'),
+            parquet_batch_size=settings.getint('EVENT_PARQUET_BATCH_SIZE', 5000),
+            dedup_cache_size=settings.getint('EVENT_DEDUP_CACHE_SIZE', 100000),
+            stats=stats,
+        )
+
+    def open_spider(self, spider):
+        # 저장 방식별 writer 앞에서 자연 키 기준으로 중복 제거/업서트
+        #   json: 기존 파일과 병합, jsonl: 이벤트 타입/날짜별 파티션,
+        #   parquet: event_type/year/month Hive 파티션 컬럼형 저장소
+        self.store = UpsertStore(
+            output_mode=self.output_mode,
+            output_file=self.output_file,
+            output_dir=self.output_dir,
+            parquet_dir=self.parquet_dir,
+            flush_batch_size=self.flush_batch_size,
+            parquet_batch_size=self.parquet_batch_size,
+            cache_size=self.dedup_cache_size,
+        )
 
     def process_item(self, item, spider):
-        # 데이터 전처리
-        processed_item = {}
-        for key, value in item.items():
-            if isinstance(value, str):
-                processed_item[key] = value.strip()
-            elif value is None:
-                processed_item[key] = ''
-            else:
-                processed_item[key] = value
-        
-        self.all_data.append(processed_item)
+        # 값의 공백 제거/타입 변환은 스파이더에서 스키마에 따라 이미 처리됨
+        started = time.perf_counter()
+        result = self.store.write(item.as_dict())
+        if spider.metrics:
+            spider.metrics.observe('pipeline_write_seconds', time.perf_counter() - started, event_type=item.event_type)
+        if self.stats is not None:
+            self.stats.inc_value(f'events/{result}')
         return item
 
     def close_spider(self, spider):
         try:
-            if self.all_data:
-                filename = 'yf_calendar_events.json'
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(self.all_data, f, indent=2, ensure_ascii=False)
-                spider.logger.info(f'Saved {len(self.all_data)} items to {filename}')
+            store = self.store
+            store.close()
+            if store.written or store.duplicates:
+                spider.logger.info(
+                    f'Saved {store.written} items to {store.root} '
+                    f'(new {store.inserted}, updated {store.updated}, unchanged {store.duplicates})'
+                )
             else:
                 spider.logger.warning('No data to save')
 
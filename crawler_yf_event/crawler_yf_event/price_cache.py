@@ -0,0 +1,170 @@
+# 주가(OHLCV) 로컬 캐시
+#
+# 종목별 일봉을 Feather(Arrow IPC) 파일로 보관하고, 요청한 기간 중 아직 받지 않은
+# 구간만 데이터 제공자에서 받아 채운다. 같은 구간이 빠진 종목끼리 묶어 한 번에 요청한다.
+
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+PRICE_COLUMNS = ['Close', 'High', 'Low', 'Open', 'Volume']
+
+
+class YFinanceProvider:
+    """yfinance 일괄 다운로드 제공자"""
+
+    def download(self, tickers, start, end):
+        """{ticker: OHLCV DataFrame} 반환 (end 는 포함하지 않음)"""
+        import yfinance as yf
+
+        price_df = yf.download(tickers, start=start, end=end, progress=False)
+        result = {}
+        if price_df is None or price_df.empty:
+            return result
+
+        if isinstance(price_df.columns, pd.MultiIndex):
+            available = set(price_df.columns.get_level_values(1))
+            for ticker in tickers:
+                if ticker in available:
+                    result[ticker] = price_df.xs(ticker, axis=1, level=1)
+        elif len(tickers) == 1:
+            result[tickers[0]] = price_df
+        return result
+
+
+class LocalCsvProvider:
+    """로컬 CSV(db/stock_prices_{ticker}.csv 형식)를 원천으로 쓰는 대체 제공자 (오프라인/테스트용)"""
+
+    def __init__(self, directory, pattern='stock_prices_{ticker}.csv'):
+        self.directory = directory
+        self.pattern = pattern
+
+    def download(self, tickers, start, end):
+        result = {}
+        for ticker in tickers:
+            path = os.path.join(self.directory, self.pattern.format(ticker=ticker))
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            df = df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+            result[ticker] = df[[c for c in PRICE_COLUMNS if c in df.columns]]
+        return result
+
+
+class PriceCache:
+    """(ticker, date) 단위 주가 캐시"""
+
+    def __init__(self, root='db/price_cache', provider=None, chunk_size=50):
+        self.root = root
+        self.provider = provider or YFinanceProvider()
+        self.chunk_size = chunk_size
+        self.coverage_path = os.path.join(root, '_coverage.json')
+        os.makedirs(root, exist_ok=True)
+        self.coverage = self._load_coverage()
+
+    def path(self, ticker):
+        return os.path.join(self.root, f'{ticker}.feather')
+
+    def load(self, ticker):
+        """캐시된 전체 일봉 (없으면 None)"""
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        return pd.read_feather(path).set_index('Date')
+
+    def save(self, ticker, df):
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        df.index.name = 'Date'
+        tmp_path = f'{self.path(ticker)}.tmp'
+        # 분석 단계에서 메모리 매핑으로 바로 읽을 수 있도록 압축하지 않고 저장
+        df.reset_index().to_feather(tmp_path, compression='uncompressed')
+        os.replace(tmp_path, self.path(ticker))
+
+    def missing_ranges(self, ticker, start, end):
+        """아직 받지 않은 [시작, 끝) 구간 목록
+
+        마지막 거래일은 장중에 받았을 수 있으므로 끝 구간은 캐시의 마지막 날짜부터 다시 받는다.
+        캐시된 구간과 떨어진 기간을 요청하면 사이 구간까지 함께 받아 캐시를 연속으로 유지한다.
+        """
+        covered = self.coverage.get(ticker)
+        if not covered:
+            return [(start, end)]
+
+        covered_start = datetime.strptime(covered[0], '%Y-%m-%d')
+        covered_end = datetime.strptime(covered[1], '%Y-%m-%d')
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        if end > covered_end:
+            tail_start = covered_end
+            if covered[2]:
+                tail_start = min(tail_start, datetime.strptime(covered[2], '%Y-%m-%d'))
+            ranges.append((tail_start, end))
+        return ranges
+
+    def update(self, tickers, start, end):
+        """빠진 구간만 받아 캐시에 반영, 받은 요청 수 반환"""
+        # 같은 구간이 빠진 종목끼리 묶기
+        gaps = {}
+        for ticker in tickers:
+            for gap in self.missing_ranges(ticker, start, end):
+                gaps.setdefault(gap, []).append(ticker)
+
+        requests = 0
+        fetched = {}
+        for (gap_start, gap_end), gap_tickers in gaps.items():
+            for i in range(0, len(gap_tickers), self.chunk_size):
+                chunk = gap_tickers[i:i + self.chunk_size]
+                data = self.provider.download(chunk, gap_start, gap_end)
+                requests += 1
+                for ticker, df in data.items():
+                    df = df.dropna(how='all')
+                    if not df.empty:
+                        fetched.setdefault(ticker, []).append(((gap_start, gap_end), df))
+
+        for ticker, received in fetched.items():
+            frames = [self.load(ticker)] + [df for _, df in received]
+            frames = [f[[c for c in PRICE_COLUMNS if c in f.columns]] for f in frames if f is not None and not f.empty]
+            merged = pd.concat(frames)
+            self.save(ticker, merged)
+            last_date = merged.index.max().strftime('%Y-%m-%d')
+            # 데이터를 받은 구간만 받은 것으로 기록 (받지 못한 종목/구간은 다음 실행에서 다시 요청)
+            for gap_start, gap_end in sorted(gap for gap, _ in received):
+                self._extend_coverage(ticker, gap_start, gap_end, last_date)
+
+        self._save_coverage()
+        return requests
+
+    def get(self, tickers, start, end):
+        """{ticker: [start, end) 구간 일봉} 반환, 빠진 구간은 먼저 받아서 채움"""
+        self.update(tickers, start, end)
+        result = {}
+        for ticker in tickers:
+            df = self.load(ticker)
+            if df is None:
+                continue
+            df = df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+            if not df.empty:
+                result[ticker] = df
+        return result
+
+    def _extend_coverage(self, ticker, start, end, last_date):
+        covered = self.coverage.get(ticker)
+        new_start, new_end = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        if covered:
+            new_start = min(new_start, covered[0])
+            new_end = max(new_end, covered[1])
+            last_date = last_date or covered[2]
+        self.coverage[ticker] = [new_start, new_end, last_date]
+
+    def _load_coverage(self):
+        if not os.path.exists(self.coverage_path):
+            return {}
+        with open(self.coverage_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_coverage(self):
+        with open(self.coverage_path, 'w', encoding='utf-8') as f:
+            json.dump(self.coverage, f, indent=2)
@@ -0,0 +1,87 @@
+# 분석 단계 공용 주가 저장소
+#
+# 종목별 일봉을 처음 요청될 때 한 번만 읽어 메모리에 두고, 이후 호출은 같은 DataFrame 을
+# 반환한다. 메모리 사용량이 한도를 넘으면 가장 오래 사용하지 않은 종목부터 내보낸다.
+# PriceCache 의 Feather 파일이 있으면 메모리 매핑으로 읽고, 없으면 CSV 를 읽는다.
+
+import os
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class PriceStore:
+    """메모리 한도가 있는 LRU 주가 캐시"""
+
+    def __init__(self, cache_dir='db/price_cache', csv_dir='db', csv_pattern='stock_prices_{ticker}.csv',
+                 max_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.csv_dir = csv_dir
+        self.csv_pattern = csv_pattern
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # ticker -> (DataFrame 또는 None, 크기)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, ticker):
+        """종목 일봉 (Date 인덱스), 데이터가 없으면 None"""
+        if ticker in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(ticker)
+            return self.entries[ticker][0]
+
+        self.misses += 1
+        df = self._read(ticker)
+        size = int(df.memory_usage(index=True).sum()) if df is not None else 0
+        self.entries[ticker] = (df, size)
+        self.size += size
+        self._evict()
+        return df
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.size,
+        }
+
+    def _evict(self):
+        # 방금 넣은 종목 하나는 한도를 넘더라도 유지
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def _read(self, ticker):
+        feather_path = os.path.join(self.cache_dir, f'{ticker}.feather')
+        if os.path.exists(feather_path):
+            return self._read_feather(feather_path)
+
+        csv_path = os.path.join(self.csv_dir, self.csv_pattern.format(ticker=ticker))
+        if os.path.exists(csv_path):
+            return pd.read_csv(csv_path, index_col=0, parse_dates=True)
+        return None
+
+    @staticmethod
+    def _read_feather(path):
+        from pyarrow import feather
+
+        # 압축하지 않은 Feather 는 메모리 매핑으로 읽어 파일 버퍼를 그대로 사용
+        table = feather.read_table(path, memory_map=True)
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        return df.set_index('Date')
+
+
+_default_store = None
+
+
+def default_price_store():
+    """프로세스 전체에서 공유하는 기본 저장소"""
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
@@ -0,0 +1,100 @@
+# HTML 리포트 작성
+#
+# 그래프마다 fig.to_html() 로 plotly.js(약 3.5MB)를 다시 넣지 않고, 리포트 전체에서 한 번만
+# 포함하거나 참조한다. 긴 시계열은 구간별 최소/최대값을 남기는 방식으로 점 수를 줄인다.
+
+import html
+import os
+
+import numpy as np
+
+# plotly.js 포함 방식
+#   'directory': 리포트와 같은 디렉토리에 plotly-<버전>.min.js 를 한 번 저장하고 참조 (오프라인, 여러 리포트가 공유)
+#   'cdn'      : CDN 주소 참조 (파일이 가장 작지만 열 때 네트워크 필요)
+#   'inline'   : 리포트 파일에 한 번만 포함 (단일 파일로 전달할 때)
+PLOTLYJS_MODES = ('directory', 'cdn', 'inline')
+PLOTLYJS_FILE = 'plotly-{version}.min.js'
+
+
+def plotlyjs_filename():
+    """'directory' 모드에서 저장/참조하는 plotly.js 파일 이름
+
+    plotly 를 업그레이드하면 파일 이름이 바뀌므로 이전 버전 파일을 그대로 참조하지 않는다.
+    """
+    from plotly.offline import get_plotlyjs_version
+
+    return PLOTLYJS_FILE.format(version=get_plotlyjs_version())
+
+
+class HtmlReport:
+    """plotly.js 를 한 번만 포함하는 HTML 리포트"""
+
+    def __init__(self, title, plotlyjs='directory'):
+        if plotlyjs not in PLOTLYJS_MODES:
+            raise ValueError(f'plotlyjs must be one of {PLOTLYJS_MODES}: {plotlyjs}')
+        self.title = title
+        self.plotlyjs = plotlyjs
+        self.parts = [f'<h1>{html.escape(title)}</h1>']
+
+    def heading(self, text, level=2):
+        self.parts.append(f'<h{level}>{html.escape(text)}</h{level}>')
+
+    def figure(self, fig):
+        # plotly.js 는 <head> 에서 한 번만 불러오므로 그래프에는 데이터와 레이아웃만 포함
+        self.parts.append(fig.to_html(full_html=False, include_plotlyjs=False))
+
+    def table(self, df, **kwargs):
+        self.parts.append(df.to_html(**kwargs))
+
+    def _script_tag(self, path):
+        from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+        if self.plotlyjs == 'cdn':
+            return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+        if self.plotlyjs == 'inline':
+            return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+        # 같은 디렉토리의 리포트들이 하나의 파일을 공유 (이미 있으면 다시 쓰지 않음)
+        filename = plotlyjs_filename()
+        js_path = os.path.join(os.path.dirname(os.path.abspath(path)), filename)
+        if not os.path.exists(js_path):
+            with open(js_path, 'w', encoding='utf-8') as f:
+                f.write(get_plotlyjs())
+        return f'<script src="{filename}"></script>'
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<html><head><meta charset="utf-8">')
+            f.write(f'<title>{html.escape(self.title)}</title>')
+            f.write(self._script_tag(path))
+            f.write('</head><body>')
+            f.write('\n'.join(self.parts))
+            f.write('</body></html>')
+
+
+def downsample_series(series, max_points=100, keep=()):
+    """시계열을 최대 max_points 개 근처로 줄임
+
+    구간마다 최소/최대값 위치를 남겨 급등락이 사라지지 않도록 하고, 처음/마지막 점과
+    keep 에 포함된 인덱스(예: 이벤트 날짜)는 항상 유지한다.
+    """
+    n = len(series)
+    if n <= max_points:
+        return series
+
+    values = series.to_numpy(dtype=float)
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(1, n - 1, buckets + 1).astype(int)
+    positions = {0, n - 1}
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        chunk = values[start:end]
+        if np.isnan(chunk).all():
+            continue
+        positions.add(start + int(np.nanargmin(chunk)))
+        positions.add(start + int(np.nanargmax(chunk)))
+    for label in keep:
+        if label in series.index:
+            positions.add(series.index.get_loc(label))
+    return series.iloc[sorted(positions)]
@@ -0,0 +1,74 @@
+# 원본 응답 저장소
+#
+# 캘린더 페이지 응답을 URL 기준 키로 gzip 압축해 디스크에 저장한다.
+# 한 파일은 메타데이터 JSON 한 줄과 원본 본문으로 구성된다.
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+class ResponseStore:
+    """URL 을 키로 하는 압축 응답 저장소"""
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def path(self, url):
+        key = self.key(url)
+        return os.path.join(self.root, key[:2], f'{key}.gz')
+
+    def save(self, url, status, headers, body, meta=None):
+        """응답 저장 (headers 는 {이름: [값, ...]} 형태)"""
+        path = self.path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = {
+            'url': url,
+            'status': status,
+            'headers': headers,
+            'meta': meta or {},
+            'stored_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        # 중간에 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f'{path}.tmp'
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    def load(self, url):
+        """(메타데이터, 본문) 반환, 저장된 응답이 없으면 None"""
+        path = self.path(url)
+        if not os.path.exists(path):
+            return None
+        return self._read(path)
+
+    def iter_entries(self):
+        """저장된 모든 응답을 (메타데이터, 본문) 으로 반환"""
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in sorted(filenames):
+                if filename.endswith('.gz'):
+                    yield self._read(os.path.join(dirpath, filename))
+
+    def disk_usage(self):
+        """(저장된 응답 수, 전체 바이트 수)"""
+        entries = size = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.gz'):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(dirpath, filename))
+        return entries, size
+
+    @staticmethod
+    def _read(path):
+        with gzip.open(path, 'rb') as f:
+            data = f.read()
+        header, _, body = data.partition(b'\n')
+        return json.loads(header), body
@@ -0,0 +1,204 @@
+# 이벤트 타입별 스키마
+#
+# 캘린더 테이블의 컬럼과 타입을 이벤트 타입마다 선언해 두고, 스파이더가 페이지를 파싱할 때
+# 한 번만 문자열을 숫자/날짜로 변환한다. 파이프라인(저장)과 분석 스크립트(읽기)가 함께 사용하므로
+# scrapy 에 의존하지 않도록 유지한다.
+
+import re
+from datetime import datetime
+
+STRING = 'string'
+NUMBER = 'number'    # "1,234.5", "+7.89", "-0.07", "250K"
+PERCENT = 'percent'  # "+7.89", "12.5%" -> 7.89, 12.5 (% 단위 그대로)
+INTEGER = 'integer'  # "612,665,300"
+DATE = 'date'        # "Mar 05, 2025" -> "2025-03-05"
+
+# 값이 없음을 뜻하는 셀 내용
+MISSING_VALUES = frozenset(['', '-', '--', 'N/A'])
+
+NUMBER_SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+NUMBER_PATTERN = re.compile(r'^([+-]?\d+(?:\.\d+)?)([KMBT]?)$')
+
+# 테이블 날짜 형식 (앞의 형식부터 시도)
+DATE_FORMATS = ['%b %d, %Y', '%Y-%m-%d']
+
+
+def _coerce_string(value):
+    return value
+
+
+def _coerce_number(value):
+    match = NUMBER_PATTERN.match(value.replace(',', '').replace('%', ''))
+    if not match:
+        return None
+    number = float(match.group(1))
+    if match.group(2):
+        number *= NUMBER_SUFFIXES[match.group(2)]
+    return number
+
+
+def _coerce_integer(value):
+    number = _coerce_number(value)
+    return None if number is None else int(number)
+
+
+def _coerce_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+COERCERS = {
+    STRING: _coerce_string,
+    NUMBER: _coerce_number,
+    PERCENT: _coerce_number,
+    INTEGER: _coerce_integer,
+    DATE: _coerce_date,
+}
+
+
+def coerce_value(kind, value):
+    """셀 문자열 하나를 kind 타입으로 변환 (값이 없거나 해석할 수 없으면 None)"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    if value in MISSING_VALUES:
+        return None
+    return COERCERS[kind](value)
+
+
+class EventSchema:
+    """한 이벤트 타입의 컬럼 이름/타입 선언"""
+
+    def __init__(self, event_type, fields, key, ignored=()):
+        self.event_type = event_type
+        self.names = [name for name, _ in fields]
+        self.kinds = [kind for _, kind in fields]
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        # 같은 이벤트를 식별하는 컬럼 (date 와 함께 자연 키를 이룸)
+        self.key = list(key)
+        # 데이터가 아닌 UI 컬럼 (예: Follow 버튼)
+        self.ignored = frozenset(ignored)
+
+    def row_coercer(self, headers):
+        """페이지 헤더 순서의 행 튜플을 스키마 순서의 타입 변환된 튜플로 바꾸는 함수와
+        스키마에 없는 헤더 목록을 반환 (헤더 매핑은 페이지마다 한 번만 계산)"""
+        mapping = []
+        unknown = []
+        for index, header in enumerate(headers):
+            if header in self.positions:
+                position = self.positions[header]
+                mapping.append((index, position, self.kinds[position]))
+            elif header not in self.ignored:
+                unknown.append(header)
+
+        width = len(self.names)
+
+        def coerce(row):
+            values = [None] * width
+            for index, position, kind in mapping:
+                if index < len(row):
+                    values[position] = coerce_value(kind, row[index])
+            return tuple(values)
+
+        return coerce, unknown
+
+    def as_dict(self, values):
+        """스키마 순서의 값 튜플을 {컬럼: 값} 으로 변환"""
+        return dict(zip(self.names, values))
+
+    def arrow_fields(self):
+        import pyarrow as pa
+
+        types = {
+            STRING: pa.string(),
+            NUMBER: pa.float64(),
+            PERCENT: pa.float64(),
+            INTEGER: pa.int64(),
+            DATE: pa.date32(),
+        }
+        return [pa.field(name, types[kind]) for name, kind in zip(self.names, self.kinds)]
+
+
+EVENT_SCHEMAS = {
+    'earnings': EventSchema('earnings', [
+        ('Symbol', STRING),
+        ('Company', STRING),
+        ('Event Name', STRING),
+        ('Earnings Call Time', STRING),
+        ('EPS Estimate', NUMBER),
+        ('Reported EPS', NUMBER),
+        ('Surprise (%)', PERCENT),
+    ], key=['Symbol', 'Event Name'], ignored=['Follow']),
+    'economic': EventSchema('economic', [
+        ('Event', STRING),
+        ('Country', STRING),
+        ('Event Time', STRING),
+        ('For', STRING),
+        ('Actual', NUMBER),
+        ('Market Expectation', NUMBER),
+        ('Prior to This', NUMBER),
+        ('Revised from', NUMBER),
+    ], key=['Country', 'Event', 'Event Time']),
+    'ipo': EventSchema('ipo', [
+        ('Symbol', STRING),
+        ('Company', STRING),
+        ('Exchange', STRING),
+        ('Date', DATE),
+        ('Price Range', STRING),
+        ('Price', NUMBER),
+        ('Currency', STRING),
+        ('Shares', INTEGER),
+        ('Actions', STRING),
+    ], key=['Symbol', 'Company', 'Exchange']),
+    'splits': EventSchema('splits', [
+        ('Symbol', STRING),
+        ('Company', STRING),
+        ('Payable On', DATE),
+        ('Optionable?', STRING),
+        ('Ratio', STRING),
+    ], key=['Symbol', 'Ratio']),
+}
+
+
+def coerce_frame(df, event_type):
+    """이전 형식(모든 값이 문자열)으로 저장된 데이터를 스키마 타입으로 일괄 변환
+
+    이미 타입이 지정된 컬럼은 그대로 둔다.
+    """
+    import pandas as pd
+
+    schema = EVENT_SCHEMAS.get(event_type)
+    if schema is None or df.empty:
+        return df
+
+    for name, kind in zip(schema.names, schema.kinds):
+        if name not in df.columns:
+            continue
+        column = df[name]
+        if kind == INTEGER and pd.api.types.is_float_dtype(column):
+            # 값이 없는 칸이 있는 정수 컬럼은 Arrow -> pandas 변환 시 float 이 되므로 되돌림
+            df[name] = column.round().astype('Int64')
+            continue
+        if kind == STRING or not (column.dtype == object or pd.api.types.is_string_dtype(column)):
+            continue
+        text = column.astype('string').str.strip()
+        text = text.mask(text.isin(MISSING_VALUES))
+        if kind == DATE:
+            parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+            for fmt in DATE_FORMATS:
+                pending = parsed.isna() & text.notna()
+                parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+            df[name] = parsed
+        else:
+            number = text.str.replace(r'[,%]', '', regex=True)
+            suffix = number.str.extract(r'([KMBT])$', expand=False)
+            values = pd.to_numeric(number.str.replace(r'[KMBT]$', '', regex=True), errors='coerce')
+            values = values * suffix.map(NUMBER_SUFFIXES).fillna(1)
+            df[name] = values.round().astype('Int64') if kind == INTEGER else values.astype(float)
+    return df
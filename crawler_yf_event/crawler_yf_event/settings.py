@@ -19,14 +19,16 @@ USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTM
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-CONCURRENT_REQUESTS = 1
+# 이벤트 타입별 동시성은 AdaptiveConcurrencyMiddleware 가 슬롯 단위로 조정
+CONCURRENT_REQUESTS = 8
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
 DOWNLOAD_DELAY = 2
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+# (이벤트 타입별 슬롯의 초기 동시성으로도 사용)
+CONCURRENT_REQUESTS_PER_DOMAIN = 1
 #CONCURRENT_REQUESTS_PER_IP = 16
 
 # Disable cookies (enabled by default)
@@ -51,13 +53,63 @@ DOWNLOAD_DELAY = 2
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
    'crawler_yf_event.middlewares.CrawlerYfEventDownloaderMiddleware': 543,
+   # RetryMiddleware(550) 보다 먼저 429/5xx 응답을 관측하도록 높은 순서에 배치
+   'crawler_yf_event.middlewares.AdaptiveConcurrencyMiddleware': 560,
+   # HttpCompressionMiddleware(590) 가 압축을 푼 뒤의 본문을 기록
+   'crawler_yf_event.middlewares.ReplayMiddleware': 580,
 }
 
+# 응답 기록/재생 ('off', 'record', 'replay')
+# record 로 저장해 둔 응답은 replay 모드에서 네트워크 없이 다시 파싱할 수 있다.
+HTTP_REPLAY_MODE = 'off'
+HTTP_REPLAY_DIR = 'fixtures'
+
+# 캘린더 페이지 응답 캐시 (CrawlerYfEventDownloaderMiddleware, Scrapy 내장 HTTPCACHE_* 와는 별개)
+#   YF_RESPONSE_CACHE_SETTLED_DAYS 보다 지난 날짜의 페이지는 만료되지 않음
+#   최근 지난 날짜(recent)/오늘(today)/미래(future) 페이지는 이벤트 타입별 시간(시)이 지나면
+#   ETag/Last-Modified 로 재검증
+#   scrapy crawl 로 직접 실행하면 꺼져 있고, run_crawler.py 가 켠다 (--no-cache 로 끔)
+YF_RESPONSE_CACHE_ENABLED = False
+YF_RESPONSE_CACHE_DIR = 'yf_response_cache'
+YF_RESPONSE_CACHE_SETTLED_DAYS = 3
+YF_RESPONSE_CACHE_TTL_HOURS = {
+    'earnings': {'recent': 6, 'today': 0.5, 'future': 6},
+    'economic': {'recent': 6, 'today': 0.25, 'future': 3},
+    'ipo': {'recent': 12, 'today': 1, 'future': 12},
+    'splits': {'recent': 12, 'today': 1, 'future': 12},
+}
+
+# 이벤트 타입별 적응형 동시성 제어
+# DOWNLOAD_DELAY 에서 시작해 ADAPTIVE_MIN_DELAY 까지 지연을 줄인 뒤,
+# 이벤트 타입별 예산(ADAPTIVE_EVENT_BUDGETS)까지 동시성을 늘린다.
+ADAPTIVE_CONCURRENCY_ENABLED = True
+ADAPTIVE_MIN_CONCURRENCY = 1
+ADAPTIVE_MAX_CONCURRENCY = 4
+ADAPTIVE_EVENT_BUDGETS = {
+    'earnings': 4,
+    'economic': 2,
+    'ipo': 1,
+    'splits': 1,
+}
+ADAPTIVE_TARGET_LATENCY = 2.0
+ADAPTIVE_MIN_DELAY = 0.25
+ADAPTIVE_MAX_DELAY = 30
+
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
 #EXTENSIONS = {
 #    "scrapy.extensions.telnet.TelnetConsole": None,
 #}
+EXTENSIONS = {
+   'crawler_yf_event.metrics.CrawlMetrics': 500,
+}
+
+# 단계별 지표 (다운로드 지연/파싱 시간/페이지당 항목 수/재시도 사유/파이프라인 기록 시간)
+# 실행이 끝나면 JSON 과 Prometheus 텍스트 형식으로 저장 (경로를 비우면 해당 형식은 저장하지 않음)
+# 기본으로 꺼져 있고 run_crawler.py --metrics DIR 로 켜면 DIR 아래에 저장
+CRAWL_METRICS_ENABLED = False
+CRAWL_METRICS_JSON_FILE = 'crawl_metrics.json'
+CRAWL_METRICS_PROMETHEUS_FILE = 'crawl_metrics.prom'
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
@@ -65,6 +117,57 @@ ITEM_PIPELINES = {
    'crawler_yf_event.pipelines.CrawlerYfEventPipeline': 300,
 }
 
+# 이벤트 저장 방식
+#   'json'  : 크롤링 종료 시 EVENT_OUTPUT_FILE 하나로 저장 (기존 파일과 병합)
+#   'jsonl' : EVENT_OUTPUT_DIR/{event_type}/{date}.jsonl 파티션에 배치 단위로 추가 기록
+#   'parquet' : EVENT_PARQUET_DIR/event_type=.../year=.../month=... Parquet 데이터셋
+EVENT_OUTPUT_MODE = 'json'
+EVENT_OUTPUT_FILE = 'yf_calendar_events.json'
+EVENT_OUTPUT_DIR = 'events'
+EVENT_FLUSH_BATCH_SIZE = 500
+EVENT_PARQUET_DIR = 'event_store'
+EVENT_PARQUET_BATCH_SIZE = 5000
+# 중복 제거/업서트: 자연 키 인덱스(저장소의 _keys.sqlite3) 앞의 메모리 캐시 크기 (키 개수)
+EVENT_DEDUP_CACHE_SIZE = 100000
+
+# 이벤트 타입별 데이터 추출 방식
+#   'xpath'    : 렌더링된 테이블을 XPath 로 파싱
+#   'embedded' : 페이지에 내장된 JSON(data-sveltekit-fetched)을 읽고, 없으면 'xpath' 로 대체
+EXTRACTION_BACKENDS = {
+    'earnings': 'xpath',
+    'economic': 'xpath',
+    'ipo': 'xpath',
+    'splits': 'xpath',
+}
+# 한 페이지당 요청 항목 수 (embedded 방식에서는 더 큰 값도 사용 가능)
+CALENDAR_PAGE_SIZE = 100
+# 이벤트 타입별로 더 큰 페이지 크기 시도 (사이트가 더 적게 반환하면 그 크기로 나머지 offset 계산)
+CALENDAR_PAGE_SIZES = {
+    'earnings': 250,
+}
+# 사이트가 허용하는 최대 offset
+CALENDAR_MAX_OFFSETS = {
+    'earnings': 1000,
+}
+# 최대 offset 을 넘는 날짜는 이 필드의 역순 정렬로 끝에서부터 남은 행을 받음
+# (이 필드로 정렬해 요청하며, 설정하지 않은 타입은 상한 이후 행을 건너뜀)
+CALENDAR_SPLIT_SORT_FIELDS = {
+    'earnings': 'ticker',
+}
+
+# asyncio 수집기 (run_crawler.py --engine async)
+#   연결 풀 크기(동시 요청 수)와 작업자별 요청 간격(초), 재시도 횟수는 RETRY_TIMES 를 따름
+ASYNC_CRAWL_CONCURRENCY = 4
+ASYNC_CRAWL_DELAY = 0.5
+
+# 증분 크롤링 수집 이력 (run_crawler.py --incremental 로도 활성화)
+# 이벤트 날짜로부터 CRAWL_STATE_SETTLE_DAYS 가 지난 뒤 수집 완료된 날짜는 다시 요청하지 않고,
+# 그 외 날짜는 마지막 수집 후 CRAWL_STATE_TTL_HOURS 가 지나면 다시 요청한다.
+CRAWL_STATE_ENABLED = False
+CRAWL_STATE_PATH = 'crawl_state.sqlite3'
+CRAWL_STATE_SETTLE_DAYS = 3
+CRAWL_STATE_TTL_HOURS = 12
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 #AUTOTHROTTLE_ENABLED = True
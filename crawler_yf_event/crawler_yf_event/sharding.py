@@ -0,0 +1,73 @@
+# 샤드 분할/병합
+#
+# 긴 기간을 여러 프로세스로 나눠 수집할 때 날짜 구간(과 이벤트 타입)별 작업 단위를 만들고,
+# 각 샤드가 JSON Lines 파티션으로 남긴 결과를 하나의 저장소로 합치면서 중복을 제거한다.
+
+import os
+from datetime import datetime, timedelta
+
+from .dedup import UpsertStore
+from .event_store import iter_jsonl_records
+
+
+def split_date_range(start_date, end_date, parts):
+    """[start_date, end_date] 를 최대 parts 개의 연속 구간 (시작, 끝) 목록으로 분할"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    days = (end - start).days + 1
+    parts = max(1, min(parts, days))
+
+    ranges = []
+    offset = 0
+    for i in range(parts):
+        # 남는 날짜는 앞쪽 구간에 하루씩 배분
+        length = days // parts + (1 if i < days % parts else 0)
+        chunk_start = start + timedelta(days=offset)
+        chunk_end = chunk_start + timedelta(days=length - 1)
+        ranges.append((chunk_start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+        offset += length
+    return ranges
+
+
+def plan_shards(start_date, end_date, events, shards, by_event=False):
+    """샤드 작업 목록 [(시작, 끝, 이벤트 타입 목록), ...]
+
+    by_event=True 이면 날짜 구간마다 이벤트 타입을 따로 나눈다
+    (earnings 처럼 페이지가 많은 타입이 한 프로세스에 몰리지 않도록).
+    """
+    if by_event:
+        parts = max(1, shards // len(events))
+        return [
+            (chunk_start, chunk_end, [event])
+            for chunk_start, chunk_end in split_date_range(start_date, end_date, parts)
+            for event in events
+        ]
+    return [
+        (chunk_start, chunk_end, list(events))
+        for chunk_start, chunk_end in split_date_range(start_date, end_date, shards)
+    ]
+
+
+def merge_shard_outputs(shard_dirs, output_mode='json', output_file='yf_calendar_events.json',
+                        output_dir='events', parquet_dir='event_store', flush_batch_size=500,
+                        parquet_batch_size=5000):
+    """샤드별 JSON Lines 결과를 output_mode 저장소로 병합하고 (저장 건수, 중복 건수) 반환
+
+    파이프라인과 같은 UpsertStore 를 사용하므로 기존 저장소와도 자연 키 기준으로 병합된다.
+    """
+    store = UpsertStore(
+        output_mode=output_mode,
+        output_file=output_file,
+        output_dir=output_dir,
+        parquet_dir=parquet_dir,
+        flush_batch_size=flush_batch_size,
+        parquet_batch_size=parquet_batch_size,
+    )
+    for shard_dir in shard_dirs:
+        if not os.path.isdir(shard_dir):
+            continue
+        # 샤드 출력은 날짜순이므로 같은 키는 나중(최근) 레코드가 반영됨
+        for record in iter_jsonl_records(shard_dir):
+            store.write(record)
+    store.close()
+    return store.written, store.duplicates
@@ -1,25 +1,64 @@
 import scrapy
+import time
 from datetime import datetime, timedelta
-import re
 from ..items import YFCalendarEventItem
-from urllib.parse import urljoin
+from ..crawl_state import CrawlStateIndex
+from ..parsing import CalendarTableParser, EmbeddedStateParser
+from ..schema import EVENT_SCHEMAS
+from urllib.parse import urlencode, urlparse
 
 class YFCalendarSpider(scrapy.Spider):
     name = 'yf_calendar'
     allowed_domains = ['finance.yahoo.com']
+
+    REQUEST_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Connection': 'keep-alive',
+    }
     
     def __init__(self, *args, **kwargs):
         super(YFCalendarSpider, self).__init__(*args, **kwargs)
         self.event_types = ['earnings', 'economic', 'ipo', 'splits']
-        self.base_url = 'https://finance.yahoo.com/calendar/'
+        self.base_url = kwargs.get('base_url') or 'https://finance.yahoo.com/calendar/'
+        if kwargs.get('base_url'):
+            # 로컬 대체 서버 등 다른 호스트로 요청하는 경우
+            self.allowed_domains = [urlparse(self.base_url).hostname]
         
         # 커맨드 라인 인자 처리
         self.start_date = kwargs.get('start_date')
         self.end_date = kwargs.get('end_date')
         self.selected_events = kwargs.get('events', self.event_types)
+        # 증분 크롤링: 이미 수집 완료되어 더 이상 바뀌지 않는 날짜는 건너뜀
+        self.incremental = str(kwargs.get('incremental', '')).lower() in ('1', 'true', 'yes')
+        self.full_refresh = str(kwargs.get('full_refresh', '')).lower() in ('1', 'true', 'yes')
         
         # 선택된 이벤트 타입만 필터링
         self.event_types = [event for event in self.event_types if event in self.selected_events]
+
+        # XPath 는 스파이더당 한 번만 컴파일
+        self.table_parser = CalendarTableParser()
+        self.embedded_parser = EmbeddedStateParser()
+        # 이벤트 타입별 추출 방식 ('xpath' 또는 'embedded')과 페이지 크기 (from_crawler 에서 설정값 적용)
+        self.extraction_backends = {}
+        self.page_size = 100
+        # 이벤트 타입별 요청 페이지 크기, offset 상한, offset 상한을 넘는 날짜에 사용할 정렬 필드
+        self.page_sizes = {}
+        self.max_offsets = {}
+        self.split_sort_fields = {}
+        # 사이트가 실제로 반환한 페이지 크기 (요청 크기보다 작으면 이 값으로 offset 계산)
+        self.accepted_page_sizes = {}
+        # (event_type, date) 별 아직 처리되지 않은 페이지와 전체 페이지 수, 실패한 날짜
+        self.pending_pages = {}
+        self.day_pages = {}
+        self.failed_days = set()
+        # 다시 받은 날짜 중 내용이 바뀐 페이지가 있는 (event_type, date)
+        self.changed_days = set()
+        # 단계별 지표 수집기 (CrawlMetrics 확장이 켜져 있으면 spider_opened 에서 설정)
+        self.metrics = None
+        # 스키마에 없어 경고한 (이벤트 타입, 헤더)
+        self.unknown_headers = set()
         
         # 날짜가 지정되지 않은 경우 기본값 설정
         if not self.start_date:
@@ -32,184 +71,233 @@ class YFCalendarSpider(scrapy.Spider):
     @classmethod
     def from_crawler(cls, crawler, *args, **kwargs):
         spider = super().from_crawler(crawler, *args, **kwargs)
-        # 이벤트별 파일 저장을 위한 설정
-        spider.event_files = {}
+        spider.configure(crawler.settings)
         return spider
 
+    def configure(self, settings):
+        """프로젝트 설정 적용 (Scrapy 밖의 비동기 수집기에서도 사용)"""
+        # 이벤트별 파일 저장을 위한 설정
+        self.event_files = {}
+
+        self.extraction_backends = settings.getdict('EXTRACTION_BACKENDS')
+        self.page_size = settings.getint('CALENDAR_PAGE_SIZE', 100)
+        self.page_sizes = settings.getdict('CALENDAR_PAGE_SIZES')
+        self.max_offsets = settings.getdict('CALENDAR_MAX_OFFSETS')
+        self.split_sort_fields = settings.getdict('CALENDAR_SPLIT_SORT_FIELDS')
+
+        # 수집 이력 인덱스
+        self.crawl_state = None
+        if self.incremental or settings.getbool('CRAWL_STATE_ENABLED'):
+            self.crawl_state = CrawlStateIndex(
+                settings.get('CRAWL_STATE_PATH', 'crawl_state.sqlite3'),
+                settle_days=settings.getint('CRAWL_STATE_SETTLE_DAYS', 3),
+                ttl_hours=settings.getfloat('CRAWL_STATE_TTL_HOURS', 12),
+            )
+
+    def closed(self, reason):
+        if self.crawl_state:
+            self.crawl_state.close()
+
     def start_requests(self):
         # 시작일과 종료일 사이의 모든 날짜 생성
         start = datetime.strptime(self.start_date, '%Y-%m-%d')
         end = datetime.strptime(self.end_date, '%Y-%m-%d')
         current = start
+        skipped = 0
         
         while current <= end:
             current_date = current.strftime('%Y-%m-%d')
             for event_type in self.event_types:
-                url = f'{self.base_url}{event_type}'
-                params = {
-                    'day': current_date,
-                    'size': '100'  # 한 페이지당 100개 항목
-                }
+                if self.crawl_state and not self.full_refresh and not self.crawl_state.needs_fetch(event_type, current_date):
+                    skipped += 1
+                    continue
                 self.logger.info(f'Requesting {event_type} events for {current_date}')
-                yield scrapy.Request(
-                    url=f'{url}?{"&".join(f"{k}={v}" for k, v in params.items())}',
-                    callback=self.parse,
-                    meta={
-                        'event_type': event_type,
-                        'date': current_date
-                    },
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Connection': 'keep-alive',
-                    }
-                )
+                # 첫 페이지의 전체 건수를 보고 나머지 페이지를 한 번에 요청
+                self.pending_pages[(event_type, current_date)] = {(False, 0)}
+                yield self.page_request(event_type, current_date, 0)
             current += timedelta(days=1)
 
+        if skipped:
+            self.logger.info(f'Skipped {skipped} already crawled (event_type, day) pairs')
+
+    def page_size_for(self, event_type):
+        """요청할 페이지 크기 (사이트가 더 작은 크기로 응답한 적이 있으면 그 크기)"""
+        if event_type in self.accepted_page_sizes:
+            return self.accepted_page_sizes[event_type]
+        return int(self.page_sizes.get(event_type, self.page_size))
+
+    def page_request(self, event_type, date, offset, size=None, reverse=False):
+        """캘린더 한 페이지 요청 (reverse=True 이면 정렬 필드 역순)"""
+        params = {
+            'day': date,
+            'offset': offset,
+            'size': size or self.page_size_for(event_type),
+        }
+        sort_field = self.split_sort_fields.get(event_type)
+        if sort_field:
+            # offset 상한을 넘는 날짜를 정방향/역방향으로 나눠 받을 수 있도록 항상 같은 필드로 정렬
+            params['sortField'] = sort_field
+            params['sortType'] = 'DESC' if reverse else 'ASC'
+        return scrapy.Request(
+            url=f'{self.base_url}{event_type}?{urlencode(params)}',
+            callback=self.parse,
+            meta={
+                'event_type': event_type,
+                'date': date,
+                'offset': offset,
+                'reverse': reverse,
+                'retry_count': 0
+            },
+            headers=self.REQUEST_HEADERS
+        )
+
     def parse(self, response):
         event_type = response.meta['event_type']
         date = response.meta['date']
+        offset = response.meta.get('offset', 0)
+        reverse = response.meta.get('reverse', False)
         retry_count = response.meta.get('retry_count', 0)
+        started = time.perf_counter()
         
-        # 이벤트 타입별 XPath 설정
-        xpath_configs = {
-            'earnings': {
-                'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[1]/div/div/p/text()',
-                'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[2]/table',
-                'headers': './/thead/tr/th',
-                'rows': './/tbody/tr',
-                'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
-            },
-            'economic': {
-                'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section/div[1]/div/div/p/text()',
-                'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section/div[2]/table',
-                'headers': './/thead/tr/th',
-                'rows': './/tbody/tr',
-                'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
-            },
-            'ipo': {
-                'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[1]/div/div/p/text()',
-                'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[2]/table',
-                'headers': './/thead/tr/th',
-                'rows': './/tbody/tr',
-                'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
-            },
-            'splits': {
-                'results': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[1]/div/div/p/text()',
-                'table': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[2]/table',
-                'headers': './/thead/tr/th',
-                'rows': './/tbody/tr',
-                'next_button': '//*[@id="nimbus-app"]/section/section/section/article/section/section[1]/div[3]/div[3]/button[3]'
-            }
-        }
-        
-        config = xpath_configs.get(event_type)
-        if not config:
+        if not self.table_parser.supports(event_type):
             self.logger.error(f'Unknown event type: {event_type}')
             return
 
-        # 전체 결과 수 추출
-        results_text = response.xpath(config['results']).get()
-        total_results = 0
-        if results_text:
-            match = re.search(r'of (\d+) Results', results_text)
-            if match:
-                total_results = int(match.group(1))
-                self.logger.info(f'Found {total_results} results for {event_type} on {date}')
+        # 응답의 lxml 트리에서 한 페이지 분량을 한 번에 추출
+        page = self.extract_page(response, event_type)
+        total_results = page.total_results
+        if total_results and offset == 0 and not reverse:
+            self.logger.info(f'Found {total_results} results for {event_type} on {date}')
 
         # 테이블 추출
-        table = response.xpath(config['table'])
-        if not table:
+        if page.table is None:
+            if self.table_parser.is_empty(response.selector.root):
+                # 이벤트가 없는 날짜: 재시도하지 않고 행 0개로 수집 완료 처리
+                self.logger.info(f'No {event_type} events on {date}')
+                if self.crawl_state:
+                    if self.crawl_state.record_page(event_type, date, -1 - offset if reverse else offset, []):
+                        self.changed_days.add((event_type, date))
+                self.finish_page(event_type, date, reverse, offset)
+                return
             if retry_count < 2:  # 최대 2번까지 재시도
                 self.logger.warning(f'Table not found for {event_type} on {date}, retrying... (attempt {retry_count + 1})')
+                if self.metrics:
+                    self.metrics.inc('retries_total', reason='missing_table')
                 yield scrapy.Request(
                     url=response.url,
                     callback=self.parse,
                     meta={
                         'event_type': event_type,
                         'date': date,
-                        'retry_count': retry_count + 1
+                        'offset': offset,
+                        'reverse': reverse,
+                        'retry_count': retry_count + 1,
+                        'retry_reason': 'missing_table'
                     },
-                    headers=response.request.headers,
+                    headers=self.REQUEST_HEADERS,
                     dont_filter=True
                 )
                 return
             else:
                 self.logger.error(f'Failed to find table for {event_type} on {date} after {retry_count} attempts')
+                self.failed_days.add((event_type, date))
+                self.finish_page(event_type, date, reverse, offset)
                 return
 
-        # 테이블 헤더 추출
-        headers = table.xpath(config['headers'])
-        header_texts = [header.xpath('.//text()').get().strip() for header in headers if header.xpath('.//text()').get()]
+        # 행 튜플을 스키마 순서로 맞추면서 숫자/날짜 타입 변환 (헤더 매핑은 페이지당 한 번)
+        coerce, unknown = EVENT_SCHEMAS[event_type].row_coercer(page.headers)
+        for header in unknown:
+            if (event_type, header) not in self.unknown_headers:
+                self.unknown_headers.add((event_type, header))
+                self.logger.warning(f'Column not in {event_type} schema, dropped: {header}')
+        crawl_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        items = [YFCalendarEventItem(event_type, date, crawl_date, coerce(row)) for row in page.rows]
+        if self.metrics:
+            # 파이프라인 처리 시간이 섞이지 않도록 항목을 내보내기 전까지만 측정
+            self.metrics.observe('parse_seconds', time.perf_counter() - started, event_type=event_type)
+            self.metrics.observe('items_per_page', len(items), event_type=event_type)
 
-        # 데이터 행 추출
-        rows = table.xpath(config['rows'])
-        
-        for row in rows:
-            item = YFCalendarEventItem()
-            item['event_type'] = event_type
-            item['date'] = date
-            item['crawl_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # 각 열의 데이터 추출
-            cells = row.xpath('.//td')
-            for idx, cell in enumerate(cells):
-                try:
-                    # 헤더가 있는 경우에만 처리
-                    if idx < len(header_texts):
-                        header = header_texts[idx]
-                        # economic 이벤트의 Event 칼럼 특별 처리
-                        if event_type == 'economic' and header == 'Event':
-                            value = cell.xpath('.//text()').get()
-                        # Symbol과 Company Name은 특별 처리
-                        elif idx == 0:  # Symbol
-                            value = cell.xpath('.//a/text()').get()
-                        elif idx == 1:  # Company Name
-                            value = cell.xpath('.//text()').get()
-                        else:
-                            value = cell.xpath('.//text()').get()
-                        
-                        # 값이 있는 경우에만 저장
-                        if value:
-                            item[header] = value.strip()
-                except Exception as e:
-                    self.logger.error(f'Error processing cell at index {idx}: {str(e)}')
-                    continue
+        # 수집 이력 기록 (역순 페이지는 정방향 offset 과 겹치지 않도록 음수로 기록)
+        # 지난 수집과 내용이 같은 페이지는 이미 저장되어 있으므로 다시 내보내지 않음 (--full-refresh 제외)
+        changed = True
+        if self.crawl_state:
+            changed = self.crawl_state.record_page(event_type, date, -1 - offset if reverse else offset, page.rows)
+        if changed or self.full_refresh:
+            self.changed_days.add((event_type, date))
+            yield from items
+
+        # 첫 페이지에서 나머지 페이지를 모두 예약
+        if offset == 0 and not reverse:
+            yield from self.fan_out(event_type, date, total_results, len(page.rows))
+
+        self.finish_page(event_type, date, reverse, offset)
+
+    def fan_out(self, event_type, date, total_results, first_rows):
+        """전체 건수로 남은 offset 페이지를 계산해 한 번에 요청"""
+        if not first_rows or total_results <= first_rows:
+            return
+
+        # 요청한 크기보다 적게 왔으면 사이트가 허용하는 최대 크기로 보고 이후 요청에 사용
+        requested = self.page_size_for(event_type)
+        if first_rows < requested:
+            self.accepted_page_sizes[event_type] = first_rows
+            self.logger.info(f'Page size {requested} not accepted for {event_type}, using {first_rows}')
+        size = first_rows
+
+        max_offset = self.max_offsets.get(event_type)
+        forward_end = total_results if max_offset is None else min(total_results, int(max_offset) + size)
+        pages = [(False, offset) for offset in range(size, forward_end, size)]
+
+        # offset 상한을 넘는 날짜: 정렬을 뒤집어 끝에서부터 남은 행을 받음
+        reverse_end = 0
+        remaining = total_results - forward_end
+        if remaining > 0:
+            if event_type in self.split_sort_fields:
+                reverse_end = min(remaining, forward_end)
+                pages += [(True, offset) for offset in range(0, reverse_end, size)]
+                remaining -= reverse_end
+            if remaining > 0:
+                self.logger.warning(
+                    f'{remaining} of {total_results} {event_type} results on {date} are beyond the offset limit'
+                )
 
-            yield item
-
-        # 다음 페이지 처리
-        next_button = response.xpath(config['next_button'])
-        if next_button and total_results > 100:
-            current_url = response.url
-            next_offset = 100  # 기본값 설정
-            
-            if 'offset=' in current_url:
-                current_offset = int(re.search(r'offset=(\d+)', current_url).group(1))
-                next_offset = current_offset + 100
-                next_url = re.sub(r'offset=\d+', f'offset={next_offset}', current_url)
+        self.logger.info(f'Scheduling {len(pages)} more pages for {event_type} on {date}')
+        self.pending_pages.setdefault((event_type, date), set()).update(pages)
+        for reverse, offset in pages:
+            # 역순 마지막 페이지는 정방향에서 받은 행과 겹치지 않도록 남은 행 수만 요청
+            page_size = min(size, reverse_end - offset) if reverse else size
+            yield self.page_request(event_type, date, offset, page_size, reverse)
+
+    def finish_page(self, event_type, date, reverse, offset):
+        """페이지 처리 완료, 날짜의 모든 페이지가 끝났으면 수집 완료 기록"""
+        day = (event_type, date)
+        pending = self.pending_pages.get(day)
+        if pending is None:
+            return
+        pending.discard((reverse, offset))
+        self.day_pages[day] = self.day_pages.get(day, 0) + 1
+        if not pending:
+            del self.pending_pages[day]
+            pages = self.day_pages.pop(day)
+            if day in self.failed_days:
+                self.logger.warning(f'Not marking {event_type} on {date} complete: some pages failed')
             else:
-                next_url = f"{current_url}&offset={next_offset}"
-            
-            # earnings의 경우 offset이 1000을 넘어가면 중단
-            if event_type == 'earnings' and next_offset > 1000:
-                self.logger.warning(f'Reached maximum offset for earnings on {date}')
-                return
-                
-            self.logger.info(f'Moving to next page with offset {next_offset} for {event_type} on {date}')
-            yield scrapy.Request(
-                url=next_url,
-                callback=self.parse,
-                meta={
-                    'event_type': event_type,
-                    'date': date,
-                    'retry_count': 0  # 새로운 페이지 요청시 재시도 카운트 초기화
-                },
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5',
-                    'Connection': 'keep-alive',
-                }
-            ) 
\ No newline at end of file
+                self.complete_day(event_type, date, pages)
+
+    def extract_page(self, response, event_type):
+        # 내장 JSON 을 사용하도록 설정된 이벤트 타입은 먼저 시도하고, 없으면 XPath 파서로 대체
+        root = response.selector.root
+        if self.extraction_backends.get(event_type) == 'embedded':
+            page = self.embedded_parser.parse(root, event_type)
+            if page is not None:
+                return page
+            self.logger.debug(f'Embedded data not found for {event_type}, falling back to table parsing')
+        return self.table_parser.parse(root, event_type)
+
+    def complete_day(self, event_type, date, pages):
+        # 모든 페이지가 수집된 날짜를 이력에 기록
+        if self.crawl_state:
+            self.crawl_state.complete_day(event_type, date, pages)
+            if (event_type, date) not in self.changed_days:
+                self.logger.info(f'{event_type} on {date} unchanged since last crawl')
+            self.changed_days.discard((event_type, date))
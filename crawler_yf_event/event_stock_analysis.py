@@ -1,25 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import argparse
 import pandas as pd
-import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import os
-import glob
-from datetime import datetime, timedelta
+from crawler_yf_event.event_study import build_price_matrix, event_window_metrics, event_window_series
+from crawler_yf_event.price_store import default_price_store
+from crawler_yf_event.event_index import EventIndex
+from crawler_yf_event.event_store import read_analysis_table
+from crawler_yf_event.schema import coerce_frame
+from crawler_yf_event.report import HtmlReport, downsample_series
 
 def load_market_cap_data():
     """시가총액 데이터 로드"""
     return pd.read_csv('db/market_caps.csv')
 
 def load_stock_price_data(ticker):
-    """주가 데이터 로드"""
-    file_path = f'db/stock_prices_{ticker}.csv'
-    if os.path.exists(file_path):
-        return pd.read_csv(file_path, index_col=0, parse_dates=True)
-    return None
+    """주가 데이터 로드 (한 번 읽은 종목은 공용 저장소에서 재사용)"""
+    return default_price_store().get(ticker)
 
 def create_market_cap_chart(market_cap_df):
     """시가총액 차트 생성"""
@@ -40,70 +38,70 @@ def create_market_cap_chart(market_cap_df):
     )
     return fig
 
+# Earnings 시트 컬럼 -> 이벤트 상세 정보 키
+EVENT_DETAIL_COLUMNS = {
+    'Company': 'company_name',
+    'Event Name': 'event_name',
+    'Earnings Call Time': 'call_time',
+    'EPS Estimate': 'eps_estimate',
+    'Reported EPS': 'reported_eps',
+    'Surprise (%)': 'surprise',
+}
+
+def format_number(value, fmt='{:.2f}'):
+    """숫자 표시 (값이 없으면 '-')"""
+    if pd.isna(value):
+        return '-'
+    return fmt.format(value)
+
 def load_event_dates():
-    """이벤트 날짜 정보 로드"""
+    """이벤트 날짜 정보 로드 (종목별 여러 이벤트를 모두 보관하는 EventIndex 반환)"""
     try:
-        # Excel 파일에서 Earnings 시트 로드
-        df = pd.read_excel('event_analysis.xlsx', sheet_name='Earnings')
+        # analyze_events 가 남긴 Earnings 테이블 로드 (Feather, 없으면 이전 형식의 Excel)
+        columns = ['Symbol', 'date'] + list(EVENT_DETAIL_COLUMNS)
+        df = read_analysis_table('earnings', columns=columns)
+        if df is None:
+            df = coerce_frame(pd.read_excel('event_analysis.xlsx', sheet_name='Earnings'), 'earnings')
         
         # 날짜 컬럼을 datetime으로 변환
         df['date'] = pd.to_datetime(df['date'])
         
-        # 필요한 컬럼만 선택
-        event_info = df[['Symbol', 'date', 'Company', 'Event Name', 'Earnings Call Time', 'EPS Estimate', 'Reported EPS', 'Surprise (%)']]
-        
-        # 날짜 정보를 딕셔너리로 변환
-        event_dates = dict(zip(event_info['Symbol'], event_info['date']))
-        
-        # 이벤트 상세 정보를 딕셔너리로 변환
-        event_details = {}
-        for _, row in event_info.iterrows():
-            event_details[row['Symbol']] = {
-                'date': row['date'],
-                'company_name': row['Company'],
-                'event_name': row['Event Name'],
-                'call_time': row['Earnings Call Time'],
-                'eps_estimate': row['EPS Estimate'],
-                'reported_eps': row['Reported EPS'],
-                'surprise': row['Surprise (%)']
-            }
+        # 필요한 컬럼만 선택해 상세 정보 키로 이름 변경
+        event_info = df[['Symbol', 'date'] + list(EVENT_DETAIL_COLUMNS)].rename(columns=EVENT_DETAIL_COLUMNS)
+        events = EventIndex(event_info)
         
-        print(f"총 {len(event_dates)}개의 이벤트 날짜 정보 로드됨")
-        return event_dates, event_details
+        print(f"총 {len(events)}개의 이벤트 날짜 정보 로드됨 ({len(events.unique_tickers)}개 티커)")
+        return events
     except Exception as e:
         print(f"이벤트 날짜 정보 로드 중 오류 발생: {e}")
-        return {}, {}
+        return EventIndex(pd.DataFrame({'Symbol': [], 'date': []}))
 
-def create_event_performance_chart(market_cap_df, event_dates, event_details):
-    """이벤트 성과 차트 생성 (이전 3개월 + 이후)"""
+def load_event_price_matrix(tickers, events):
+    """이벤트가 있는 티커의 주가를 한 번만 읽어 (날짜 x 종목) 행렬로 정렬"""
+    price_frames = {}
+    for ticker in tickers:
+        if ticker in events:
+            price_frames[ticker] = load_stock_price_data(ticker)
+    return build_price_matrix(price_frames)
+
+def create_event_performance_chart(market_cap_df, events, matrix=None, max_points=100):
+    """이벤트 성과 차트 생성 (이전 3개월 + 이후, 이벤트별 최대 max_points 개 점)"""
     fig = go.Figure()
     
     # 상위 10개 티커만 선택
     top_tickers = market_cap_df.nlargest(10, 'Market_Cap')['Symbol'].tolist()
+    if matrix is None:
+        matrix = load_event_price_matrix(top_tickers, events)
     
-    for ticker in top_tickers:
-        if ticker not in event_dates:
-            continue
-            
-        price_df = load_stock_price_data(ticker)
-        if price_df is None:
+    # 티커별 모든 이벤트를 각각 표시
+    for event_info in events.events_for_tickers(top_tickers).to_dict('records'):
+        ticker = event_info['Symbol']
+        
+        # 이벤트 날짜 기준으로 정규화한 이전 3개월 ~ 이후 1개월 구간
+        event_date = event_info['date']
+        analysis_data = event_window_series(matrix, ticker, event_date)
+        if analysis_data is None:
             continue
-            
-        event_date = event_dates[ticker]
-        if event_date not in price_df.index:
-            continue
-            
-        # 이벤트 날짜 기준으로 정규화
-        event_price = price_df.loc[event_date, 'Close']
-        normalized_prices = price_df['Close'] / event_price - 1
-        
-        # 이벤트 이전 3개월부터 이후 1개월까지 선택
-        pre_event_date = event_date - pd.DateOffset(months=3)
-        post_event_date = event_date + pd.DateOffset(months=1)
-        analysis_data = normalized_prices[
-            (price_df.index >= pre_event_date) & 
-            (price_df.index <= post_event_date)
-        ]
         
         # 이벤트 시점 표시를 위한 수직선 추가
         fig.add_shape(
@@ -118,11 +116,10 @@ def create_event_performance_chart(market_cap_df, event_dates, event_details):
         )
         
         # 이벤트 정보 텍스트 박스 추가
-        event_info = event_details[ticker]
         info_text = f"{event_info['company_name']}<br>"
         info_text += f"Event: {event_info['event_name']}<br>"
-        info_text += f"EPS: {event_info['reported_eps']} (Est: {event_info['eps_estimate']})<br>"
-        info_text += f"Surprise: {event_info['surprise']}%"
+        info_text += f"EPS: {format_number(event_info['reported_eps'])} (Est: {format_number(event_info['eps_estimate'])})<br>"
+        info_text += f"Surprise: {format_number(event_info['surprise'], '{:+.2f}%')}"
         
         fig.add_annotation(
             x=event_date,
@@ -136,9 +133,11 @@ def create_event_performance_chart(market_cap_df, event_dates, event_details):
             borderwidth=1
         )
         
+        # 긴 구간은 급등락과 이벤트 날짜를 유지하면서 점 수를 줄임
+        points = downsample_series(analysis_data, max_points, keep=[event_date])
         fig.add_trace(go.Scatter(
-            x=analysis_data.index,
-            y=analysis_data.values,
+            x=points.index,
+            y=points.values,
             name=f"{ticker} ({event_date.strftime('%Y-%m-%d')})",
             mode='lines+markers'
         ))
@@ -159,73 +158,40 @@ def create_event_performance_chart(market_cap_df, event_dates, event_details):
     
     return fig
 
-def create_event_summary_table(market_cap_df, event_dates, event_details):
+def create_event_summary_table(market_cap_df, events, matrix=None):
     """이벤트 성과 요약 테이블 생성"""
     summary_data = []
     
     # 상위 20개 티커만 선택
-    top_tickers = market_cap_df.nlargest(20, 'Market_Cap')['Symbol'].tolist()
+    top_caps = market_cap_df.nlargest(20, 'Market_Cap')
+    top_tickers = top_caps['Symbol'].tolist()
+    market_caps = dict(zip(top_caps['Symbol'], top_caps['Market_Cap']))
+    if matrix is None:
+        matrix = load_event_price_matrix(top_tickers, events)
     
-    for ticker in top_tickers:
-        if ticker not in event_dates:
-            continue
-            
-        market_cap = market_cap_df[market_cap_df['Symbol'] == ticker]['Market_Cap'].iloc[0]
-        price_df = load_stock_price_data(ticker)
-        if price_df is None:
-            continue
-            
-        event_date = event_dates[ticker]
-        if event_date not in price_df.index:
-            continue
-            
-        # 이벤트 날짜 기준으로 정규화
-        event_price = price_df.loc[event_date, 'Close']
-        normalized_prices = price_df['Close'] / event_price - 1
-        
-        # 이벤트 이전 3개월부터 이후 1개월까지 선택
-        pre_event_date = event_date - pd.DateOffset(months=3)
-        post_event_date = event_date + pd.DateOffset(months=1)
-        analysis_data = normalized_prices[
-            (price_df.index >= pre_event_date) & 
-            (price_df.index <= post_event_date)
-        ]
-        
-        # 성과 지표 계산
-        pre_event_return = normalized_prices[pre_event_date:event_date].iloc[-1]
-        post_event_return = normalized_prices[event_date:post_event_date].iloc[-1]
-        total_return = normalized_prices[pre_event_date:post_event_date].iloc[-1]
-        
-        # 변동성 계산 (이벤트 이후 1개월)
-        post_event_volatility = normalized_prices[event_date:post_event_date].std() * np.sqrt(252)
-        
-        # 최대 낙폭 계산 (이벤트 이후 1개월)
-        post_event_data = normalized_prices[event_date:post_event_date]
-        max_drawdown = (post_event_data.cummax() - post_event_data) / post_event_data.cummax()
-        max_drawdown = max_drawdown.max()
-        
-        # 거래량 변화
-        pre_event_volume = price_df[pre_event_date:event_date].Volume.mean()
-        post_event_volume = price_df[event_date:post_event_date].Volume.mean()
-        volume_change = (post_event_volume / pre_event_volume - 1)
-        
-        # 이벤트 정보
-        event_info = event_details[ticker]
+    # 티커별 모든 이벤트의 성과 지표를 한 번에 계산
+    event_rows = events.events_for_tickers(top_tickers).reset_index(drop=True)
+    metrics = event_window_metrics(matrix, event_rows)
+    valid = metrics['valid'].to_numpy()
+    
+    for row, event_info in zip(metrics[valid].itertuples(index=False), event_rows[valid].to_dict('records')):
+        ticker = row.Symbol
+        market_cap = market_caps[ticker]
         
         summary_data.append({
             'Ticker': ticker,
             'Company': event_info['company_name'],
             'Event': event_info['event_name'],
-            'Event Date': event_date.strftime('%Y-%m-%d'),
+            'Event Date': row.date.strftime('%Y-%m-%d'),
             'Market Cap': f"${market_cap:,.0f}",
-            'EPS': f"{event_info['reported_eps']} (Est: {event_info['eps_estimate']})",
-            'Surprise': f"{event_info['surprise']}%",
-            'Pre-Event Return': f"{pre_event_return:.2%}",
-            'Post-Event Return': f"{post_event_return:.2%}",
-            'Total Return': f"{total_return:.2%}",
-            'Post-Event Vol': f"{post_event_volatility:.2%}",
-            'Max Drawdown': f"{max_drawdown:.2%}",
-            'Volume Change': f"{volume_change:.2%}"
+            'EPS': f"{format_number(event_info['reported_eps'])} (Est: {format_number(event_info['eps_estimate'])})",
+            'Surprise': format_number(event_info['surprise'], '{:+.2f}%'),
+            'Pre-Event Return': f"{row.pre_event_return:.2%}",
+            'Post-Event Return': f"{row.post_event_return:.2%}",
+            'Total Return': f"{row.total_return:.2%}",
+            'Post-Event Vol': f"{row.post_event_volatility:.2%}",
+            'Max Drawdown': f"{row.max_drawdown:.2%}",
+            'Volume Change': f"{row.volume_change:.2%}"
         })
     
     return pd.DataFrame(summary_data)
@@ -233,37 +199,48 @@ def create_event_summary_table(market_cap_df, event_dates, event_details):
 def main():
     # 데이터 로드
     market_cap_df = load_market_cap_data()
-    event_dates, event_details = load_event_dates()
+    events = load_event_dates()
     
-    if not event_dates:
+    if not len(events):
         print("이벤트 날짜 정보를 찾을 수 없습니다.")
         return
     
+    # 상위 티커 주가를 한 번만 읽어 차트와 요약 테이블에서 함께 사용
+    top_tickers = market_cap_df.nlargest(20, 'Market_Cap')['Symbol'].tolist()
+    matrix = load_event_price_matrix(top_tickers, events)
+    
     # 차트 생성
     market_cap_fig = create_market_cap_chart(market_cap_df)
-    performance_fig = create_event_performance_chart(market_cap_df, event_dates, event_details)
-    summary_df = create_event_summary_table(market_cap_df, event_dates, event_details)
+    performance_fig = create_event_performance_chart(market_cap_df, events, matrix)
+    summary_df = create_event_summary_table(market_cap_df, events, matrix)
     
-    # HTML 파일로 저장
-    with open('event_stock_analysis.html', 'w', encoding='utf-8') as f:
-        f.write('<html><head><title>Event Stock Analysis</title></head><body>')
-        f.write('<h1>Event Stock Analysis</h1>')
-        
-        # 시가총액 차트
-        f.write('<h2>Market Cap Top Tickers</h2>')
-        f.write(market_cap_fig.to_html(full_html=False))
-        
-        # 이벤트 성과 차트
-        f.write('<h2>Event Stock Performance (3M Before + 1M After)</h2>')
-        f.write(performance_fig.to_html(full_html=False))
-        
-        # 요약 테이블
-        f.write('<h2>Event Performance Summary</h2>')
-        f.write(summary_df.to_html())
-        
-        f.write('</body></html>')
+    # HTML 파일로 저장 (plotly.js 는 리포트에서 한 번만 포함/참조)
+    report = HtmlReport('Event Stock Analysis')
+    
+    # 시가총액 차트
+    report.heading('Market Cap Top Tickers')
+    report.figure(market_cap_fig)
+    
+    # 이벤트 성과 차트
+    report.heading('Event Stock Performance (3M Before + 1M After)')
+    report.figure(performance_fig)
     
+    # 요약 테이블
+    report.heading('Event Performance Summary')
+    report.table(summary_df)
+    
+    report.write('event_stock_analysis.html')
+    
+    stats = default_price_store().stats()
+    print(f"주가 캐시: hit {stats['hits']}, miss {stats['misses']}, 제거 {stats['evictions']}, "
+          f"{stats['bytes'] / 1024 / 1024:.1f}MB")
     print("분석 결과가 'event_stock_analysis.html' 파일로 저장되었습니다.")
 
+def cli(argv=None):
+    """커맨드 라인 실행 (cli.py report 에서도 사용)"""
+    parser = argparse.ArgumentParser(description='이벤트 전후 주가 성과 분석 리포트')
+    parser.parse_args(argv)
+    main()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    cli() 
\ No newline at end of file
@@ -1,14 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import argparse
+import multiprocessing
 import os
-import sys
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from scrapy.crawler import CrawlerProcess
-from scrapy.utils.project import get_project_settings
-from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+from crawler_yf_event.sharding import plan_shards, merge_shard_outputs
 
-def run_crawler(start_date=None, end_date=None, events=None, days=20):
+def run_crawler(start_date=None, end_date=None, events=None, days=20, output_mode=None,
+                incremental=False, full_refresh=False, base_url=None, record_dir=None,
+                replay_dir=None, no_cache=False, engine='scrapy', metrics_dir=None, settings_overrides=None):
     """
     Yahoo Finance 이벤트 크롤러를 실행하는 함수
     
@@ -17,12 +21,42 @@ def run_crawler(start_date=None, end_date=None, events=None, days=20):
         end_date (str, optional): 종료 날짜 (YYYY-MM-DD 형식)
         events (list, optional): 수집할 이벤트 타입 리스트
         days (int, optional): 현재 날짜 기준 전후 수집할 일수
+        output_mode (str, optional): 저장 방식 ('json', 'jsonl', 'parquet')
+        incremental (bool, optional): 수집 이력을 사용해 새로 생겼거나 오래된 날짜만 수집
+        full_refresh (bool, optional): 수집 이력과 관계없이 전체 재수집 (이력은 갱신)
+        base_url (str, optional): 캘린더 기본 URL (로컬 대체 서버 테스트용)
+        record_dir (str, optional): 응답을 기록할 디렉토리
+        replay_dir (str, optional): 기록된 응답만으로 크롤링할 디렉토리 (네트워크 미사용)
+        no_cache (bool, optional): 응답 캐시를 사용하지 않고 모든 페이지를 새로 요청
+        engine (str, optional): 'scrapy' 또는 'async' (Scrapy/Twisted 없이 asyncio + httpx 로 수집)
+        metrics_dir (str, optional): 단계별 지표(crawl_metrics.json/.prom)를 저장할 디렉토리
+        settings_overrides (dict, optional): 추가로 덮어쓸 Scrapy 설정 (샤드별 출력 경로 등)
     """
+    # Scrapy 는 실제로 크롤링할 때만 불러옴 (인자 확인/--help 는 가볍게)
+    from scrapy.utils.project import get_project_settings
+    
     # 프로젝트 설정 가져오기
     settings = get_project_settings()
-    
-    # 크롤러 프로세스 생성
-    process = CrawlerProcess(settings)
+    if output_mode:
+        settings.set('EVENT_OUTPUT_MODE', output_mode)
+    if record_dir:
+        settings.set('HTTP_REPLAY_MODE', 'record')
+        settings.set('HTTP_REPLAY_DIR', record_dir)
+    elif replay_dir:
+        # 재생 모드에서는 요청 간 지연과 동시성 조정이 필요 없음
+        settings.set('HTTP_REPLAY_MODE', 'replay')
+        settings.set('HTTP_REPLAY_DIR', replay_dir)
+        settings.set('DOWNLOAD_DELAY', 0)
+        settings.set('CONCURRENT_REQUESTS_PER_DOMAIN', 16)
+        settings.set('ADAPTIVE_CONCURRENCY_ENABLED', False)
+    # 캘린더 응답 캐시 (작업 디렉토리의 YF_RESPONSE_CACHE_DIR 에 저장)
+    settings.set('YF_RESPONSE_CACHE_ENABLED', not no_cache)
+    if metrics_dir:
+        settings.set('CRAWL_METRICS_ENABLED', True)
+        settings.set('CRAWL_METRICS_JSON_FILE', os.path.join(metrics_dir, 'crawl_metrics.json'))
+        settings.set('CRAWL_METRICS_PROMETHEUS_FILE', os.path.join(metrics_dir, 'crawl_metrics.prom'))
+    for name, value in (settings_overrides or {}).items():
+        settings.set(name, value)
     
     # 날짜 설정
     today = datetime.now()
@@ -35,33 +69,216 @@ def run_crawler(start_date=None, end_date=None, events=None, days=20):
     if not events:
         events = ['earnings', 'economic', 'ipo', 'splits']
     
+    if engine == 'async':
+        # asyncio 수집기: 같은 스파이더 요청/파싱과 파이프라인 사용
+        import logging
+        from crawler_yf_event.async_crawler import run_async_crawl
+        logging.basicConfig(
+            level=settings.get('LOG_LEVEL', 'INFO'),
+            format='%(asctime)s [%(name)s] %(levelname)s: %(message)s',
+            filename=settings.get('LOG_FILE'),
+        )
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+        run_async_crawl(
+            settings,
+            start_date=start_date,
+            end_date=end_date,
+            events=','.join(events),
+            incremental=incremental,
+            full_refresh=full_refresh,
+            base_url=base_url
+        )
+        return
+    
+    # 크롤러 프로세스 생성
+    from scrapy.crawler import CrawlerProcess
+    from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+    process = CrawlerProcess(settings)
+    
     # 크롤러 실행
     process.crawl(
         YFCalendarSpider,
         start_date=start_date,
         end_date=end_date,
-        events=','.join(events)
+        events=','.join(events),
+        incremental=incremental,
+        full_refresh=full_refresh,
+        base_url=base_url
     )
     process.start()
 
-if __name__ == "__main__":
+SHARD_STATE_FILE = 'crawl_state.sqlite3'
+
+def _run_shard(shard_dir, start_date, end_date, events, options, state_path=None):
+    """샤드 하나를 별도 프로세스에서 실행 (결과는 shard_dir 의 JSON Lines 파티션)
+
+    수집 이력은 SQLite 파일 하나에 여러 프로세스가 쓰면 잠금 오류가 나므로
+    기존 이력(state_path)을 샤드 디렉토리로 복사해 사용하고, 병합은 부모 프로세스가 한다.
+    """
+    overrides = {
+        'EVENT_OUTPUT_MODE': 'jsonl',
+        'EVENT_OUTPUT_DIR': shard_dir,
+        'LOG_FILE': os.path.join(shard_dir, 'crawl.log'),
+        'CRAWL_METRICS_JSON_FILE': os.path.join(shard_dir, 'crawl_metrics.json'),
+        'CRAWL_METRICS_PROMETHEUS_FILE': os.path.join(shard_dir, 'crawl_metrics.prom'),
+        'CRAWL_STATE_PATH': os.path.join(shard_dir, SHARD_STATE_FILE),
+    }
+    os.makedirs(shard_dir, exist_ok=True)
+    if state_path and os.path.exists(state_path):
+        shutil.copyfile(state_path, overrides['CRAWL_STATE_PATH'])
+    run_crawler(start_date=start_date, end_date=end_date, events=events,
+                settings_overrides=overrides, **options)
+    return shard_dir
+
+def run_sharded(shards, start_date=None, end_date=None, events=None, days=20, output_mode=None,
+                by_event=False, shard_root='shards', keep_shards=False, **options):
+    """
+    기간(과 이벤트 타입)을 나눠 여러 프로세스에서 크롤링한 뒤 결과를 병합
+    
+    각 샤드는 자체 Scrapy 프로세스와 출력 디렉토리(shard_root/<run>/shard-NNN)를 사용하고,
+    모두 끝나면 중복을 제거해 output_mode 저장소로 합친다.
+    Twisted reactor 는 프로세스당 한 번만 시작할 수 있으므로 샤드마다 새 프로세스를 사용한다.
+    요청 간격/동시성 제한은 샤드마다 따로 적용되므로 실제 요청 속도는 샤드 수만큼 늘어난다.
+    
+    Args:
+        shards (int): 동시에 실행할 워커 프로세스 수
+        by_event (bool, optional): 이벤트 타입별로도 샤드를 나눔
+        shard_root (str, optional): 샤드 출력 디렉토리 상위 경로
+        keep_shards (bool, optional): 병합 후 샤드 출력 유지
+        나머지 인자는 run_crawler 와 동일
+    """
+    from scrapy.utils.project import get_project_settings
+    
+    settings = get_project_settings()
+    output_mode = output_mode or settings.get('EVENT_OUTPUT_MODE', 'json')
+    
+    today = datetime.now()
+    if not start_date:
+        start_date = (today - timedelta(days=days)).strftime('%Y-%m-%d')
+    if not end_date:
+        end_date = (today + timedelta(days=days)).strftime('%Y-%m-%d')
+    if not events:
+        events = ['earnings', 'economic', 'ipo', 'splits']
+    
+    plan = plan_shards(start_date, end_date, events, shards, by_event)
+    run_dir = os.path.join(shard_root, today.strftime('%Y%m%d-%H%M%S'))
+    print(f"{len(plan)}개 샤드를 {shards}개 프로세스로 실행합니다 ({run_dir})")
+    
+    # 수집 이력을 사용하는 경우 샤드별 이력 파일로 실행하고 끝난 뒤 합침
+    state_path = None
+    if options.get('incremental') or settings.getbool('CRAWL_STATE_ENABLED'):
+        state_path = settings.get('CRAWL_STATE_PATH', 'crawl_state.sqlite3')
+    
+    started = time.time()
+    shard_dirs = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=shards, mp_context=context, max_tasks_per_child=1) as executor:
+        futures = {
+            executor.submit(_run_shard, os.path.join(run_dir, f'shard-{i:03d}'),
+                            shard_start, shard_end, shard_events, options, state_path): (shard_start, shard_end, shard_events)
+            for i, (shard_start, shard_end, shard_events) in enumerate(plan)
+        }
+        for future in as_completed(futures):
+            shard_start, shard_end, shard_events = futures[future]
+            try:
+                shard_dirs.append(future.result())
+                print(f"샤드 완료: {shard_start} ~ {shard_end} {','.join(shard_events)}")
+            except Exception as e:
+                print(f"샤드 실패: {shard_start} ~ {shard_end} {','.join(shard_events)} ({e})")
+    
+    # 샤드 결과 병합
+    saved, duplicates = merge_shard_outputs(
+        sorted(shard_dirs),
+        output_mode=output_mode,
+        output_file=settings.get('EVENT_OUTPUT_FILE', 'yf_calendar_events.json'),
+        output_dir=settings.get('EVENT_OUTPUT_DIR', 'events'),
+        parquet_dir=settings.get('EVENT_PARQUET_DIR', 'event_store'),
+        flush_batch_size=settings.getint('EVENT_FLUSH_BATCH_SIZE', 500),
+        parquet_batch_size=settings.getint('EVENT_PARQUET_BATCH_SIZE', 5000),
+    )
+    print(f"병합 완료: {saved}건 저장, 중복 {duplicates}건 제거 ({time.time() - started:.1f}초)")
+    
+    # 결과가 병합된(성공한) 샤드의 수집 이력만 합침
+    if state_path:
+        from crawler_yf_event.crawl_state import CrawlStateIndex
+        crawl_state = CrawlStateIndex(state_path)
+        try:
+            days_merged = sum(
+                crawl_state.merge(os.path.join(shard_dir, SHARD_STATE_FILE))
+                for shard_dir in shard_dirs
+                if os.path.exists(os.path.join(shard_dir, SHARD_STATE_FILE))
+            )
+        finally:
+            crawl_state.close()
+        print(f"수집 이력 병합: 완료 날짜 {days_merged}건 ({state_path})")
+    
+    if not keep_shards and len(shard_dirs) == len(plan):
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+def cli(argv=None):
+    """커맨드 라인 실행 (cli.py crawl 에서도 사용)"""
     # 커맨드 라인 인자 처리
-    import argparse
     parser = argparse.ArgumentParser(description='Yahoo Finance 이벤트 크롤러 실행')
     parser.add_argument('--start-date', type=str, help='시작 날짜 (YYYY-MM-DD)')
     parser.add_argument('--end-date', type=str, help='종료 날짜 (YYYY-MM-DD)')
     parser.add_argument('--events', type=str, help='수집할 이벤트 타입 (쉼표로 구분)')
     parser.add_argument('--days', type=int, default=7, help='현재 날짜 기준 전후 수집할 일수')
+    parser.add_argument('--incremental', action='store_true', help='이미 수집 완료된 날짜는 건너뛰는 증분 크롤링')
+    parser.add_argument('--full-refresh', action='store_true', help='수집 이력과 관계없이 전체 재수집')
+    parser.add_argument('--base-url', type=str, help='캘린더 기본 URL (예: http://localhost:8000/calendar/)')
+    parser.add_argument('--record', type=str, metavar='DIR', help='응답을 DIR 에 압축 저장')
+    parser.add_argument('--replay', type=str, metavar='DIR', help='DIR 에 저장된 응답만으로 크롤링')
+    parser.add_argument('--engine', choices=['scrapy', 'async'], default='scrapy',
+                        help='수집 엔진 (async: Scrapy 없이 asyncio + httpx 연결 풀로 수집)')
+    parser.add_argument('--no-cache', action='store_true', help='HTTP 캐시를 사용하지 않고 모든 페이지를 새로 요청')
+    parser.add_argument('--metrics', type=str, metavar='DIR',
+                        help='단계별 지표를 DIR/crawl_metrics.json, DIR/crawl_metrics.prom 으로 저장')
+    parser.add_argument('--shards', type=int, default=0, help='기간을 나눠 N개 프로세스로 병렬 크롤링 (0: 사용 안 함)')
+    parser.add_argument('--shard-by-event', action='store_true', help='샤드를 이벤트 타입별로도 분할')
+    parser.add_argument('--keep-shards', action='store_true', help='병합 후 샤드별 출력 유지')
+    parser.add_argument('--output-mode', type=str, choices=['json', 'jsonl', 'parquet'], help='저장 방식 (json: 단일 파일, jsonl: 이벤트 타입/날짜별 파티션, parquet: 컬럼형 저장소)')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # 이벤트 타입 처리
     events = args.events.split(',') if args.events else None
     
     # 크롤러 실행
-    run_crawler(
-        start_date=args.start_date,
-        end_date=args.end_date,
-        events=events,
-        days=args.days
-    ) 
\ No newline at end of file
+    if args.shards > 0:
+        run_sharded(
+            args.shards,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            events=events,
+            days=args.days,
+            output_mode=args.output_mode,
+            by_event=args.shard_by_event,
+            keep_shards=args.keep_shards,
+            incremental=args.incremental,
+            full_refresh=args.full_refresh,
+            base_url=args.base_url,
+            record_dir=args.record,
+            replay_dir=args.replay,
+            no_cache=args.no_cache,
+            engine=args.engine,
+            metrics_dir=args.metrics
+        )
+    else:
+        run_crawler(
+            start_date=args.start_date,
+            end_date=args.end_date,
+            events=events,
+            days=args.days,
+            output_mode=args.output_mode,
+            incremental=args.incremental,
+            full_refresh=args.full_refresh,
+            base_url=args.base_url,
+            record_dir=args.record,
+            replay_dir=args.replay,
+            no_cache=args.no_cache,
+            engine=args.engine,
+            metrics_dir=args.metrics
+        ) 
+
+if __name__ == "__main__":
+    cli()
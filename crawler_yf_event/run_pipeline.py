@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# 크롤링 -> 수집 -> 분석 -> 리포트 파이프라인 실행
+#
+#   crawl        (--crawl 을 준 경우만) 이벤트 캘린더 크롤링 -> 이벤트 저장소
+#   market_caps  이벤트 저장소 -> db/market_caps.csv
+#   prices       db/market_caps.csv -> db/stock_prices_*.csv
+#   analyze      이벤트 저장소 -> event_analysis/*.feather, event_analysis.html (+ plotly-*.min.js)
+#   report       db/, event_analysis/earnings.feather -> event_stock_analysis.html, plotly-*.min.js
+#
+# 입력 내용과 옵션이 지난 실행과 같은 단계는 건너뛰고, market_caps/prices 와 analyze 처럼
+# 서로 의존하지 않는 단계는 별도 프로세스에서 동시에 실행한다. 단계별 소요 시간은
+# pipeline_timings.jsonl 에 실행마다 한 줄씩 기록된다.
+
+import argparse
+import time
+from datetime import datetime
+from crawler_yf_event.dag import Stage, DagRunner
+from crawler_yf_event.event_store import (
+    DEFAULT_ANALYSIS_DIR, DEFAULT_EVENT_DIR, DEFAULT_EVENT_FILE, DEFAULT_PARQUET_DIR, analysis_table_path,
+)
+
+# default_event_source() 가 고르는 후보 전체 (어느 저장 방식이든 바뀌면 다시 실행)
+EVENT_SOURCES = [DEFAULT_PARQUET_DIR, DEFAULT_EVENT_DIR, DEFAULT_EVENT_FILE]
+
+# 'directory' 모드 리포트가 같은 디렉토리에 저장하는 plotly.js (report.PLOTLYJS_FILE, numpy 를 불러오지 않도록 패턴만 둠)
+PLOTLYJS_OUTPUT = 'plotly-*.min.js'
+
+def plotly_version():
+    """설치된 plotly 패키지 버전 (plotly 를 불러오지 않고 확인, 없으면 None)"""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version('plotly')
+    except PackageNotFoundError:
+        return None
+
+# 단계 함수는 자식 프로세스에서 실행되므로, 각 스크립트는 함수 안에서 불러온다
+
+def crawl_stage(**options):
+    from run_crawler import run_crawler
+    run_crawler(**options)
+
+def market_caps_stage(as_of=None):
+    # as_of 는 단계 키에만 사용 (시가총액/S&P500 종목 캐시의 TTL 이 하루이므로 날짜가 바뀌면 다시 실행)
+    from collect_stock_data import create_db_directory, load_event_data, collect_market_cap_data
+    from crawler_yf_event.event_store import default_event_source
+
+    create_db_directory()
+    df = load_event_data(default_event_source())
+    if collect_market_cap_data(df, n=10) is None:
+        raise RuntimeError('시가총액 데이터 수집 실패')
+
+def prices_stage(price_source=None, end_date=None):
+    # end_date 는 단계 키에만 사용 (최근 1년 구간이 날짜가 바뀌면 달라지므로 하루 한 번 다시 실행)
+    from collect_stock_data import collect_stock_price_data
+    from crawler_yf_event.price_cache import LocalCsvProvider
+
+    provider = LocalCsvProvider(price_source) if price_source else None
+    if collect_stock_price_data(provider) is None:
+        raise RuntimeError('주가 데이터 수집 실패')
+
+def analyze_stage(output_dir=DEFAULT_ANALYSIS_DIR, excel=False, plotlyjs='directory', plotly_version=None):
+    # plotly_version 은 단계 키에만 사용 (업그레이드하면 새 버전의 plotly.js 파일을 쓰도록 다시 실행)
+    import analyze_events
+    analyze_events.main(output_dir=output_dir, excel=excel, plotlyjs=plotlyjs)
+
+def report_stage(plotly_version=None):
+    import event_stock_analysis
+    event_stock_analysis.main()
+
+def build_stages(crawl_options=None, price_source=None, excel=False, plotlyjs='directory'):
+    """파이프라인 단계 목록 (crawl_options 가 없으면 기존 이벤트 저장소에서 시작)"""
+    stages = []
+    if crawl_options is not None:
+        # 외부 사이트를 읽으므로 입력 해시로 건너뛸 수 없음 (HTTP 캐시/증분 크롤링이 중복 요청을 줄임)
+        stages.append(Stage('crawl', crawl_stage, outputs=EVENT_SOURCES, params=crawl_options, always=True))
+
+    analysis_outputs = [DEFAULT_ANALYSIS_DIR, 'event_analysis.html']
+    if excel:
+        analysis_outputs.append('event_analysis.xlsx')
+    if plotlyjs == 'directory':
+        analysis_outputs.append(PLOTLYJS_OUTPUT)
+    version = plotly_version()
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    stages += [
+        Stage('market_caps', market_caps_stage,
+              inputs=EVENT_SOURCES,
+              outputs=['db/market_caps.csv'],
+              params={'as_of': today}),
+        Stage('prices', prices_stage,
+              inputs=['db/market_caps.csv'] + ([price_source] if price_source else []),
+              outputs=['db/stock_prices_*.csv'],
+              params={'price_source': price_source, 'end_date': today}),
+        Stage('analyze', analyze_stage,
+              inputs=EVENT_SOURCES,
+              outputs=analysis_outputs,
+              params={'output_dir': DEFAULT_ANALYSIS_DIR, 'excel': excel, 'plotlyjs': plotlyjs,
+                      'plotly_version': version}),
+        # event_stock_analysis.py 는 항상 'directory' 모드로 plotly.js 를 저장
+        Stage('report', report_stage,
+              inputs=['db/market_caps.csv', 'db/stock_prices_*.csv', analysis_table_path('earnings')],
+              outputs=['event_stock_analysis.html', PLOTLYJS_OUTPUT],
+              params={'plotly_version': version}),
+    ]
+    return stages
+
+def run_pipeline(crawl_options=None, price_source=None, excel=False, plotlyjs='directory',
+                 jobs=2, force=False, dry_run=False):
+    """
+    파이프라인 실행
+
+    Args:
+        crawl_options (dict, optional): run_crawler 인자 (주면 crawl 단계부터 실행)
+        price_source (str, optional): yfinance 대신 사용할 로컬 CSV 디렉토리
+        excel (bool, optional): event_analysis.xlsx 도 저장
+        plotlyjs (str, optional): HTML 리포트의 plotly.js 포함 방식
+        jobs (int, optional): 동시에 실행할 단계 수
+        force (bool, optional): 입력 변경 여부와 관계없이 모든 단계 실행
+        dry_run (bool, optional): 실행하지 않고 단계별 예상 동작만 출력
+    """
+    runner = DagRunner(build_stages(crawl_options, price_source, excel, plotlyjs), jobs=jobs)
+
+    if dry_run:
+        for name, action in runner.plan().items():
+            deps = ', '.join(sorted(runner.deps[name])) or '-'
+            print(f"{name:<12} {action:<15} (선행: {deps})")
+        return None
+
+    started = time.time()
+    results = runner.run(force=force)
+
+    print(f"\n파이프라인 완료 ({time.time() - started:.2f}초)")
+    for name, result in results.items():
+        print(f"- {name:<12} {result['status']:<8} {result['seconds']:.2f}초")
+    return results
+
+def cli(argv=None):
+    """커맨드 라인 실행 (cli.py pipeline 에서도 사용)"""
+    parser = argparse.ArgumentParser(description='크롤링/수집/분석/리포트 파이프라인 실행 (변경 없는 단계는 건너뜀)')
+    parser.add_argument('--crawl', action='store_true', help='이벤트 캘린더 크롤링부터 실행')
+    parser.add_argument('--start-date', type=str, help='크롤링 시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end-date', type=str, help='크롤링 종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--events', type=str, help='크롤링할 이벤트 타입 (쉼표로 구분)')
+    parser.add_argument('--days', type=int, default=7, help='현재 날짜 기준 전후 크롤링할 일수')
+    parser.add_argument('--incremental', action='store_true', help='이미 수집 완료된 날짜는 건너뛰는 증분 크롤링')
+    parser.add_argument('--base-url', type=str, help='캘린더 기본 URL (예: http://localhost:8000/calendar/)')
+    parser.add_argument('--engine', choices=['scrapy', 'async'], default='scrapy', help='크롤링 엔진')
+    parser.add_argument('--price-source', type=str, help='yfinance 대신 사용할 로컬 CSV 디렉토리')
+    parser.add_argument('--excel', action='store_true', help='event_analysis.xlsx 도 함께 저장')
+    parser.add_argument('--plotlyjs', choices=['directory', 'cdn', 'inline'], default='directory',
+                        help='HTML 리포트의 plotly.js 포함 방식')
+    parser.add_argument('--jobs', type=int, default=2, help='동시에 실행할 단계 수')
+    parser.add_argument('--force', action='store_true', help='입력 변경 여부와 관계없이 모든 단계 실행')
+    parser.add_argument('--dry-run', action='store_true', help='실행하지 않고 단계별 예상 동작만 출력')
+    args = parser.parse_args(argv)
+
+    crawl_options = None
+    if args.crawl:
+        crawl_options = {
+            'start_date': args.start_date,
+            'end_date': args.end_date,
+            'events': args.events.split(',') if args.events else None,
+            'days': args.days,
+            'incremental': args.incremental,
+            'base_url': args.base_url,
+            'engine': args.engine,
+        }
+
+    run_pipeline(
+        crawl_options=crawl_options,
+        price_source=args.price_source,
+        excel=args.excel,
+        plotlyjs=args.plotlyjs,
+        jobs=args.jobs,
+        force=args.force,
+        dry_run=args.dry_run
+    )
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..'))
+
+from crawler_yf_event.response_store import ResponseStore
+
+# tests/stub_server.py 를 127.0.0.1:8766 에서 실행하고 run_crawler.py --record 로 기록한 응답
+# (2025-03-07 금요일: 모든 이벤트 타입, 2025-03-08 토요일: 결과 없음 페이지)
+FIXTURE_DIR = os.path.join(TESTS_DIR, 'fixtures', 'calendar')
+FIXTURE_BASE_URL = 'http://127.0.0.1:8766/calendar/'
+FIXTURE_DAYS = ('2025-03-07', '2025-03-08')
+
+
+@pytest.fixture(scope='session')
+def recorded_pages():
+    """기록된 응답 목록 [(메타데이터, 본문)]"""
+    return list(ResponseStore(FIXTURE_DIR).iter_entries())
+
+
+@pytest.fixture
+def run_crawler_cli(tmp_path):
+    """tmp_path (또는 그 아래 cwd) 에서 run_crawler.py 를 별도 프로세스로 실행하고 저장된 이벤트 목록 반환
+
+    Twisted reactor 는 프로세스당 한 번만 시작할 수 있으므로 Scrapy 크롤링은 항상 새 프로세스에서 실행한다.
+    """
+    import json
+    import subprocess
+
+    project_dir = os.path.join(TESTS_DIR, '..')
+
+    def run(*args, cwd=None):
+        cwd = tmp_path / cwd if cwd else tmp_path
+        cwd.mkdir(exist_ok=True)
+        env = dict(os.environ, PYTHONPATH=project_dir, SCRAPY_SETTINGS_MODULE='crawler_yf_event.settings')
+        result = subprocess.run(
+            [sys.executable, os.path.join(project_dir, 'run_crawler.py'), *args],
+            cwd=cwd, env=env, capture_output=True, text=True, timeout=300,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        with open(cwd / 'yf_calendar_events.json', encoding='utf-8') as f:
+            return json.load(f)
+
+    return run
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Yahoo Finance 캘린더 대체 서버 (테스트/오프라인 실행용)
+
+실제 캘린더 페이지와 같은 DOM 경로(parsing.XPATH_CONFIGS)로 테이블을 렌더링하고,
+실적 발표 페이지에는 사이트처럼 같은 데이터를 내장 JSON(<script data-sveltekit-fetched>)으로도 넣는다.
+이벤트 데이터는 (이벤트 타입, 날짜)마다 고정된 시드로 생성되므로 실행마다 같다.
+
+    python tests/stub_server.py --port 8766
+    python run_crawler.py --base-url http://127.0.0.1:8766/calendar/ --start-date 2025-03-07 --end-date 2025-03-08
+
+- 요청한 size 와 관계없이 한 페이지는 최대 page_limit 행 (사이트와 같이 100)
+- sortField=ticker&sortType=DESC 이면 종목 코드 역순
+- 주말에는 이벤트가 없고 테이블 대신 '결과 없음' 안내 문구를 반환
+- ETag 를 보내고 If-None-Match 가 같으면 304
+- throttle_every=N 이면 N 번째 요청마다 429 (재시도 테스트용)
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HEADERS = {
+    'earnings': ['Symbol', 'Company', 'Event Name', 'Earnings Call Time', 'EPS Estimate', 'Reported EPS',
+                 'Surprise (%)', 'Follow'],
+    'economic': ['Event', 'Country', 'Event Time', 'For', 'Actual', 'Market Expectation', 'Prior to This',
+                 'Revised from'],
+    'ipo': ['Symbol', 'Company', 'Exchange', 'Date', 'Price Range', 'Price', 'Currency', 'Shares', 'Actions'],
+    'splits': ['Symbol', 'Company', 'Payable On', 'Optionable?', 'Ratio'],
+}
+
+# 평일 이벤트 수 (earnings 는 한 페이지 100행을 넘도록 해 페이지 나눔을 확인)
+WEEKDAY_COUNTS = {'earnings': 250, 'economic': 30, 'ipo': 4, 'splits': 3}
+
+# 내장 JSON 컬럼 id (parsing.EMBEDDED_COLUMN_HEADERS 와 같은 순서)
+EMBEDDED_COLUMNS = [
+    ('ticker', 'Symbol'),
+    ('companyshortname', 'Company'),
+    ('eventname', 'Event Name'),
+    ('startdatetimetype', 'Earnings Call Time'),
+    ('epsestimate', 'EPS Estimate'),
+    ('epsactual', 'Reported EPS'),
+    ('epssurprisepct', 'Surprise (%)'),
+]
+
+COUNTRIES = ['US', 'GB', 'DE', 'JP', 'CN', 'KR', 'FR', 'CA']
+INDICATORS = ['CPI YoY', 'Unemployment Rate', 'Retail Sales MoM', 'PMI', 'GDP QoQ', 'Trade Balance']
+EXCHANGES = ['NASDAQ', 'NYSE', 'NYSE American']
+
+
+def _symbol(number):
+    letters = ''
+    for _ in range(3):
+        number, rest = divmod(number, 26)
+        letters = chr(65 + rest) + letters
+    return letters
+
+
+def _number(rng, low, high):
+    return round(rng.uniform(low, high), 2)
+
+
+def calendar_rows(event_type, day, counts=None):
+    """(이벤트 타입, 날짜)의 전체 이벤트를 종목/이벤트 순서로 반환
+
+    각 행은 {'cells': 테이블 셀 문자열 목록, 'values': 내장 JSON 값 목록(earnings)} 이다.
+    """
+    date = datetime.strptime(day, '%Y-%m-%d')
+    if date.weekday() >= 5:
+        return []
+    count = (counts or WEEKDAY_COUNTS).get(event_type, 0)
+    rng = random.Random(f'{event_type}:{day}')
+    rows = []
+
+    if event_type == 'economic':
+        for i in range(count):
+            actual = _number(rng, -2, 6)
+            expectation = None if i % 4 == 0 else _number(rng, -2, 6)
+            cells = [
+                INDICATORS[i % len(INDICATORS)] + ('' if i < len(INDICATORS) else f' ({i // len(INDICATORS)})'),
+                COUNTRIES[i % len(COUNTRIES)],
+                f'{1 + i % 12}:{(i * 15) % 60:02d} {"AM" if i % 2 else "PM"} UTC',
+                date.strftime('%b'),
+                f'{actual}',
+                '-' if expectation is None else f'{expectation}',
+                f'{_number(rng, -2, 6)}',
+                '-',
+            ]
+            rows.append({'cells': cells})
+        return rows
+
+    for number in sorted(rng.sample(range(26 ** 3), count)):
+        symbol = _symbol(number)
+        company = f'{symbol.title()} Holdings Inc.'
+        if event_type == 'earnings':
+            estimate = None if number % 5 == 0 else _number(rng, -1, 5)
+            reported = _number(rng, -1, 5) if number % 3 else None
+            surprise = None if estimate in (None, 0) or reported is None else round((reported - estimate) / abs(estimate) * 100, 2)
+            call_time = ['BMO', 'AMC', 'TAS', 'TNS'][number % 4]
+            event_name = f'Q{1 + number % 4} 2025 Earnings Call'
+            values = [symbol, company, event_name, call_time, estimate, reported, surprise]
+            cells = [
+                symbol, company, event_name, call_time,
+                '-' if estimate is None else f'{estimate:.2f}',
+                '-' if reported is None else f'{reported:.2f}',
+                '-' if surprise is None else f'{surprise:+.2f}',
+                '',
+            ]
+            rows.append({'cells': cells, 'values': values})
+        elif event_type == 'ipo':
+            low = rng.randint(5, 30)
+            cells = [
+                symbol, company, EXCHANGES[number % len(EXCHANGES)], date.strftime('%b %d, %Y'),
+                f'{low:.2f} - {low + 2:.2f}', f'{low + 1:.2f}', 'USD', f'{rng.randint(1, 50) * 100000:,}', 'Priced',
+            ]
+            rows.append({'cells': cells})
+        elif event_type == 'splits':
+            cells = [symbol, company, date.strftime('%b %d, %Y'), 'Yes' if number % 2 else 'No',
+                     f'{rng.randint(2, 10)}:1']
+            rows.append({'cells': cells})
+    return rows
+
+
+def _cell(index, value, event_type):
+    value = html.escape(value)
+    if index == 0 and event_type != 'economic':
+        return f'<td><div><a href="/quote/{value}">{value}</a></div></td>'
+    if not value:
+        return '<td><div></div></td>'
+    return f'<td><div><span>{value}</span></div></td>'
+
+
+def _embedded_script(rows, total):
+    body = json.dumps({'finance': {'result': [{'documents': [{
+        'columns': [{'id': key, 'label': label} for key, label in EMBEDDED_COLUMNS],
+        'rows': [row['values'] for row in rows],
+        'total': total,
+    }]}]}})
+    payload = json.dumps({'status': 200, 'body': body}).replace('<', '\\u003c')
+    return f'<script type="application/json" data-sveltekit-fetched data-url="/calendar">{payload}</script>'
+
+
+def render_page(event_type, day, offset=0, size=100, sort_type='ASC', page_limit=100, counts=None):
+    """캘린더 페이지 HTML"""
+    rows = calendar_rows(event_type, day, counts)
+    if not rows:
+        return (
+            '<html><head><title>Calendar</title></head><body><div id="nimbus-app"><section><section><section>'
+            f'<article><section><p>We couldn\'t find any results for {html.escape(day)}.</p></section>'
+            '</article></section></section></section></div></body></html>'
+        )
+
+    if sort_type == 'DESC':
+        rows = rows[::-1]
+    page_rows = rows[offset:offset + min(size, page_limit)]
+    headers = ''.join(f'<th><div>{html.escape(h)}</div></th>' for h in HEADERS[event_type])
+    body_rows = ''.join(
+        '<tr>' + ''.join(_cell(i, value, event_type) for i, value in enumerate(row['cells'])) + '</tr>'
+        for row in page_rows
+    )
+    first = offset + 1 if page_rows else 0
+    script = _embedded_script(page_rows, len(rows)) if event_type == 'earnings' else ''
+    return (
+        '<html><head><title>Calendar</title></head><body><div id="nimbus-app"><section><section><section>'
+        '<article><section><section>'
+        f'<div><div><div><p>{first}-{offset + len(page_rows)} of {len(rows)} Results</p></div></div></div>'
+        f'<div><table><thead><tr>{headers}</tr></thead><tbody>{body_rows}</tbody></table></div>'
+        '<div><div></div><div></div><div><button>prev</button><button>page</button><button>next</button>'
+        '</div></div></section></section></article></section></section></section></div>'
+        f'{script}</body></html>'
+    )
+
+
+class StubCalendarServer:
+    """백그라운드 스레드에서 실행하는 캘린더 대체 서버 (with 문으로 사용)"""
+
+    def __init__(self, host='127.0.0.1', port=0, page_limit=100, throttle_every=0, counts=None):
+        self.page_limit = page_limit
+        self.throttle_every = throttle_every
+        self.counts = counts
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/calendar/'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                event_type = url.path.rstrip('/').rsplit('/', 1)[-1]
+                query = parse_qs(url.query)
+                with server.lock:
+                    server.requests += 1
+                    throttled = server.throttle_every and server.requests % server.throttle_every == 0
+                if event_type not in HEADERS or 'day' not in query:
+                    self.send_error(404)
+                    return
+                if throttled:
+                    self.send_error(429)
+                    return
+
+                body = render_page(
+                    event_type, query['day'][0],
+                    offset=int(query.get('offset', ['0'])[0]),
+                    size=int(query.get('size', ['100'])[0]),
+                    sort_type=query.get('sortType', ['ASC'])[0],
+                    page_limit=server.page_limit,
+                    counts=server.counts,
+                ).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yahoo Finance 캘린더 대체 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--page-limit', type=int, default=100, help='한 페이지 최대 행 수')
+    parser.add_argument('--throttle-every', type=int, default=0, help='N 번째 요청마다 429 응답 (0: 사용 안 함)')
+    args = parser.parse_args()
+
+    server = StubCalendarServer(args.host, args.port, args.page_limit, args.throttle_every)
+    print(f'Serving {server.base_url}')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.core.downloader import Slot
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from crawler_yf_event.middlewares import AdaptiveConcurrencyMiddleware
+from stub_server import StubCalendarServer
+
+DAY = '2025-03-07'
+SPIDER = Spider(name='yf_calendar')
+
+
+def _middleware(**settings):
+    """다운로드 슬롯이 미리 만들어진 가짜 엔진에 연결한 미들웨어"""
+    settings = {
+        'ADAPTIVE_CONCURRENCY_ENABLED': True,
+        'ADAPTIVE_EVENT_BUDGETS': {'earnings': 4, 'splits': 1},
+        'ADAPTIVE_TARGET_LATENCY': 2.0,
+        'ADAPTIVE_MIN_DELAY': 0.25,
+        'DOWNLOAD_DELAY': 0.25,
+        **settings,
+    }
+    crawler = get_crawler(settings_dict=settings)
+    middleware = AdaptiveConcurrencyMiddleware.from_crawler(crawler)
+    slots = {middleware._slot_key(event_type): Slot(1, settings['DOWNLOAD_DELAY'], False)
+             for event_type in ('earnings', 'splits')}
+    crawler.engine = SimpleNamespace(downloader=SimpleNamespace(slots=slots))
+    return middleware, slots
+
+
+def _respond(middleware, event_type, status=200, latency=0.1):
+    request = Request(f'http://127.0.0.1/calendar/{event_type}?day={DAY}',
+                      meta={'event_type': event_type, 'download_latency': latency})
+    middleware.process_request(request, SPIDER)
+    middleware.process_response(request, HtmlResponse(request.url, status=status, request=request), SPIDER)
+
+
+def _slot(slots, event_type):
+    slot = slots[f'yf_calendar:{event_type}']
+    return slot.concurrency, slot.delay
+
+
+def test_disabled_by_setting():
+    with pytest.raises(NotConfigured):
+        AdaptiveConcurrencyMiddleware.from_crawler(get_crawler(settings_dict={'ADAPTIVE_CONCURRENCY_ENABLED': False}))
+
+
+def test_delay_shrinks_before_concurrency_grows():
+    middleware, slots = _middleware(DOWNLOAD_DELAY=1.0)
+    delays = []
+    while _slot(slots, 'earnings')[1] > 0.25:
+        _respond(middleware, 'earnings')
+        delays.append(_slot(slots, 'earnings'))
+    # 지연이 최소(0.25초)가 될 때까지 동시성은 1
+    assert [c for c, _ in delays] == [1] * len(delays)
+    assert [d for _, d in delays] == sorted((d for _, d in delays), reverse=True)
+    _respond(middleware, 'earnings')
+    assert _slot(slots, 'earnings') == (2, 0.25)
+
+
+def test_backs_off_on_throttle_and_recovers():
+    middleware, slots = _middleware()
+    # 동시성만큼의 연속 성공(윈도우)마다 1씩 증가: 1 + 2 + 3 회 성공이면 예산 4 에 도달
+    for _ in range(6):
+        _respond(middleware, 'earnings')
+    assert _slot(slots, 'earnings') == (4, 0.25)
+    for _ in range(8):
+        _respond(middleware, 'earnings')
+    assert _slot(slots, 'earnings') == (4, 0.25)
+
+    # 429 / 503 마다 절반으로 줄고, 최소 동시성에서는 지연을 두 배로 늘림
+    _respond(middleware, 'earnings', 429)
+    assert _slot(slots, 'earnings') == (2, 0.25)
+    _respond(middleware, 'earnings', 503)
+    assert _slot(slots, 'earnings') == (1, 0.25)
+    _respond(middleware, 'earnings', 429)
+    assert _slot(slots, 'earnings') == (1, 0.5)
+    # 목표 지연시간을 넘는 느린 응답도 과부하 신호
+    _respond(middleware, 'earnings', latency=5.0)
+    assert _slot(slots, 'earnings') == (1, 1.0)
+
+    # 다른 이벤트 타입의 슬롯은 영향을 받지 않음
+    _respond(middleware, 'splits')
+    assert _slot(slots, 'splits') == (1, 0.25)
+
+    # 다시 성공이 이어지면 지연부터 줄이고 동시성을 예산까지 회복
+    history = []
+    while _slot(slots, 'earnings')[0] < 4:
+        _respond(middleware, 'earnings')
+        history.append(_slot(slots, 'earnings'))
+    assert history[-1] == (4, 0.25)
+    assert [c for c, _ in history] == sorted(c for c, _ in history)
+    assert middleware.states['earnings']['errors'] == {'429': 2, '503': 1, 'latency': 1}
+    assert middleware.states['earnings']['peak'] == 4
+
+
+def _download(request):
+    try:
+        with urllib.request.urlopen(request.url) as response:
+            status, body = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, b''
+    return HtmlResponse(request.url, status=status, body=body, request=request)
+
+
+def test_backs_off_on_stub_server_throttling():
+    middleware, slots = _middleware()
+    concurrency = []
+    with StubCalendarServer(throttle_every=5) as server:
+        for offset in range(0, 1000, 100):
+            request = Request(f'{server.base_url}earnings?day={DAY}&offset={offset}&size=100',
+                              meta={'event_type': 'earnings', 'download_latency': 0.1})
+            middleware.process_request(request, SPIDER)
+            response = _download(request)
+            middleware.process_response(request, response, SPIDER)
+            concurrency.append((response.status, _slot(slots, 'earnings')[0]))
+    # 성공 4회로 3까지 늘었다가 5번째 요청의 429 에서 1로 줄고, 다음 성공들로 다시 늘어남
+    assert concurrency == [
+        (200, 2), (200, 2), (200, 3), (200, 3), (429, 1),
+        (200, 2), (200, 2), (200, 3), (200, 3), (429, 1),
+    ]
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from crawler_yf_event.aggregate import EVENT_TYPES, summarize_events
+from crawler_yf_event.normalize import EVENT_TIME_UTC_COLUMN, parse_event_times
+
+
+def _frames():
+    earnings = pd.DataFrame({
+        'date': pd.to_datetime(['2025-03-06', '2025-03-06', '2025-03-07', '2025-03-07', '2025-03-10', '2025-03-10']),
+        'Symbol': ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF'],
+        'Earnings Call Time': ['AMC', 'BMO', None, 'AMC', 'TAS', 'AMC'],
+        'Surprise (%)': [12.5, -3.0, None, 40.0, 0.0, -25.5],
+    })
+    economic = pd.DataFrame({
+        'date': pd.to_datetime(['2025-03-06', '2025-03-07', '2025-03-07', '2025-03-07', '2025-03-11']),
+        'Country': ['US', 'US', 'DE', 'JP', 'US'],
+        'Event Time': ['8:30 AM UTC', '1:30 PM UTC', '7:00 AM UTC', '-', '11:45 PM UTC'],
+    })
+    economic[EVENT_TIME_UTC_COLUMN] = parse_event_times(economic['date'], economic['Event Time'])
+    ipo = pd.DataFrame({'date': pd.to_datetime(['2025-03-07', '2025-03-12']), 'Symbol': ['NEW', 'NXT']})
+    splits = pd.DataFrame({'date': pd.to_datetime([]), 'Symbol': []})
+    return {'earnings': earnings, 'economic': economic, 'ipo': ipo, 'splits': splits}
+
+
+def test_summaries_match_pandas_groupby():
+    frames = _frames()
+    summaries = summarize_events(frames, surprise_bins=5)
+    events = pd.concat([df.assign(event_type=event_type) for event_type, df in frames.items()], ignore_index=True)
+
+    expected_totals = events.groupby('event_type').size().reindex(EVENT_TYPES, fill_value=0)
+    assert summaries.totals.tolist() == expected_totals.tolist() == [6, 5, 2, 0]
+    assert list(summaries.totals.index) == EVENT_TYPES
+
+    expected_daily = (
+        events.groupby(['date', 'event_type']).size().unstack(fill_value=0)
+        .reindex(columns=EVENT_TYPES, fill_value=0)
+    )
+    pd.testing.assert_frame_equal(summaries.daily_counts, expected_daily, check_names=False)
+
+    expected_countries = frames['economic'].groupby('Country').size()
+    assert summaries.country_counts.to_dict() == expected_countries.to_dict() == {'US': 3, 'DE': 1, 'JP': 1}
+    assert summaries.country_counts.index[0] == 'US'
+
+    call_times = frames['earnings']['Earnings Call Time'].fillna('Unknown')
+    assert summaries.call_time_counts.to_dict() == call_times.groupby(call_times).size().to_dict()
+    assert summaries.call_time_counts.to_dict() == {'AMC': 3, 'BMO': 1, 'TAS': 1, 'Unknown': 1}
+
+    surprise = frames['earnings']['Surprise (%)'].dropna()
+    counts, edges = np.histogram(surprise, bins=5)
+    assert summaries.surprise_bins['count'].tolist() == counts.tolist()
+    assert summaries.surprise_bins['left'].tolist() == edges[:-1].tolist()
+    assert summaries.surprise_bins['right'].tolist() == edges[1:].tolist()
+    assert summaries.surprise_bins['count'].sum() == len(surprise)
+
+    hours = frames['economic'][EVENT_TIME_UTC_COLUMN].dt.hour.dropna().astype(int)
+    expected_hours = hours.groupby(hours).size().reindex(range(24), fill_value=0)
+    assert summaries.event_hour_counts.tolist() == expected_hours.tolist()
+    assert summaries.event_hour_counts[[7, 8, 13, 23]].tolist() == [1, 1, 1, 1]
+
+
+def test_missing_and_empty_frames():
+    summaries = summarize_events({'ipo': _frames()['ipo'], 'earnings': None})
+    assert summaries.totals.tolist() == [0, 0, 2, 0]
+    assert summaries.daily_counts['ipo'].tolist() == [1, 1]
+    assert summaries.daily_counts[['earnings', 'economic', 'splits']].to_numpy().sum() == 0
+    assert summaries.country_counts.empty and summaries.call_time_counts.empty
+    assert summaries.surprise_bins.empty
+    assert summaries.event_hour_counts.sum() == 0 and len(summaries.event_hour_counts) == 24
+
+    summaries = summarize_events({})
+    assert summaries.totals.tolist() == [0, 0, 0, 0]
+    assert summaries.daily_counts.empty
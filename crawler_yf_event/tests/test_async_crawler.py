@@ -0,0 +1,48 @@
+import pytest
+
+from conftest import FIXTURE_BASE_URL, FIXTURE_DAYS, FIXTURE_DIR
+from stub_server import StubCalendarServer, WEEKDAY_COUNTS
+
+pytest.importorskip('httpx')
+
+DAYS = ('--start-date', FIXTURE_DAYS[0], '--end-date', FIXTURE_DAYS[-1], '--no-cache')
+
+
+def _rows(events):
+    # 실행 시각(crawl_date)을 제외한 이벤트 행
+    return sorted(
+        tuple(sorted((key, value) for key, value in event.items() if key != 'crawl_date'))
+        for event in events
+    )
+
+
+def _counts(events):
+    counts = {}
+    for event in events:
+        counts[event['event_type']] = counts.get(event['event_type'], 0) + 1
+    return counts
+
+
+def test_async_replay_is_offline(run_crawler_cli):
+    events = run_crawler_cli('--engine', 'async', '--replay', FIXTURE_DIR, '--base-url', FIXTURE_BASE_URL, *DAYS)
+    assert _counts(events) == WEEKDAY_COUNTS
+
+
+def test_async_record_then_scrapy_replay(tmp_path, run_crawler_cli):
+    with StubCalendarServer() as server:
+        recorded = run_crawler_cli('--engine', 'async', '--record', str(tmp_path / 'store'),
+                                   '--base-url', server.base_url, *DAYS, cwd='record')
+    replayed = run_crawler_cli('--replay', str(tmp_path / 'store'), '--base-url', server.base_url, *DAYS,
+                               cwd='replay')
+    assert _counts(recorded) == WEEKDAY_COUNTS
+    assert _rows(replayed) == _rows(recorded)
+
+
+def test_async_engine_matches_scrapy_engine(run_crawler_cli):
+    # 429 응답을 섞어 재시도 경로까지 두 엔진의 결과를 비교
+    args = ('--start-date', '2025-03-06', '--end-date', '2025-03-10', '--no-cache')
+    with StubCalendarServer(throttle_every=7) as server:
+        scrapy_events = run_crawler_cli('--base-url', server.base_url, *args, cwd='scrapy')
+        async_events = run_crawler_cli('--engine', 'async', '--base-url', server.base_url, *args, cwd='async')
+    assert len(scrapy_events) == 3 * sum(WEEKDAY_COUNTS.values())
+    assert _rows(async_events) == _rows(scrapy_events)
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from crawler_yf_event.crawl_state import CrawlStateIndex
+from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+
+
+def test_record_page_detects_changes(tmp_path):
+    state = CrawlStateIndex(str(tmp_path / 'state.sqlite3'))
+    rows = [('AAA', 'Aaa Holdings Inc.', '1.00')]
+    assert state.record_page('earnings', '2025-03-07', 0, rows)
+    assert not state.record_page('earnings', '2025-03-07', 0, list(rows))
+    assert state.record_page('earnings', '2025-03-07', 0, rows + [('BBB', 'Bbb Holdings Inc.', '-')])
+    # 역순 페이지(음수 offset)와 다른 날짜는 따로 기록
+    assert state.record_page('earnings', '2025-03-07', -1, rows)
+    assert state.record_page('earnings', '2025-03-06', 0, rows)
+    state.close()
+
+
+def test_needs_fetch(tmp_path):
+    state = CrawlStateIndex(str(tmp_path / 'state.sqlite3'), settle_days=3, ttl_hours=12)
+    assert state.needs_fetch('ipo', '2025-03-07')
+    state.conn.execute("INSERT INTO days VALUES ('ipo', '2025-03-07', 1, '2025-03-11 00:00:00')")
+    state.conn.execute("INSERT INTO days VALUES ('ipo', '2025-03-10', 1, '2025-03-11 00:00:00')")
+    # 확정된 뒤 수집한 날짜는 다시 받지 않고, 최근 날짜는 ttl_hours 가 지나면 다시 받음
+    assert not state.needs_fetch('ipo', '2025-03-07', now=datetime(2026, 1, 1))
+    assert not state.needs_fetch('ipo', '2025-03-10', now=datetime(2025, 3, 11, 6))
+    assert state.needs_fetch('ipo', '2025-03-10', now=datetime(2025, 3, 11, 12))
+    state.close()
+
+
+def _parse_all(spider, recorded_pages):
+    items = []
+    for header, body in recorded_pages:
+        request = Request(header['url'], meta=dict(header['meta']))
+        response = HtmlResponse(header['url'], body=body, headers=header['headers'], request=request)
+        items += [output for output in spider.parse(response) if not isinstance(output, Request)]
+    return items
+
+
+def _spider(tmp_path, **kwargs):
+    settings = {'CRAWL_STATE_ENABLED': True, 'CRAWL_STATE_PATH': str(tmp_path / 'state.sqlite3')}
+    return YFCalendarSpider.from_crawler(get_crawler(YFCalendarSpider, settings), **kwargs)
+
+
+def test_revalidated_pages_are_emitted_only_when_changed(tmp_path, recorded_pages):
+    assert len(_parse_all(_spider(tmp_path), recorded_pages)) == 287
+    # 같은 내용을 다시 받으면 내보내지 않음
+    assert _parse_all(_spider(tmp_path), recorded_pages) == []
+    # --full-refresh 는 내용과 관계없이 모두 내보냄
+    assert len(_parse_all(_spider(tmp_path, full_refresh='true'), recorded_pages)) == 287
+
+    # 한 페이지의 값이 바뀌면 그 페이지만 다시 내보냄
+    changed = []
+    for header, body in recorded_pages:
+        if header['meta']['event_type'] == 'splits' and header['meta']['date'] == '2025-03-07':
+            body = body.replace(b':1</span>', b':2</span>', 1)
+        changed.append((header, body))
+    items = _parse_all(_spider(tmp_path), changed)
+    assert [item.event_type for item in items] == ['splits'] * 3
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+
+import pytest
+
+from crawler_yf_event.dag import DagRunner, Stage
+
+
+# 단계 함수는 spawn 자식 프로세스에서 불러오므로 모듈 최상위에 둠
+
+def copy_upper(src, dst, log):
+    with open(log, 'a') as f:
+        f.write(os.path.basename(dst) + '\n')
+    with open(src) as f:
+        text = f.read()
+    with open(dst, 'w') as f:
+        f.write(text.upper())
+
+
+def write_params(dst, log, value=None):
+    with open(log, 'a') as f:
+        f.write(os.path.basename(dst) + '\n')
+    with open(dst, 'w') as f:
+        json.dump({'value': value}, f)
+
+
+def sleep_and_stamp(dst, seconds):
+    started = time.time()
+    time.sleep(seconds)
+    with open(dst, 'w') as f:
+        json.dump([started, time.time()], f)
+
+
+def fail():
+    raise RuntimeError('boom')
+
+
+def _runner(tmp_path, stages, jobs=2):
+    return DagRunner(stages, state_file=str(tmp_path / 'state.json'), timings_file=str(tmp_path / 'timings.jsonl'),
+                     jobs=jobs)
+
+
+def _ran(log):
+    if not os.path.exists(log):
+        return []
+    with open(log) as f:
+        return f.read().split()
+
+
+@pytest.fixture
+def paths(tmp_path):
+    (tmp_path / 'in.txt').write_text('a')
+    return {name: str(tmp_path / name) for name in ('in.txt', 'out', 'params.json', 'log')}
+
+
+def _stages(paths, value=1):
+    return [
+        Stage('upper', copy_upper, inputs=[paths['in.txt']], outputs=[paths['out'] + '/upper.txt'],
+              params={'src': paths['in.txt'], 'dst': paths['out'] + '/upper.txt', 'log': paths['log']}),
+        Stage('params', write_params, outputs=[paths['params.json']],
+              params={'dst': paths['params.json'], 'log': paths['log'], 'value': value}),
+    ]
+
+
+def test_unchanged_stages_are_skipped(tmp_path, paths):
+    os.makedirs(paths['out'])
+    results = _runner(tmp_path, _stages(paths)).run()
+    assert {name: r['status'] for name, r in results.items()} == {'upper': 'ran', 'params': 'ran'}
+
+    results = _runner(tmp_path, _stages(paths)).run()
+    assert {name: r['status'] for name, r in results.items()} == {'upper': 'skipped', 'params': 'skipped'}
+    assert sorted(_ran(paths['log'])) == ['params.json', 'upper.txt']
+
+    # 실행마다 단계별 시간이 한 줄씩 기록됨
+    with open(tmp_path / 'timings.jsonl') as f:
+        assert [sorted(json.loads(line)['stages']) for line in f] == [['params', 'upper']] * 2
+
+
+def test_changed_input_param_or_missing_output_reruns(tmp_path, paths):
+    os.makedirs(paths['out'])
+    _runner(tmp_path, _stages(paths)).run()
+
+    # 수정 시각만 바뀌고 내용이 같으면 건너뜀
+    os.utime(paths['in.txt'], (time.time() + 10, time.time() + 10))
+    assert _runner(tmp_path, _stages(paths)).plan() == {'upper': 'skip', 'params': 'skip'}
+
+    with open(paths['in.txt'], 'w') as f:
+        f.write('b')
+    assert _runner(tmp_path, _stages(paths, value=2)).plan() == {'upper': 'run', 'params': 'run'}
+    results = _runner(tmp_path, _stages(paths, value=2)).run()
+    assert {name: r['status'] for name, r in results.items()} == {'upper': 'ran', 'params': 'ran'}
+    with open(paths['out'] + '/upper.txt') as f:
+        assert f.read() == 'B'
+
+    os.remove(paths['params.json'])
+    assert _runner(tmp_path, _stages(paths, value=2)).plan() == {'upper': 'skip', 'params': 'run'}
+
+
+def test_dependencies_from_outputs(tmp_path):
+    stages = [
+        Stage('crawl', fail, outputs=[str(tmp_path / 'events')]),
+        Stage('prices', fail, outputs=[str(tmp_path / 'db' / 'stock_prices_*.csv')]),
+        Stage('report', fail, inputs=[str(tmp_path / 'db' / 'stock_prices_*.csv')]),
+        Stage('analyze', fail, inputs=[str(tmp_path / 'events' / 'earnings' / 'date=2025-03-07.jsonl')]),
+        Stage('summary', fail, inputs=[str(tmp_path / 'db' / 'stock_prices_AAPL.csv')]),
+        Stage('other', fail, inputs=[str(tmp_path / 'events.json')]),
+    ]
+    runner = _runner(tmp_path, stages)
+    assert runner.deps == {
+        'crawl': set(),
+        'prices': set(),
+        'report': {'prices'},
+        'analyze': {'crawl'},
+        'summary': {'prices'},
+        'other': set(),
+    }
+
+    with pytest.raises(ValueError):
+        _runner(tmp_path, [
+            Stage('a', fail, inputs=['b.txt'], outputs=['a.txt']),
+            Stage('b', fail, inputs=['a.txt'], outputs=['b.txt']),
+        ])
+
+
+def test_independent_stages_run_concurrently_and_failures_block_downstream(tmp_path):
+    a, b = str(tmp_path / 'a.json'), str(tmp_path / 'b.json')
+    stages = [
+        Stage('a', sleep_and_stamp, outputs=[a], params={'dst': a, 'seconds': 1.0}),
+        Stage('b', sleep_and_stamp, outputs=[b], params={'dst': b, 'seconds': 1.0}),
+        Stage('broken', fail, outputs=[str(tmp_path / 'broken')]),
+        Stage('after_broken', fail, inputs=[str(tmp_path / 'broken')], outputs=[str(tmp_path / 'c')]),
+        Stage('after_that', fail, inputs=[str(tmp_path / 'c')]),
+    ]
+    results = _runner(tmp_path, stages, jobs=3).run()
+    assert {name: r['status'] for name, r in results.items()} == {
+        'a': 'ran', 'b': 'ran', 'broken': 'failed', 'after_broken': 'blocked', 'after_that': 'blocked',
+    }
+    assert 'RuntimeError: boom' in results['broken']['error']
+
+    with open(a) as f:
+        a_start, a_end = json.load(f)
+    with open(b) as f:
+        b_start, b_end = json.load(f)
+    assert a_start < b_end and b_start < a_end
+
+    # 실패한 단계는 키가 저장되지 않아 다음 실행에서 다시 실행
+    assert _runner(tmp_path, stages).plan()['broken'] == 'run'
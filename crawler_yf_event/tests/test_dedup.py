@@ -0,0 +1,115 @@
+import glob
+import json
+import os
+
+import pytest
+from scrapy.settings import Settings
+
+from crawler_yf_event.dedup import natural_key
+from crawler_yf_event.event_store import load_event_frames, load_event_records
+from crawler_yf_event.items import YFCalendarEventItem
+from crawler_yf_event.pipelines import CrawlerYfEventPipeline
+from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+
+
+def _earnings(date, symbol, reported, crawl_date):
+    return YFCalendarEventItem('earnings', date, crawl_date,
+                               (symbol, f'{symbol} Inc.', 'Q1 2025 Earnings Call', 'AMC', 1.0, reported, None))
+
+
+def _splits(date, symbol, crawl_date):
+    return YFCalendarEventItem('splits', date, crawl_date, (symbol, f'{symbol} Inc.', date, 'Yes', '2:1'))
+
+
+FIRST = '2025-03-08 09:00:00'
+SECOND = '2025-03-09 09:00:00'
+
+FIRST_RUN = [
+    _earnings('2025-03-06', 'AAA', None, FIRST),
+    _earnings('2025-03-06', 'BBB', None, FIRST),
+    _earnings('2025-03-07', 'CCC', None, FIRST),
+    _splits('2025-03-07', 'DDD', FIRST),
+]
+# 겹치는 두 번째 실행: 그대로(AAA, DDD), 값이 바뀐 행(BBB, CCC), 새 행(EEE, FFF)
+SECOND_RUN = [
+    _earnings('2025-03-06', 'AAA', None, SECOND),
+    _earnings('2025-03-06', 'BBB', 1.5, SECOND),
+    _earnings('2025-03-07', 'CCC', 0.5, SECOND),
+    _earnings('2025-03-07', 'EEE', None, SECOND),
+    _splits('2025-03-07', 'DDD', SECOND),
+    _splits('2025-04-01', 'FFF', SECOND),
+]
+
+
+def _run(settings, items):
+    pipeline = CrawlerYfEventPipeline.from_settings(Settings(settings))
+    spider = YFCalendarSpider()
+    pipeline.open_spider(spider)
+    for item in items:
+        pipeline.process_item(item, spider)
+    pipeline.close_spider(spider)
+    return pipeline.store
+
+
+@pytest.mark.parametrize('mode', ['json', 'jsonl', 'parquet'])
+def test_rerun_upserts_overlapping_items(tmp_path, mode):
+    settings = {
+        'EVENT_OUTPUT_MODE': mode,
+        'EVENT_OUTPUT_FILE': str(tmp_path / 'events.json'),
+        'EVENT_OUTPUT_DIR': str(tmp_path / 'events'),
+        'EVENT_PARQUET_DIR': str(tmp_path / 'event_store'),
+        # 작은 배치로 여러 파일/여러 번 기록되게 함
+        'EVENT_FLUSH_BATCH_SIZE': 2,
+        'EVENT_PARQUET_BATCH_SIZE': 2,
+    }
+    first = _run(settings, FIRST_RUN)
+    assert (first.inserted, first.updated, first.duplicates) == (4, 0, 0)
+    second = _run(settings, SECOND_RUN)
+    assert (second.inserted, second.updated, second.duplicates) == (2, 2, 2)
+
+    source = {'json': 'events.json', 'jsonl': 'events', 'parquet': 'event_store'}[mode]
+    frames = load_event_frames(str(tmp_path / source), {'earnings': None, 'splits': None})
+    earnings, splits = frames['earnings'], frames['splits']
+
+    # 자연 키 중복 없이 모든 행이 남고, 바뀐 행은 새 값
+    assert sorted(earnings['Symbol']) == ['AAA', 'BBB', 'CCC', 'EEE']
+    assert sorted(splits['Symbol']) == ['DDD', 'FFF']
+    reported = dict(zip(earnings['Symbol'], earnings['Reported EPS']))
+    assert reported['BBB'] == 1.5 and reported['CCC'] == 0.5
+    crawl_dates = dict(zip(earnings['Symbol'], earnings['crawl_date'].astype(str)))
+    # 값이 같아 건너뛴 행은 처음 수집 시각을 유지
+    assert crawl_dates['AAA'] == FIRST and crawl_dates['BBB'] == SECOND
+
+
+def test_jsonl_partitions_are_compacted(tmp_path):
+    settings = {'EVENT_OUTPUT_MODE': 'jsonl', 'EVENT_OUTPUT_DIR': str(tmp_path / 'events'),
+                'EVENT_FLUSH_BATCH_SIZE': 2}
+    _run(settings, FIRST_RUN)
+    _run(settings, SECOND_RUN)
+
+    root = tmp_path / 'events'
+    files = sorted(os.path.relpath(path, root) for path in glob.glob(str(root / '*' / '*.jsonl')))
+    assert files == [
+        'earnings/2025-03-06.jsonl', 'earnings/2025-03-07.jsonl', 'splits/2025-03-07.jsonl', 'splits/2025-04-01.jsonl',
+    ]
+    records = load_event_records(str(root))
+    keys = [natural_key(record) for record in records]
+    assert len(records) == 6 and len(set(keys)) == 6
+    for path in files:
+        with open(root / path) as f:
+            lines = [json.loads(line) for line in f]
+        assert len({natural_key(record) for record in lines}) == len(lines)
+
+
+def test_parquet_partitions_are_compacted(tmp_path):
+    import pyarrow.parquet as pq
+
+    settings = {'EVENT_OUTPUT_MODE': 'parquet', 'EVENT_PARQUET_DIR': str(tmp_path / 'event_store'),
+                'EVENT_PARQUET_BATCH_SIZE': 2}
+    _run(settings, FIRST_RUN)
+    _run(settings, SECOND_RUN)
+
+    # 바뀐 행이 있던 월 파티션은 한 파일로 합쳐지고 모든 키가 한 번씩 남음
+    march = glob.glob(str(tmp_path / 'event_store' / 'event_type=earnings' / 'year=2025' / 'month=3' / '*.parquet'))
+    assert len(march) == 1
+    assert sorted(pq.read_table(march[0]).column('Symbol').to_pylist()) == ['AAA', 'BBB', 'CCC', 'EEE']
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crawler_yf_event.event_index import EventIndex
+
+EVENTS = pd.DataFrame([
+    ('MSFT', '2025-01-29', 'Q2'),
+    ('AAPL', '2025-01-30', 'Q1'),
+    ('AAPL', '2024-10-31', 'Q4'),
+    ('AAPL', '2025-05-01 16:30:00', 'Q2'),  # 시각이 있는 날짜는 날짜로 맞춤
+    ('MSFT', '2025-01-30', 'Q2 call'),
+    ('NVDA', '2025-01-30', 'Q4'),
+    ('AAPL', '2025-01-30', 'Q1 call'),  # 같은 날 두 번째 이벤트
+    (None, '2025-01-30', 'no ticker'),
+    ('TSLA', None, 'no date'),
+], columns=['Symbol', 'date', 'Event Name'])
+EVENTS['date'] = pd.to_datetime(EVENTS['date'], format='ISO8601')
+
+
+@pytest.fixture(scope='module')
+def index():
+    return EventIndex(EVENTS)
+
+
+def _names(frame):
+    return list(frame['Event Name'])
+
+
+def test_missing_ticker_or_date_rows_are_dropped(index):
+    assert len(index) == 7
+    assert 'TSLA' not in index and 'AAPL' in index
+
+
+def test_events_for_boundaries_are_inclusive(index):
+    assert _names(index.events_for('AAPL')) == ['Q4', 'Q1', 'Q1 call', 'Q2']
+    assert _names(index.events_for('AAPL', '2025-01-30', '2025-01-30')) == ['Q1', 'Q1 call']
+    assert _names(index.events_for('AAPL', '2024-10-31', '2025-05-01')) == ['Q4', 'Q1', 'Q1 call', 'Q2']
+    # 경계 하루 밖이면 제외
+    assert _names(index.events_for('AAPL', '2024-11-01', '2025-04-30')) == ['Q1', 'Q1 call']
+    assert _names(index.events_for('AAPL', start='2025-01-31')) == ['Q2']
+    assert _names(index.events_for('AAPL', end='2025-01-29')) == ['Q4']
+    assert list(index.dates_for('AAPL', '2025-05-01')) == [np.datetime64('2025-05-01', 'ns')]
+
+
+def test_empty_ranges(index):
+    assert index.events_for('AAPL', '2025-02-01', '2025-04-30').empty
+    assert index.events_for('AAPL', '2025-03-01', '2025-01-01').empty
+    assert index.events_for('MSFT', '2026-01-01').empty
+    assert len(index.dates_for('NVDA', end='2024-12-31')) == 0
+    assert index.tickers_on('2025-01-31') == []
+
+
+def test_unknown_tickers(index):
+    for ticker in ('TSLA', 'AAA', 'ZZZZ', ''):
+        assert ticker not in index
+        assert index.events_for(ticker).empty
+        assert len(index.dates_for(ticker, '2024-01-01', '2026-01-01')) == 0
+    assert list(index.events_for(ticker).columns) == list(EVENTS.columns)
+    frame = index.events_for_tickers(['ZZZZ', 'NVDA', 'AAA', 'MSFT'], '2025-01-30', '2025-01-30')
+    assert list(zip(frame['Symbol'], frame['Event Name'])) == [('NVDA', 'Q4'), ('MSFT', 'Q2 call')]
+    assert index.events_for_tickers([]).empty
+    assert index.events_for_tickers(['ZZZZ']).empty
+
+
+def test_tickers_on(index):
+    assert index.tickers_on('2025-01-30') == ['AAPL', 'MSFT', 'NVDA']
+    assert index.tickers_on(pd.Timestamp('2025-01-30 23:59')) == ['AAPL', 'MSFT', 'NVDA']
+    assert index.tickers_on('2025-05-01') == ['AAPL']
+
+
+def test_matches_brute_force_filter():
+    rng = np.random.default_rng(3)
+    days = pd.date_range('2024-01-01', '2024-12-31')
+    events = pd.DataFrame({
+        'Symbol': rng.choice(['A', 'B', 'C', 'D'], 400),
+        'date': rng.choice(days, 400),
+    })
+    index = EventIndex(events)
+    for _ in range(50):
+        ticker = rng.choice(['A', 'B', 'C', 'D', 'E'])
+        start, end = sorted(rng.choice(days, 2))
+        expected = events[(events['Symbol'] == ticker) & (events['date'] >= start) & (events['date'] <= end)]
+        assert sorted(index.dates_for(ticker, start, end)) == sorted(expected['date'].to_numpy())
+    for day in rng.choice(days, 20):
+        assert index.tickers_on(day) == sorted(events.loc[events['date'] == day, 'Symbol'].unique())
+
+
+def test_empty_index():
+    index = EventIndex(pd.DataFrame({'Symbol': [], 'date': []}))
+    assert len(index) == 0 and 'AAPL' not in index
+    assert index.events_for('AAPL', '2025-01-01', '2025-12-31').empty
+    assert index.events_for_tickers(['AAPL', 'MSFT']).empty
+    assert index.tickers_on('2025-01-30') == []
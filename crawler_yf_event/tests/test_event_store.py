@@ -0,0 +1,136 @@
+import json
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from crawler_yf_event.event_store import (
+    JsonLinesPartitionWriter, ParquetPartitionWriter, is_parquet_store, iter_partition_files, load_event_frames,
+    read_parquet_events, records_to_table,
+)
+from crawler_yf_event.items import YFCalendarEventItem
+
+CRAWL_DATE = '2025-04-10 09:00:00'
+# 2~4월에 걸친 earnings 와 splits (월 경계 날짜 포함)
+DAYS = ['2025-02-27', '2025-02-28', '2025-03-01', '2025-03-14', '2025-03-31', '2025-04-01', '2025-04-15']
+
+
+def _records():
+    records = []
+    for i, day in enumerate(DAYS):
+        for j in range(3):
+            symbol = f'E{i}{j}'
+            records.append(YFCalendarEventItem('earnings', day, CRAWL_DATE, (
+                symbol, f'{symbol} Inc.', 'Q1 2025 Earnings Call', 'AMC', 1.0 + j, None if j else 0.5, None,
+            )).as_dict())
+        records.append(YFCalendarEventItem('splits', day, CRAWL_DATE, (
+            f'S{i}', f'S{i} Inc.', day, 'Yes', '2:1',
+        )).as_dict())
+    return records
+
+
+def _write_jsonl(root, records, batch_size=4):
+    writer = JsonLinesPartitionWriter(str(root), batch_size=batch_size)
+    for record in records:
+        writer.write(record)
+    writer.close()
+    return writer
+
+
+def _write_parquet(root, records, batch_size=4):
+    writer = ParquetPartitionWriter(str(root), batch_size=batch_size)
+    for record in records:
+        writer.write(record)
+    writer.close()
+
+
+def test_parquet_hive_layout(tmp_path):
+    _write_parquet(tmp_path, _records())
+    assert is_parquet_store(str(tmp_path))
+    months = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.glob('event_type=*/year=*/month=*'))
+    assert months == [f'event_type={t}/year=2025/month={m}' for t in ('earnings', 'splits') for m in (2, 3, 4)]
+
+
+def test_read_parquet_events_filters_by_type_and_date(tmp_path):
+    records = _records()
+    _write_parquet(tmp_path, records)
+
+    for start, end in [('2025-02-28', '2025-03-31'), ('2025-03-01', '2025-03-01'), ('2025-03-15', None),
+                       (None, '2025-02-27'), (None, None), ('2025-05-01', '2025-05-31')]:
+        df = read_parquet_events(str(tmp_path), 'earnings', start_date=start, end_date=end)
+        expected = sorted(
+            r['Symbol'] for r in records
+            if r['event_type'] == 'earnings' and (not start or r['date'] >= start) and (not end or r['date'] <= end)
+        )
+        assert sorted(df['Symbol']) == expected, (start, end)
+        assert set(df['event_type']) <= {'earnings'}
+        assert 'year' not in df.columns and 'month' not in df.columns
+
+    # 필요한 컬럼만 읽고 타입은 유지
+    df = read_parquet_events(str(tmp_path), 'splits', columns=['Symbol', 'date', 'Payable On'],
+                             start_date='2025-03-01', end_date='2025-04-01')
+    assert list(df['Symbol']) == ['S2', 'S3', 'S4', 'S5']
+    assert sorted(df.columns) == ['Payable On', 'Symbol', 'date', 'event_type']
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+    assert read_parquet_events(str(tmp_path), 'ipo') is None
+
+
+def test_read_parquet_events_with_legacy_string_batch(tmp_path):
+    records = _records()
+    _write_parquet(tmp_path, records)
+    # 타입 없이(모든 값 문자열) 기록하던 이전 배치가 같은 파티션에 섞인 경우
+    legacy = [dict(r, Symbol=f'L{r["Symbol"]}', **{'EPS Estimate': str(r['EPS Estimate'])})
+              for r in records if r['event_type'] == 'earnings' and r['date'] in ('2025-03-14', '2025-04-15')]
+    pq.write_to_dataset(records_to_table(legacy), str(tmp_path), partition_cols=['event_type', 'year', 'month'])
+
+    df = read_parquet_events(str(tmp_path), 'earnings', start_date='2025-03-01', end_date='2025-03-31')
+    assert sorted(df['Symbol']) == [f'{p}{i}{j}' for p, days in (('E', '234'), ('LE', '3')) for i in days for j in range(3)]
+
+    frames = load_event_frames(str(tmp_path), {'earnings': ['Symbol', 'date', 'EPS Estimate']},
+                               start_date='2025-03-01', end_date='2025-03-31')
+    assert frames['earnings']['EPS Estimate'].dtype == float
+    assert sorted(frames['earnings']['EPS Estimate']) == [1.0] * 4 + [2.0] * 4 + [3.0] * 4
+
+
+def test_jsonl_partition_layout(tmp_path):
+    records = _records()
+    writer = _write_jsonl(tmp_path, records)
+    assert writer.written == len(records) and not writer.buffers
+    files = [os.path.relpath(path, tmp_path) for path in iter_partition_files(str(tmp_path))]
+    assert files == [os.path.join(t, f'{day}.jsonl') for t in ('earnings', 'splits') for day in DAYS]
+    # 파티션 파일에는 해당 이벤트 타입/날짜의 행만 있음
+    with open(tmp_path / 'earnings' / '2025-03-14.jsonl', encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [r['Symbol'] for r in lines] == ['E30', 'E31', 'E32']
+    assert {(r['event_type'], r['date']) for r in lines} == {('earnings', '2025-03-14')}
+
+
+def test_jsonl_round_trip_dtypes(tmp_path):
+    records = _records()
+    _write_jsonl(tmp_path, records)
+    # 비정상 종료로 잘린 마지막 줄은 건너뜀
+    with open(tmp_path / 'splits' / '2025-04-15.jsonl', 'a', encoding='utf-8') as f:
+        f.write('{"event_type": "splits", "date": "2025-04-')
+
+    frames = load_event_frames(str(tmp_path), {'earnings': None, 'splits': None})
+    earnings, splits = frames['earnings'], frames['splits']
+    assert sorted(earnings['Symbol']) == sorted(r['Symbol'] for r in records if r['event_type'] == 'earnings')
+    assert list(splits['Symbol']) == [f'S{i}' for i in range(len(DAYS))]
+    assert pd.api.types.is_datetime64_any_dtype(earnings['date'])
+    assert earnings['EPS Estimate'].dtype == float and earnings['Reported EPS'].dtype == float
+    assert earnings['Reported EPS'].isna().sum() == 2 * len(DAYS)
+    assert pd.api.types.is_datetime64_any_dtype(splits['Payable On'])
+    assert list(splits['Payable On'].dt.strftime('%Y-%m-%d')) == DAYS
+    # 다른 이벤트 타입에만 있는 컬럼은 없음
+    assert 'EPS Estimate' not in splits.columns and 'Payable On' not in earnings.columns
+
+    # JSON Lines 와 Parquet 저장소에서 읽은 값이 같음
+    _write_parquet(tmp_path / 'store', records)
+    parquet = load_event_frames(str(tmp_path / 'store'), {'earnings': None, 'splits': None})
+    for event_type, frame in frames.items():
+        columns = [c for c in frame.columns if c != 'crawl_date']
+        expected = frame[columns].sort_values(['date', 'Symbol']).reset_index(drop=True)
+        actual = parquet[event_type][columns].sort_values(['date', 'Symbol']).reset_index(drop=True)
+        # 날짜 컬럼의 시간 단위(ms/us)만 다를 수 있음
+        assert [dtype.kind for dtype in actual.dtypes] == [dtype.kind for dtype in expected.dtypes]
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
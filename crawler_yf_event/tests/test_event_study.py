@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crawler_yf_event.event_study import build_price_matrix, event_window_metrics, event_window_series
+
+METRICS = ['pre_event_return', 'post_event_return', 'total_return',
+           'post_event_volatility', 'max_drawdown', 'volume_change']
+
+
+def _frames():
+    """거래일이 서로 다른 종목별 일봉 (BBB 는 일부 날짜가 없고, CCC 는 늦게 상장)"""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2024-01-01', '2024-08-30')
+    frames = {}
+    for ticker, index in [
+        ('AAA', dates),
+        ('BBB', dates.delete(list(range(20, 170, 9)))),
+        ('CCC', dates[dates >= '2024-04-15']),
+    ]:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+        volume = rng.integers(1_000, 50_000, len(index)).astype(float)
+        volume[::17] = np.nan
+        frames[ticker] = pd.DataFrame({'Close': close, 'Volume': volume}, index=index)
+    # 이벤트 이후 계속 하락만 하는 종목 (누적 최고값이 0 인 낙폭)
+    index = pd.bdate_range('2024-05-01', '2024-07-31')
+    frames['DDD'] = pd.DataFrame({'Close': np.linspace(50, 30, len(index)), 'Volume': 1000.0}, index=index)
+    return frames
+
+
+def _baseline(price_df, event_date, pre_months=3, post_months=1):
+    """벡터화 이전의 종목별 계산 (event_stock_analysis.create_event_summary_table)"""
+    if event_date not in price_df.index:
+        return None
+    event_price = price_df.loc[event_date, 'Close']
+    normalized_prices = price_df['Close'] / event_price - 1
+    pre_event_date = event_date - pd.DateOffset(months=pre_months)
+    post_event_date = event_date + pd.DateOffset(months=post_months)
+
+    pre_event_return = normalized_prices[pre_event_date:event_date].iloc[-1]
+    post_event_return = normalized_prices[event_date:post_event_date].iloc[-1]
+    total_return = normalized_prices[pre_event_date:post_event_date].iloc[-1]
+    post_event_volatility = normalized_prices[event_date:post_event_date].std() * np.sqrt(252)
+    post_event_data = normalized_prices[event_date:post_event_date]
+    max_drawdown = (post_event_data.cummax() - post_event_data) / post_event_data.cummax()
+    max_drawdown = max_drawdown.max()
+    pre_event_volume = price_df[pre_event_date:event_date].Volume.mean()
+    post_event_volume = price_df[event_date:post_event_date].Volume.mean()
+    volume_change = (post_event_volume / pre_event_volume - 1)
+    return [pre_event_return, post_event_return, total_return, post_event_volatility, max_drawdown, volume_change]
+
+
+EVENTS = pd.DataFrame([
+    ('AAA', '2024-05-15'),  # 윈도우 전체가 범위 안
+    ('AAA', '2024-01-01'),  # 첫 거래일: 이전 윈도우 없음
+    ('AAA', '2024-02-10'),  # 이전 윈도우가 범위 앞에서 잘림 (토요일이라 가격 없음)
+    ('AAA', '2024-02-12'),  # 이전 윈도우가 범위 앞에서 잘림
+    ('AAA', '2024-08-30'),  # 마지막 거래일: 이후 윈도우는 하루
+    ('AAA', '2024-08-20'),  # 이후 윈도우가 범위 끝에서 잘림
+    ('AAA', '2024-09-10'),  # 범위 이후
+    ('AAA', '2023-12-01'),  # 범위 이전
+    ('BBB', '2024-03-12'),  # 일부 날짜가 없는 종목
+    ('BBB', str(pd.bdate_range('2024-01-01', '2024-08-30')[29].date())),  # BBB 에 없는 날짜
+    ('CCC', '2024-04-15'),  # 상장일
+    ('CCC', '2024-07-01'),
+    ('CCC', '2024-03-01'),  # 상장 전
+    ('DDD', '2024-05-01'),  # 계속 하락
+    ('ZZZ', '2024-05-15'),  # 가격이 없는 종목
+], columns=['Symbol', 'date'])
+
+
+@pytest.mark.parametrize('pre_months,post_months', [(3, 1), (1, 2)])
+def test_vectorized_metrics_match_per_event_loop(pre_months, post_months):
+    frames = _frames()
+    result = event_window_metrics(build_price_matrix(frames), EVENTS, pre_months, post_months)
+    assert list(result['Symbol']) == list(EVENTS['Symbol'])
+
+    for row in result.itertuples(index=False):
+        expected = _baseline(frames[row.Symbol], row.date, pre_months, post_months) if row.Symbol in frames else None
+        assert row.valid == (expected is not None), (row.Symbol, row.date)
+        actual = [getattr(row, name) for name in METRICS]
+        if expected is None:
+            assert np.isnan(actual).all()
+        else:
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, equal_nan=True, err_msg=f'{row.Symbol} {row.date}')
+    assert result['valid'].sum() == 9
+    # 계속 하락한 종목의 낙폭은 기존 계산과 같이 무한대
+    assert result.loc[result['Symbol'] == 'DDD', 'max_drawdown'].iloc[0] == np.inf
+
+
+def test_window_series_matches_per_event_loop():
+    frames = _frames()
+    matrix = build_price_matrix(frames)
+    for ticker, day in [('AAA', '2024-05-15'), ('BBB', '2024-03-12'), ('CCC', '2024-04-15')]:
+        event_date = pd.Timestamp(day)
+        price_df = frames[ticker]
+        normalized = price_df['Close'] / price_df.loc[event_date, 'Close'] - 1
+        expected = normalized[(price_df.index >= event_date - pd.DateOffset(months=3))
+                              & (price_df.index <= event_date + pd.DateOffset(months=1))]
+        pd.testing.assert_series_equal(event_window_series(matrix, ticker, day), expected,
+                                       check_names=False, check_freq=False)
+    assert event_window_series(matrix, 'BBB', EVENTS['date'][9]) is None
+    assert event_window_series(matrix, 'ZZZ', '2024-05-15') is None
+
+
+def test_empty_inputs():
+    empty = build_price_matrix({'AAA': pd.DataFrame(columns=['Close', 'Volume'])})
+    result = event_window_metrics(empty, EVENTS)
+    assert len(result) == len(EVENTS) and not result['valid'].any()
+    assert event_window_metrics(build_price_matrix(_frames()), EVENTS.iloc[:0]).empty
@@ -0,0 +1,102 @@
+import json
+import re
+
+from stub_server import StubCalendarServer
+
+# 2025-03-07 (금): earnings 250행(100행씩 3페이지), economic/ipo/splits 각 1페이지
+DAY = '2025-03-07'
+PAGES = {'earnings': 3, 'economic': 1, 'ipo': 1, 'splits': 1}
+ROWS = {'earnings': 250, 'economic': 30, 'ipo': 4, 'splits': 3}
+
+SAMPLE = re.compile(r'^(yf_crawl_[a-z_]+)(\{([a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*)?\})? (\S+)$')
+
+
+def _crawl(run_crawler_cli, server, *args):
+    run_crawler_cli('--base-url', server.base_url, '--start-date', DAY, '--end-date', DAY,
+                    '--no-cache', '--metrics', 'metrics', *args)
+
+
+def _series(summary, kind, name):
+    return {tuple(sorted(s['labels'].items())): s for s in summary[kind][name]}
+
+
+def _samples(text):
+    """Prometheus 텍스트 -> {(이름, 라벨 튜플): 값}"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            assert re.match(r'^# (HELP yf_crawl_[a-z_]+ .+|TYPE yf_crawl_[a-z_]+ (histogram|counter|gauge))$', line), line
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        labels = tuple(re.findall(r'([a-z_]+)="([^"]*)"', match.group(3) or ''))
+        samples[(match.group(1), labels)] = float(match.group(5))
+    return samples
+
+
+def test_metrics_are_off_by_default(tmp_path, run_crawler_cli):
+    with StubCalendarServer() as server:
+        run_crawler_cli('--base-url', server.base_url, '--start-date', DAY, '--end-date', DAY,
+                        '--events', 'splits', '--no-cache')
+    assert not list(tmp_path.rglob('crawl_metrics.*'))
+
+
+def test_metrics_per_event_type(tmp_path, run_crawler_cli):
+    with StubCalendarServer() as server:
+        _crawl(run_crawler_cli, server)
+        requests = server.requests
+    assert requests == sum(PAGES.values())
+
+    summary = json.loads((tmp_path / 'metrics' / 'crawl_metrics.json').read_text(encoding='utf-8'))
+    assert summary['items'] == sum(ROWS.values())
+    pages = _series(summary, 'counters', 'pages_total')
+    assert pages == {
+        (('event_type', event_type), ('source', 'network')): {
+            'labels': {'event_type': event_type, 'source': 'network'}, 'value': count,
+        }
+        for event_type, count in PAGES.items()
+    }
+    items = _series(summary, 'histograms', 'items_per_page')
+    for event_type, rows in ROWS.items():
+        histogram = items[(('event_type', event_type),)]
+        assert histogram['count'] == PAGES[event_type]
+        assert histogram['sum'] == rows
+    assert 'retries_total' not in summary['counters']
+
+    text = (tmp_path / 'metrics' / 'crawl_metrics.prom').read_text(encoding='utf-8')
+    samples = _samples(text)
+    assert '# TYPE yf_crawl_items_per_page histogram' in text
+    assert '# TYPE yf_crawl_pages_total counter' in text
+    assert '# TYPE yf_crawl_elapsed_seconds gauge' in text
+    for event_type, count in PAGES.items():
+        labels = (('event_type', event_type), ('source', 'network'))
+        assert samples[('yf_crawl_pages_total', labels)] == count
+        # 누적 버킷은 줄지 않고, +Inf 버킷은 _count 와 같음
+        buckets = [value for (name, labels), value in samples.items()
+                   if name == 'yf_crawl_items_per_page_bucket' and labels[0] == ('event_type', event_type)]
+        assert buckets == sorted(buckets)
+        inf = samples[('yf_crawl_items_per_page_bucket', (('event_type', event_type), ('le', '+Inf')))]
+        assert inf == samples[('yf_crawl_items_per_page_count', (('event_type', event_type),))] == count
+        assert samples[('yf_crawl_items_per_page_sum', (('event_type', event_type),))] == ROWS[event_type]
+
+
+def test_metrics_count_throttle_retries(tmp_path, run_crawler_cli):
+    with StubCalendarServer(throttle_every=3) as server:
+        _crawl(run_crawler_cli, server, '--events', 'earnings,splits')
+        requests = server.requests
+    throttled = requests // 3
+    assert throttled
+
+    summary = json.loads((tmp_path / 'metrics' / 'crawl_metrics.json').read_text(encoding='utf-8'))
+    # 재시도된 429 응답은 페이지로 세지 않고 사유별 재시도 횟수로만 셈
+    pages = {s['labels']['event_type']: s['value'] for s in summary['counters']['pages_total']}
+    assert pages == {'earnings': PAGES['earnings'], 'splits': PAGES['splits']}
+    assert sum(pages.values()) == requests - throttled
+    retries = {s['labels']['reason']: s['value'] for s in summary['counters']['retries_total']}
+    assert sum(v for reason, v in retries.items() if reason.startswith('429')) == throttled
+    items = _series(summary, 'histograms', 'items_per_page')
+    assert items[(('event_type', 'earnings'),)]['count'] == PAGES['earnings']
+
+    samples = _samples((tmp_path / 'metrics' / 'crawl_metrics.prom').read_text(encoding='utf-8'))
+    prom_retries = {labels: value for (name, labels), value in samples.items() if name == 'yf_crawl_retries_total'}
+    assert sum(prom_retries.values()) == sum(retries.values())
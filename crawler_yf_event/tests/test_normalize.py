@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from crawler_yf_event.normalize import EVENT_TIME_UTC_COLUMN, parse_event_times, parse_time_offsets
+
+CASES = [
+    # (발표 시각 문자열, 이벤트 날짜 기준 UTC 시각 또는 None)
+    ('8:30 AM UTC', '08:30'),
+    ('12:00 PM UTC', '12:00'),  # 정오
+    ('12:15 AM UTC', '00:15'),  # 자정 직후
+    ('11:59 PM UTC', '23:59'),
+    (' 9:05 pm UTC ', '21:05'),  # 앞뒤 공백, 소문자 오전/오후
+    ('14:00 UTC', '14:00'),  # 24시간 형식
+    ('14:00', '14:00'),  # UTC 표기 없음
+    ('0:00 UTC', '00:00'),
+    ('TBD', None),
+    ('', None),
+    ('-', None),
+    ('25:00 UTC', None),
+    ('8:30 AM EST', None),  # UTC 가 아닌 시간대는 해석하지 않음
+    (None, None),
+    (float('nan'), None),
+]
+
+
+def test_parse_event_times_formats():
+    times = pd.Series([time for time, _ in CASES], index=range(100, 100 + len(CASES)))
+    dates = pd.Series(pd.Timestamp('2025-03-07'), index=times.index)
+    result = parse_event_times(dates, times)
+
+    assert str(result.dtype) == 'datetime64[ns, UTC]'
+    assert list(result.index) == list(times.index)
+    for (time, expected), value in zip(CASES, result):
+        if expected is None:
+            assert pd.isna(value), time
+        else:
+            assert value == pd.Timestamp(f'2025-03-07 {expected}', tz='UTC'), time
+
+
+def test_event_time_utc_column_per_row_dates():
+    # analyze_events 와 같이 economic 이벤트 프레임에 열을 추가
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2025-03-06', '2025-03-07 18:00', '2025-03-07', None, '2025-03-10'], format='ISO8601'),
+        'Event Time': ['8:30 AM UTC', '8:30 AM UTC', '-', '10:00 AM UTC', '1:45 PM UTC'],
+    })
+    df[EVENT_TIME_UTC_COLUMN] = parse_event_times(df['date'], df['Event Time'])
+    assert df[EVENT_TIME_UTC_COLUMN].tolist()[:2] == [
+        pd.Timestamp('2025-03-06 08:30', tz='UTC'),
+        pd.Timestamp('2025-03-07 08:30', tz='UTC'),  # 날짜의 시각은 버리고 발표 시각을 사용
+    ]
+    assert pd.isna(df[EVENT_TIME_UTC_COLUMN][2])
+    assert pd.isna(df[EVENT_TIME_UTC_COLUMN][3])  # 날짜가 없음
+    assert df[EVENT_TIME_UTC_COLUMN][4] == pd.Timestamp('2025-03-10 13:45', tz='UTC')
+
+
+def test_parse_time_offsets_repeated_values_and_custom_formats():
+    times = pd.Series(['8:30 AM UTC', '10:00 UTC', 'n/a', '8:30 AM UTC', '10:00 UTC'] * 3)
+    offsets = parse_time_offsets(times)
+    morning, ten = pd.Timedelta(hours=8, minutes=30), pd.Timedelta(hours=10)
+    expected = pd.Series([morning, ten, pd.NaT, morning, ten] * 3, dtype='timedelta64[ns]')
+    pd.testing.assert_series_equal(offsets, expected)
+
+    # 형식 목록의 앞 형식부터 적용
+    offsets = parse_time_offsets(pd.Series(['0830', '8:30 AM']), formats=['%H%M'])
+    assert offsets[0] == pd.Timedelta(hours=8, minutes=30) and pd.isna(offsets[1])
+
+
+@pytest.mark.parametrize('times', [pd.Series([], dtype=object), pd.Series([None, None])])
+def test_no_parseable_times(times):
+    result = parse_event_times(pd.Series(pd.Timestamp('2025-03-07'), index=times.index), times)
+    assert len(result) == len(times) and result.isna().all()
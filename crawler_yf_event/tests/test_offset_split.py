@@ -0,0 +1,65 @@
+import urllib.request
+from collections import Counter, deque
+
+import pytest
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+from stub_server import StubCalendarServer, calendar_rows
+
+DAY = '2025-03-07'
+
+
+def _crawl(server, **settings):
+    """스텁 서버에서 요청을 차례로 받아 파싱하고 (항목 목록, 요청 URL 목록) 반환"""
+    crawler = get_crawler(YFCalendarSpider, {
+        'CALENDAR_PAGE_SIZES': {'earnings': 250},
+        'CALENDAR_SPLIT_SORT_FIELDS': {'earnings': 'ticker'},
+        **settings,
+    })
+    spider = YFCalendarSpider.from_crawler(crawler, base_url=server.base_url, start_date=DAY, end_date=DAY,
+                                           events='earnings')
+    items, urls = [], []
+    queue = deque(spider.start_requests())
+    while queue:
+        request = queue.popleft()
+        urls.append(request.url)
+        with urllib.request.urlopen(urllib.request.Request(request.url, headers=request.headers.to_unicode_dict())) as r:
+            body = r.read()
+        for output in spider.parse(HtmlResponse(request.url, body=body, request=request)):
+            (queue if isinstance(output, Request) else items).append(output)
+    assert not spider.pending_pages
+    return items, urls
+
+
+@pytest.mark.parametrize('total', [650, 700, 799, 800])
+def test_rows_beyond_offset_limit_are_collected_once(total):
+    # 상한 offset 300: 정방향 0~399행, 나머지는 역순으로 끝에서부터
+    with StubCalendarServer(page_limit=100, counts={'earnings': total}) as server:
+        items, urls = _crawl(server, CALENDAR_MAX_OFFSETS={'earnings': 300})
+    tickers = Counter(item.values[0] for item in items)
+    expected = [row['cells'][0] for row in calendar_rows('earnings', DAY, {'earnings': total})]
+    assert sorted(tickers) == sorted(expected)
+    assert set(tickers.values()) == {1}
+    # 첫 요청 이후 모든 페이지는 사이트가 허용한 크기(100) 이하로 요청
+    assert 'size=250' in urls[0] and all('size=250' not in url for url in urls[1:])
+    assert sum('sortType=DESC' in url for url in urls) == -(-(total - 400) // 100)
+
+
+def test_rows_beyond_both_halves_are_skipped_without_duplicates():
+    # 정방향 200행 + 역순 200행만 받을 수 있고 가운데 250행은 받지 못함
+    with StubCalendarServer(page_limit=100, counts={'earnings': 650}) as server:
+        items, _ = _crawl(server, CALENDAR_MAX_OFFSETS={'earnings': 100})
+    rows = [row['cells'][0] for row in calendar_rows('earnings', DAY, {'earnings': 650})]
+    tickers = [item.values[0] for item in items]
+    assert sorted(tickers) == sorted(rows[:200] + rows[-200:])
+
+
+def test_without_split_sort_field_rows_beyond_limit_are_skipped():
+    with StubCalendarServer(page_limit=100, counts={'earnings': 650}) as server:
+        items, urls = _crawl(server, CALENDAR_MAX_OFFSETS={'earnings': 300}, CALENDAR_SPLIT_SORT_FIELDS={})
+    rows = [row['cells'][0] for row in calendar_rows('earnings', DAY, {'earnings': 650})]
+    assert [item.values[0] for item in items] == rows[:400]
+    assert not any('sortType' in url for url in urls)
@@ -0,0 +1,107 @@
+from parsel import Selector
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from benchmarks.bench_parse import compiled_parse, legacy_parse
+from crawler_yf_event.parsing import CalendarTableParser, EmbeddedStateParser
+from crawler_yf_event.schema import EVENT_SCHEMAS
+from crawler_yf_event.spiders.yf_calendar_spider import YFCalendarSpider
+from stub_server import calendar_rows
+
+
+def _root(body):
+    return Selector(text=body.decode('utf-8')).root
+
+
+def _expected_rows(meta):
+    rows = calendar_rows(meta['event_type'], meta['date'])
+    offset = meta['offset']
+    return [tuple(cell or None for cell in row['cells']) for row in rows[offset:offset + 100]]
+
+
+def test_recorded_pages_cover_every_event_type(recorded_pages):
+    event_types = {meta['meta']['event_type'] for meta, _ in recorded_pages}
+    assert event_types == {'earnings', 'economic', 'ipo', 'splits'}
+    # 실적 발표는 250건이므로 100행 페이지 3개
+    offsets = sorted(meta['meta']['offset'] for meta, _ in recorded_pages
+                     if meta['meta']['event_type'] == 'earnings' and meta['meta']['date'] == '2025-03-07')
+    assert offsets == [0, 100, 200]
+
+
+def test_table_parser_rows(recorded_pages):
+    parser = CalendarTableParser()
+    for meta, body in recorded_pages:
+        meta = meta['meta']
+        page = parser.parse(_root(body), meta['event_type'])
+        expected = _expected_rows(meta)
+        if not expected:
+            continue
+        assert page.table is not None
+        assert page.total_results == len(calendar_rows(meta['event_type'], meta['date']))
+        assert page.rows == expected
+
+
+def test_table_parser_matches_legacy_extraction(recorded_pages):
+    parser = CalendarTableParser()
+    for meta, body in recorded_pages:
+        event_type = meta['meta']['event_type']
+        html = body.decode('utf-8')
+        assert compiled_parse(parser, html, event_type) == legacy_parse(html, event_type)
+
+
+def test_empty_day_page(recorded_pages):
+    parser = CalendarTableParser()
+    empty = [(meta['meta'], body) for meta, body in recorded_pages if meta['meta']['date'] == '2025-03-08']
+    assert len(empty) == 4
+    for meta, body in empty:
+        page = parser.parse(_root(body), meta['event_type'])
+        assert page.table is None
+        assert parser.is_empty(_root(body))
+
+
+def _coerced(page, event_type):
+    coerce, unknown = EVENT_SCHEMAS[event_type].row_coercer(page.headers)
+    assert unknown == []
+    return [coerce(row) for row in page.rows]
+
+
+def test_embedded_parser_matches_table_parser(recorded_pages):
+    table_parser = CalendarTableParser()
+    embedded_parser = EmbeddedStateParser()
+    earnings = [(meta['meta'], body) for meta, body in recorded_pages
+                if meta['meta']['event_type'] == 'earnings' and meta['meta']['date'] == '2025-03-07']
+    assert earnings
+    for meta, body in earnings:
+        root = _root(body)
+        embedded = embedded_parser.parse(root, 'earnings')
+        table = table_parser.parse(root, 'earnings')
+        assert embedded is not None
+        assert embedded.total_results == table.total_results == 250
+        assert _coerced(embedded, 'earnings') == _coerced(table, 'earnings')
+
+
+def test_embedded_parser_without_embedded_data(recorded_pages):
+    parser = EmbeddedStateParser()
+    for meta, body in recorded_pages:
+        if meta['meta']['event_type'] != 'earnings' or meta['meta']['date'] != '2025-03-07':
+            assert parser.parse(_root(body), meta['meta']['event_type']) is None
+
+
+def test_spider_embedded_backend_falls_back_to_table(recorded_pages):
+    settings = {'EXTRACTION_BACKENDS': {event_type: 'embedded' for event_type in EVENT_SCHEMAS}}
+    spider = YFCalendarSpider.from_crawler(get_crawler(YFCalendarSpider, settings))
+    table_parser = CalendarTableParser()
+    for header, body in recorded_pages:
+        meta = header['meta']
+        if not _expected_rows(meta):
+            continue
+        request = Request(header['url'], meta=dict(meta))
+        response = HtmlResponse(header['url'], body=body, headers=header['headers'], request=request)
+        page = spider.extract_page(response, meta['event_type'])
+        if meta['event_type'] == 'earnings':
+            assert page.table.tag == 'script'
+        else:
+            assert page.table.tag == 'table'
+        assert _coerced(page, meta['event_type']) == _coerced(table_parser.parse(_root(body), meta['event_type']),
+                                                              meta['event_type'])
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import pandas as pd
+
+from crawler_yf_event.price_cache import PriceCache
+
+
+class FakeProvider:
+    """요청을 기록하고 listed 에 있는 종목만 평일 일봉을 돌려주는 제공자"""
+
+    def __init__(self, listed):
+        self.listed = set(listed)
+        self.calls = []
+
+    def download(self, tickers, start, end):
+        self.calls.append((tuple(tickers), start, end))
+        index = pd.bdate_range(start, end, inclusive='left', name='Date')
+        return {
+            ticker: pd.DataFrame({'Close': 1.0, 'High': 1.0, 'Low': 1.0, 'Open': 1.0, 'Volume': 100}, index=index)
+            for ticker in tickers if ticker in self.listed
+        }
+
+
+def test_update_fetches_only_missing_ranges(tmp_path):
+    provider = FakeProvider(['AAA'])
+    cache = PriceCache(str(tmp_path), provider=provider)
+    cache.update(['AAA'], datetime(2025, 3, 3), datetime(2025, 3, 10))
+    cache.update(['AAA'], datetime(2025, 2, 24), datetime(2025, 3, 12))
+    # 두 번째 요청은 앞쪽 빠진 구간과 마지막 거래일부터의 끝 구간만
+    assert provider.calls[1:] == [
+        (('AAA',), datetime(2025, 2, 24), datetime(2025, 3, 3)),
+        (('AAA',), datetime(2025, 3, 7), datetime(2025, 3, 12)),
+    ]
+    assert cache.coverage['AAA'] == ['2025-02-24', '2025-03-12', '2025-03-11']
+    assert len(cache.load('AAA')) == 12
+
+
+def test_update_without_data_does_not_mark_coverage(tmp_path):
+    provider = FakeProvider(['AAA'])
+    cache = PriceCache(str(tmp_path), provider=provider)
+    cache.update(['AAA', 'BBB'], datetime(2025, 3, 3), datetime(2025, 3, 10))
+    assert 'BBB' not in cache.coverage
+    assert cache.load('BBB') is None
+
+    # 데이터를 받지 못한 종목은 다음 실행에서 다시 요청
+    provider.listed.add('BBB')
+    cache = PriceCache(str(tmp_path), provider=provider)
+    cache.update(['AAA', 'BBB'], datetime(2025, 3, 3), datetime(2025, 3, 10))
+    assert (('BBB',), datetime(2025, 3, 3), datetime(2025, 3, 10)) in provider.calls
+    assert cache.coverage['BBB'] == ['2025-03-03', '2025-03-10', '2025-03-07']
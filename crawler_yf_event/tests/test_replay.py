@@ -0,0 +1,60 @@
+import pytest
+from scrapy import Request
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import HtmlResponse
+
+from conftest import FIXTURE_BASE_URL, FIXTURE_DAYS, FIXTURE_DIR
+from crawler_yf_event.middlewares import ReplayMiddleware
+from crawler_yf_event.response_store import ResponseStore
+from stub_server import WEEKDAY_COUNTS
+
+
+def test_record_then_replay_round_trip(tmp_path, recorded_pages):
+    recorder = ReplayMiddleware('record', ResponseStore(str(tmp_path)))
+    for header, body in recorded_pages:
+        request = Request(header['url'], meta=dict(header['meta'], retry_count=0))
+        headers = dict(header['headers'], **{'Content-Length': [str(len(body))]})
+        response = HtmlResponse(header['url'], status=header['status'], headers=headers, body=body, request=request)
+        assert recorder.process_response(request, response, None) is response
+    assert recorder.count == len(recorded_pages)
+
+    player = ReplayMiddleware('replay', ResponseStore(str(tmp_path)))
+    for header, body in recorded_pages:
+        stored, _ = ResponseStore(str(tmp_path)).load(header['url'])
+        # 요청 메타데이터 중 이벤트 정보만 남기고, 본문 길이처럼 재생 시 맞지 않는 헤더는 저장하지 않음
+        assert stored['meta'] == header['meta']
+        assert 'Content-Length' not in stored['headers']
+
+        replayed = player.process_request(Request(header['url']), None)
+        assert replayed.body == body
+        assert replayed.status == header['status']
+        assert replayed.headers.get('Content-Type') == header['headers']['Content-Type'][0].encode('latin-1')
+        assert 'replay' in replayed.flags
+
+
+def test_replay_does_not_record_replayed_or_error_responses(tmp_path):
+    recorder = ReplayMiddleware('record', ResponseStore(str(tmp_path)))
+    request = Request(FIXTURE_BASE_URL + 'earnings?day=2025-03-07')
+    recorder.process_response(request, HtmlResponse(request.url, status=429, body=b''), None)
+    recorder.process_response(request, HtmlResponse(request.url, body=b'x', flags=['replay']), None)
+    assert recorder.count == 0
+    assert ResponseStore(str(tmp_path)).load(request.url) is None
+
+
+def test_replay_without_recording_is_ignored():
+    player = ReplayMiddleware('replay', ResponseStore(FIXTURE_DIR))
+    with pytest.raises(IgnoreRequest):
+        player.process_request(Request(FIXTURE_BASE_URL + 'earnings?day=1999-01-01'), None)
+
+
+def test_replay_crawl_is_offline_and_complete(run_crawler_cli):
+    # 기록된 응답만으로 크롤링 (대체 서버를 띄우지 않으므로 네트워크 요청이 있으면 항목이 빠짐)
+    events = run_crawler_cli(
+        '--replay', FIXTURE_DIR, '--base-url', FIXTURE_BASE_URL, '--no-cache',
+        '--start-date', FIXTURE_DAYS[0], '--end-date', FIXTURE_DAYS[-1],
+    )
+    counts = {}
+    for event in events:
+        counts[event['event_type']] = counts.get(event['event_type'], 0) + 1
+    assert counts == WEEKDAY_COUNTS
+    assert {event['date'] for event in events} == {FIXTURE_DAYS[0]}
@@ -0,0 +1,132 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crawler_yf_event.report import PLOTLYJS_MODES, HtmlReport, downsample_series
+
+PLOTLYJS = '/* plotly.js stub */ window.Plotly = {};'
+VERSION = '9.9.9'
+
+
+class FakeFigure:
+    """fig.to_html 호출 방식만 확인하는 그래프"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def to_html(self, full_html=True, include_plotlyjs=True):
+        assert full_html is False and include_plotlyjs is False
+        return f'<div id="{self.name}"></div>'
+
+
+@pytest.fixture
+def fake_plotly(monkeypatch):
+    """plotly.offline 의 plotly.js 조회 함수만 흉내 (plotly 가 없어도 실행)"""
+    offline = types.ModuleType('plotly.offline')
+    offline.get_plotlyjs = lambda: PLOTLYJS
+    offline.get_plotlyjs_version = lambda: VERSION
+    plotly = types.ModuleType('plotly')
+    plotly.offline = offline
+    monkeypatch.setitem(sys.modules, 'plotly', plotly)
+    monkeypatch.setitem(sys.modules, 'plotly.offline', offline)
+
+
+def _write(path, mode, figures=3):
+    report = HtmlReport('Report <1>', plotlyjs=mode)
+    report.heading('Charts')
+    for i in range(figures):
+        report.figure(FakeFigure(f'fig{i}'))
+    report.table(pd.DataFrame({'a': [1, 2]}))
+    report.write(str(path))
+    return path.read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('mode', PLOTLYJS_MODES)
+def test_plotlyjs_included_once(tmp_path, fake_plotly, mode):
+    text = _write(tmp_path / 'report.html', mode)
+    assert text.count('<script') == 1
+    assert all(f'<div id="fig{i}"></div>' in text for i in range(3))
+    assert '<title>Report &lt;1&gt;</title>' in text
+    js_file = tmp_path / f'plotly-{VERSION}.min.js'
+    if mode == 'inline':
+        assert text.count(PLOTLYJS) == 1 and not js_file.exists()
+    elif mode == 'cdn':
+        assert f'<script src="https://cdn.plot.ly/plotly-{VERSION}.min.js"></script>' in text
+        assert PLOTLYJS not in text and not js_file.exists()
+    else:
+        assert f'<script src="plotly-{VERSION}.min.js"></script>' in text
+        assert PLOTLYJS not in text
+        assert js_file.read_text(encoding='utf-8') == PLOTLYJS
+
+
+def test_directory_mode_shares_one_file(tmp_path, fake_plotly):
+    _write(tmp_path / 'first.html', 'directory')
+    js_file = tmp_path / f'plotly-{VERSION}.min.js'
+    js_file.write_text('existing', encoding='utf-8')
+    _write(tmp_path / 'second.html', 'directory')
+    # 이미 있는 파일은 다시 쓰지 않음
+    assert js_file.read_text(encoding='utf-8') == 'existing'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['first.html', js_file.name, 'second.html']
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        HtmlReport('Report', plotlyjs='embed')
+
+
+@pytest.mark.parametrize('mode', PLOTLYJS_MODES)
+def test_plotlyjs_included_once_with_plotly(tmp_path, mode):
+    go = pytest.importorskip('plotly.graph_objects')
+    from plotly.offline import get_plotlyjs
+
+    report = HtmlReport('Report', plotlyjs=mode)
+    for i in range(3):
+        report.figure(go.Figure(go.Scatter(x=[0, 1, 2], y=[i, i + 1, i])))
+    report.write(str(tmp_path / 'report.html'))
+    text = (tmp_path / 'report.html').read_text(encoding='utf-8')
+    assert text.count(get_plotlyjs()) == (1 if mode == 'inline' else 0)
+    assert text.count('.min.js"></script>') == (0 if mode == 'inline' else 1)
+
+
+def _series(values):
+    return pd.Series(values, index=pd.bdate_range('2024-01-01', periods=len(values)))
+
+
+def test_downsample_keeps_endpoints_and_extremes():
+    rng = np.random.default_rng(11)
+    values = np.cumsum(rng.normal(0, 1, 2000))
+    values[700] = values.max() + 50  # 급등
+    values[1300] = values.min() - 50  # 급락
+    series = _series(values)
+    event_day = series.index[1001]
+
+    points = downsample_series(series, max_points=100, keep=[event_day, pd.Timestamp('1999-01-01')])
+    assert len(points) <= 101
+    assert points.index.is_monotonic_increasing and points.index.is_unique
+    assert points.index[0] == series.index[0] and points.index[-1] == series.index[-1]
+    assert points.max() == series.max() and points.idxmax() == series.index[700]
+    assert points.min() == series.min() and points.idxmin() == series.index[1300]
+    assert event_day in points.index
+    # 남긴 점은 원래 값 그대로
+    pd.testing.assert_series_equal(points, series.loc[points.index])
+
+    # 구간마다 최소/최대값이 남음
+    edges = np.linspace(1, len(series) - 1, 50).astype(int)
+    for start, end in zip(edges[:-1], edges[1:]):
+        chunk = series.iloc[start:end]
+        assert chunk.max() in points.values and chunk.min() in points.values
+
+
+def test_downsample_short_and_missing_values():
+    series = _series(np.arange(50, dtype=float))
+    assert downsample_series(series, max_points=100) is series
+
+    values = np.full(500, np.nan)
+    values[[0, 10, 250, 499]] = [1.0, 5.0, -3.0, 2.0]
+    points = downsample_series(_series(values), max_points=20)
+    # 값이 모두 없는 구간은 건너뛰고, 처음/마지막 점은 유지
+    assert points.dropna().tolist() == [1.0, 5.0, -3.0, 2.0]
+    assert len(points) == 4
@@ -0,0 +1,109 @@
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from crawler_yf_event.middlewares import CrawlerYfEventDownloaderMiddleware
+from crawler_yf_event.response_store import ResponseStore
+from stub_server import StubCalendarServer
+
+TODAY = datetime.now().strftime('%Y-%m-%d')
+SETTLED_DAY = '2025-03-07'
+
+
+def _download(request):
+    """urllib 로 요청을 보내고 Scrapy 응답으로 변환 (304 포함)"""
+    headers = request.headers.to_unicode_dict()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(request.url, headers=headers)) as response:
+            status, response_headers, body = response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        status, response_headers, body = e.code, dict(e.headers), b''
+    return HtmlResponse(request.url, status=status, headers=response_headers, body=body, request=request)
+
+
+def _fetch(cache, server, event_type, day):
+    """다운로더 미들웨어 순서대로 캐시를 거쳐 한 페이지를 받기"""
+    request = Request(f'{server.base_url}{event_type}?day={day}', meta={'event_type': event_type, 'date': day})
+    response = cache.process_request(request, None)
+    if response is None:
+        response = cache.process_response(request, _download(request), None)
+    return response
+
+
+def _cache(tmp_path, ttl_hours=None):
+    return CrawlerYfEventDownloaderMiddleware(ResponseStore(str(tmp_path)), settled_days=3, ttl_hours=ttl_hours)
+
+
+def test_fresh_hit(tmp_path):
+    cache = _cache(tmp_path)
+    with StubCalendarServer() as server:
+        first = _fetch(cache, server, 'earnings', TODAY)
+        second = _fetch(cache, server, 'earnings', TODAY)
+        assert server.requests == 1
+    assert 'cached' not in first.flags
+    assert second.flags == ['cached'] and second.body == first.body
+    assert cache.counts == {'fresh': 1, 'revalidated': 0, 'miss': 1, 'stale': 0}
+
+
+def test_stale_entry_is_revalidated_per_event_type(tmp_path):
+    # earnings 의 오늘 페이지는 바로 만료, ipo 는 1시간 동안 신선
+    cache = _cache(tmp_path, {'earnings': {'today': 0}, 'ipo': {'today': 1}})
+    with StubCalendarServer() as server:
+        first = _fetch(cache, server, 'earnings', TODAY)
+        _fetch(cache, server, 'ipo', TODAY)
+        revalidated = _fetch(cache, server, 'earnings', TODAY)
+        fresh = _fetch(cache, server, 'ipo', TODAY)
+        assert server.requests == 3
+    # 서버는 304 만 보내고 저장된 본문을 그대로 사용
+    assert revalidated.status == 200
+    assert revalidated.flags == ['cached', 'revalidated'] and revalidated.body == first.body
+    assert revalidated.request.headers.get('If-None-Match') == first.headers.get('ETag')
+    assert fresh.flags == ['cached']
+    assert cache.counts == {'fresh': 1, 'revalidated': 1, 'miss': 2, 'stale': 0}
+
+
+def test_changed_page_replaces_stale_entry(tmp_path):
+    cache = _cache(tmp_path, {'splits': {'future': 0}})
+    # 이벤트가 있는 다음 평일
+    day = datetime.now() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    day = day.strftime('%Y-%m-%d')
+    with StubCalendarServer() as server:
+        first = _fetch(cache, server, 'splits', day)
+        port = server.httpd.server_address[1]
+    # 같은 날짜라도 이벤트 수가 바뀌면 ETag 가 달라져 새 본문을 받음
+    with StubCalendarServer(port=port, counts={'splits': 5}) as server:
+        changed = _fetch(cache, server, 'splits', day)
+    assert 'cached' not in changed.flags and changed.body != first.body
+    assert ResponseStore(str(tmp_path)).load(changed.url)[1] == changed.body
+    assert cache.counts['stale'] == 1
+
+
+def test_settled_day_never_expires(tmp_path):
+    cache = _cache(tmp_path, {'earnings': {'recent': 0, 'today': 0, 'future': 0}})
+    with StubCalendarServer() as server:
+        _fetch(cache, server, 'earnings', SETTLED_DAY)
+        # 오래 전에 저장된 항목도 확정된 날짜이면 그대로 사용
+        url = f'{server.base_url}earnings?day={SETTLED_DAY}'
+        entry, body = ResponseStore(str(tmp_path)).load(url)
+        ResponseStore(str(tmp_path)).save(url, entry['status'], entry['headers'], body, entry['meta'])
+        cached = _fetch(cache, server, 'earnings', SETTLED_DAY)
+        assert server.requests == 1
+    assert cached.flags == ['cached']
+
+
+def test_run_crawler_enables_the_cache(tmp_path, run_crawler_cli):
+    args = ('--start-date', SETTLED_DAY, '--end-date', SETTLED_DAY, '--events', 'splits,ipo')
+    with StubCalendarServer() as server:
+        run_crawler_cli('--base-url', server.base_url, *args)
+        requests = server.requests
+        events = run_crawler_cli('--base-url', server.base_url, *args)
+        assert server.requests == requests
+        run_crawler_cli('--base-url', server.base_url, '--no-cache', *args)
+        assert server.requests == 2 * requests
+    assert len(events) == 7
+    assert (tmp_path / 'yf_response_cache').is_dir()
@@ -0,0 +1,51 @@
+import sqlite3
+
+from crawler_yf_event.crawl_state import CrawlStateIndex
+from stub_server import StubCalendarServer, WEEKDAY_COUNTS
+
+EVENT_TYPES = sorted(WEEKDAY_COUNTS)
+
+
+def _completed_days(path):
+    with sqlite3.connect(path) as conn:
+        return dict(((event_type, day), pages) for event_type, day, pages in conn.execute(
+            'SELECT event_type, day, pages FROM days'))
+
+
+def test_merge_keeps_latest_records(tmp_path):
+    main = CrawlStateIndex(str(tmp_path / 'main.sqlite3'))
+    shard = CrawlStateIndex(str(tmp_path / 'shard.sqlite3'))
+    main.conn.execute("INSERT INTO days VALUES ('ipo', '2025-03-07', 1, '2025-03-08 00:00:00')")
+    main.conn.execute("INSERT INTO days VALUES ('ipo', '2025-03-06', 1, '2025-03-20 00:00:00')")
+    shard.conn.execute("INSERT INTO days VALUES ('ipo', '2025-03-07', 2, '2025-03-20 00:00:00')")
+    shard.conn.execute("INSERT INTO days VALUES ('ipo', '2025-03-06', 3, '2025-03-07 00:00:00')")
+    shard.conn.execute("INSERT INTO days VALUES ('splits', '2025-03-07', 1, '2025-03-20 00:00:00')")
+    main.conn.commit()
+    shard.conn.commit()
+    shard.record_page('splits', '2025-03-07', 0, [('TEV', 'Tev Holdings Inc.')])
+    shard.close()
+
+    assert main.merge(str(tmp_path / 'shard.sqlite3')) == 2
+    main.close()
+    assert _completed_days(tmp_path / 'main.sqlite3') == {
+        ('ipo', '2025-03-06'): 1,
+        ('ipo', '2025-03-07'): 2,
+        ('splits', '2025-03-07'): 1,
+    }
+
+
+def test_sharded_incremental_crawl(tmp_path, run_crawler_cli):
+    args = ('--start-date', '2025-03-03', '--end-date', '2025-03-08', '--shards', '3', '--incremental', '--no-cache')
+    with StubCalendarServer() as server:
+        events = run_crawler_cli('--base-url', server.base_url, *args)
+        first_requests = server.requests
+
+        # 샤드마다 따로 기록한 이력이 합쳐져 모든 (이벤트 타입, 날짜)가 완료로 남음
+        days = _completed_days(tmp_path / 'crawl_state.sqlite3')
+        assert set(days) == {(event_type, f'2025-03-0{d}') for event_type in EVENT_TYPES for d in range(3, 9)}
+        assert days[('earnings', '2025-03-07')] == 3
+        assert len(events) == 5 * sum(WEEKDAY_COUNTS.values())
+
+        # 다시 실행하면 확정된 날짜는 요청하지 않음
+        run_crawler_cli('--base-url', server.base_url, *args)
+        assert server.requests == first_requests